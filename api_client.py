@@ -0,0 +1,78 @@
+"""Minimal client for the localhost API, standing in for the browser extension
+when trying the server out or exercising it from scripts.
+
+    client = ApiClient()
+    client.has_link("https://www.linkedin.com/jobs/view/123/")
+    client.add("Acme", "https://example.com/jobs/1", role="ML Engineer")
+    client.search(company="acme")
+"""
+import http.client
+import json
+from urllib.parse import urlencode
+
+from api_server import HOST
+from settings_manager import DEFAULT_API_PORT
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class ApiClient:
+    """Talks to api_server over one keep-alive connection"""
+
+    def __init__(self, port=DEFAULT_API_PORT, timeout=5):
+        self.port = port
+        self.timeout = timeout
+        self._connection = None
+
+    def has_link(self, link):
+        return self._request('GET', '/has?' + urlencode({'link': link}))
+
+    def search(self, company=None, link=None, limit=None):
+        params = {'link': link} if link is not None else {'company': company}
+        if limit is not None:
+            params['limit'] = limit
+        return self._request('GET', '/search?' + urlencode(params))
+
+    def add(self, company, link, role='', applied_date=None):
+        fields = {'company': company, 'link': link, 'role': role}
+        if applied_date:
+            fields['applied_date'] = applied_date
+        return self._request('POST', '/jobs', fields)['job']
+
+    def health(self):
+        return self._request('GET', '/health')
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        for attempt in range(2):
+            if self._connection is None:
+                self._connection = http.client.HTTPConnection(HOST, self.port, timeout=self.timeout)
+            try:
+                self._connection.request(method, path, body=body, headers=headers)
+                response = self._connection.getresponse()
+                data = json.loads(response.read() or b'{}')
+                break
+            except (ConnectionError, http.client.RemoteDisconnected):
+                # The server may have dropped an idle keep-alive connection; retry once
+                self.close()
+                if attempt:
+                    raise
+        if response.status >= 400:
+            raise ApiError(response.status, data.get('error', response.reason))
+        return data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
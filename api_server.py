@@ -0,0 +1,362 @@
+"""Localhost HTTP/JSON API for browser-extension capture.
+
+    GET  /health
+    GET  /has?link=<url>                  -> {"applied": bool, "archived": bool, "job": {...} | null}
+    GET  /search?company=<text>&limit=20  -> {"jobs": [...], "archived": [...]}
+    GET  /search?link=<url>
+    POST /jobs  {"company", "link", "role"?, "applied_date"?}  -> 201 {"job": {...}}, 409 if tracked
+
+Runs headless (python api_server.py) or next to the GUI, which hands every call
+to the Tk thread through a CallQueue. Only binds to the loopback interface.
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+from archive_store import ArchiveStore
+from data_lock import DataLock, DataLocked
+from index_file import NO_DATE, date_ordinal
+from job_status import new_job
+from job_store import JobStore
+from settings_manager import DEFAULT_API_PORT, SettingsManager
+
+HOST = '127.0.0.1'
+MAX_BODY = 64 * 1024
+DEFAULT_SEARCH_LIMIT = 20
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class StoreBackend:
+    """API operations on a JobStore and its archive.
+    get_store/get_archive are callables so the GUI can swap stores on a folder change.
+    With on_add, new jobs are handed to it (the GUI's add path) instead of being saved here.
+    """
+
+    def __init__(self, get_store, get_archive, on_add=None):
+        self.get_store = get_store
+        self.get_archive = get_archive
+        self.on_add = on_add
+
+    def has_link(self, link):
+        store, archive = self.get_store(), self.get_archive()
+        # Other URL variants of a tracked posting count as applied, without a record to show
+        job = store.find(link)
+        if job is not None or store.has_posting(link):
+            return {'applied': True, 'archived': False, 'job': job}
+        if archive.has_posting(link):
+            return {'applied': True, 'archived': True, 'job': archive.find(link)}
+        return {'applied': False, 'archived': False, 'job': None}
+
+    def search(self, company=None, link=None, limit=DEFAULT_SEARCH_LIMIT):
+        store, archive = self.get_store(), self.get_archive()
+        if link is not None:
+            jobs = [job for job in [store.find(link)] if job is not None]
+            archived = [job for job in [archive.find(link)] if job is not None]
+        else:
+            term = company.lower()
+            jobs = []
+            for job in store.jobs:
+                if term in job.get('company', '').lower():
+                    jobs.append(job)
+                    if len(jobs) >= limit:
+                        break
+            archived = archive.search_company(company)[:max(limit - len(jobs), 0)]
+        return {'jobs': jobs, 'archived': archived}
+
+    def add(self, fields):
+        company = (fields.get('company') or '').strip()
+        link = (fields.get('link') or '').strip()
+        if not company or not link:
+            raise ApiError(400, "company and link are required")
+        applied_date = fields.get('applied_date') or datetime.now().strftime('%Y-%m-%d')
+        if date_ordinal(applied_date) == NO_DATE:
+            raise ApiError(400, "applied_date must look like YYYY-MM-DD")
+        store, archive = self.get_store(), self.get_archive()
+        if store.has_link(link) or archive.has_link(link):
+            raise ApiError(409, "already tracked")
+        job = new_job(company, link, fields.get('role') or '', applied_date)
+        if self.on_add is not None:
+            if not self.on_add(job):
+                raise ApiError(409, "already tracked")
+            return store.find(link) or job
+        store.add(job)
+        store.save()
+        return job
+
+
+class CallQueue:
+    """Runs functions on the thread that calls drain() (the Tk thread), for other threads.
+    wake() is called from the submitting thread when calls arrive and no drain is
+    pending yet, so the owner schedules one drain instead of polling.
+    """
+
+    def __init__(self, wake):
+        self._calls = queue.Queue()
+        self._wake = wake
+        self._lock = threading.Lock()
+        self._wake_pending = False
+
+    def submit(self, func, *args):
+        future = Future()
+        self._calls.put((future, func, args))
+        with self._lock:
+            wake = not self._wake_pending
+            self._wake_pending = True
+        if wake:
+            try:
+                self._wake()
+            except BaseException:
+                with self._lock:
+                    self._wake_pending = False
+                raise
+        return future
+
+    def drain(self):
+        # Cleared first: a call submitted while draining schedules another drain
+        with self._lock:
+            self._wake_pending = False
+        while True:
+            try:
+                future, func, args = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class ApiServer:
+    """asyncio HTTP/1.1 server (keep-alive, JSON only) in front of a backend.
+    With a call_queue, backend calls run wherever the queue is drained.
+    """
+
+    def __init__(self, backend, port=DEFAULT_API_PORT, call_queue=None):
+        self.backend = backend
+        # 0 picks a free port; start() then records the one actually bound
+        self.port = port
+        self.call_queue = call_queue
+        self._server = None
+        self._allowed_hosts = set()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, HOST, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._allowed_hosts = {f'{HOST}:{self.port}', f'localhost:{self.port}'}
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _call(self, func, *args):
+        if self.call_queue is None:
+            return func(*args)
+        return await asyncio.wrap_future(self.call_queue.submit(func, *args))
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "malformed request line"}, False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0 or length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': "bad or too large Content-Length"}, False)
+                    return
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self._dispatch(method, target, headers, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, headers, body):
+        # Rejecting foreign Host headers keeps DNS-rebinding pages out
+        if headers.get('host') not in self._allowed_hosts:
+            return 400, {'error': "unexpected Host header"}
+        url = urlsplit(target)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            if url.path == '/health':
+                return 200, {'status': 'ok'}
+            if url.path == '/has':
+                self._require(method, 'GET')
+                link = self._param(params, 'link')
+                return 200, await self._call(self.backend.has_link, link)
+            if url.path == '/search':
+                self._require(method, 'GET')
+                try:
+                    limit = int(params.get('limit', DEFAULT_SEARCH_LIMIT))
+                except ValueError:
+                    raise ApiError(400, "limit must be a number")
+                if 'link' in params:
+                    return 200, await self._call(self.backend.search, None, params['link'], limit)
+                return 200, await self._call(self.backend.search, self._param(params, 'company'), None, limit)
+            if url.path == '/jobs':
+                self._require(method, 'POST')
+                # Requiring JSON also means browsers preflight cross-site posts, which are refused
+                if headers.get('content-type', '').split(';')[0].strip() != 'application/json':
+                    raise ApiError(400, "send the job as application/json")
+                try:
+                    fields = json.loads(body or b'{}')
+                except ValueError:
+                    raise ApiError(400, "invalid JSON body")
+                if not isinstance(fields, dict):
+                    raise ApiError(400, "the body must be a JSON object")
+                return 201, {'job': await self._call(self.backend.add, fields)}
+            return 404, {'error': "not found"}
+        except ApiError as e:
+            return e.status, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    @staticmethod
+    def _require(method, expected):
+        if method != expected:
+            raise ApiError(405, f"use {expected}")
+
+    @staticmethod
+    def _param(params, name):
+        value = params.get(name, '').strip()
+        if not value:
+            raise ApiError(400, f"the {name} parameter is required")
+        return value
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+class ServerThread:
+    """Runs an ApiServer on its own event loop in a daemon thread (used next to the GUI)"""
+
+    def __init__(self, server):
+        self.server = server
+        self._loop = None
+        self._thread = None
+        self.error = None
+
+    def start(self):
+        """Start serving; returns False (with .error set) if the port can't be opened"""
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.server.start())
+            except OSError as e:
+                self.error = e
+                started.set()
+                self._loop.close()
+                return
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.server.close())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="job-tracker-api", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.error is None
+
+    def stop(self):
+        if self._thread is not None and self.error is None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self.error is None
+
+
+def serve(data_path, port=DEFAULT_API_PORT):
+    """Serve data_path headless until interrupted. Holds the data file's lock throughout,
+    so neither the app nor the CLI writes the file underneath.
+    """
+    with DataLock(data_path):
+        _serve(data_path, port)
+
+
+def _serve(data_path, port):
+    store = JobStore(data_path)
+    store.open()
+    archive = ArchiveStore(data_path)
+    archive.open()
+    # Parse up front so the first lookups don't pay for it
+    store.ensure_loaded()
+    server = ApiServer(StoreBackend(lambda: store, lambda: archive), port)
+    print(f"Serving {data_path} on http://{HOST}:{port}", flush=True)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.save()
+        store.sync_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the job tracker API on localhost")
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--data', help="data file to use instead of the app's job_data.json")
+    args = parser.parse_args(argv)
+    if getattr(sys, 'frozen', False):
+        app_dir = os.path.dirname(sys.executable)
+    else:
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+    settings_manager = SettingsManager(app_dir)
+    try:
+        serve(args.data or settings_manager.get_data_file_path(), args.port or settings_manager.get_api_port())
+    except DataLocked as e:
+        sys.exit(f"error: {e}; close it and try again")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import gzip
+import json
+import os
+import zlib
+from collections import Counter
+from datetime import date
+
+from index_file import NO_DATE, date_ordinal, normalize_link
+from job_index import JobIndex
+from job_links import extract_job_link
+from job_store import next_generation
+
+# Cold storage for old applications, kept next to job_data.json:
+#   job_archive.json.gz     the archived records: gzip members each holding a JSON list,
+#                           so newly archived records are appended without a rewrite
+#   job_archive_index.json  compact summary used for duplicate checks, search and stats,
+#                           so the archive itself is only decompressed to show records
+ARCHIVE_NAME = 'job_archive.json.gz'
+ARCHIVE_INDEX_NAME = 'job_archive_index.json'
+INDEX_VERSION = 1
+# Off until the user picks an age under Settings -> Archive
+DEFAULT_ARCHIVE_AFTER_DAYS = 0
+
+
+def read_members(data):
+    """Records of every complete gzip member; a member cut short by a crash is ignored"""
+    records = []
+    while data:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        text = decompressor.decompress(data)
+        if not decompressor.eof:
+            break
+        records.extend(json.loads(text))
+        data = decompressor.unused_data
+    return records
+
+
+def archive_paths_for(data_path):
+    """(archive path, archive index path) that belong to a data file"""
+    directory = os.path.dirname(data_path)
+    return os.path.join(directory, ARCHIVE_NAME), os.path.join(directory, ARCHIVE_INDEX_NAME)
+
+
+def last_activity(job):
+    """Ordinal of the latest applied or status-change date, or NO_DATE"""
+    dates = [date_ordinal(job.get('applied_date'))]
+    dates.extend(date_ordinal(entry.get('date')) for entry in job.get('status_history') or ())
+    return max(dates)
+
+
+def should_archive(job, days, today=None):
+    """Whether the job has been inactive for more than days.
+    Undated jobs and jobs restored from the archive (keep_active) stay in the working set.
+    """
+    if job.get('keep_active'):
+        return False
+    ordinal = last_activity(job)
+    cutoff = (today or date.today()).toordinal() - days
+    return ordinal != NO_DATE and ordinal < cutoff
+
+
+def inactive_jobs(store, days, today=None):
+    """The store's jobs inactive for more than days"""
+    return [job for job in store.jobs if should_archive(job, days, today)]
+
+
+def archive_inactive(store, archive, days, today=None):
+    """Move the store's jobs inactive for more than days into the archive; returns them.
+    The archive is written first, so a failure never loses records. The caller saves the store.
+    """
+    old = inactive_jobs(store, days, today)
+    if old:
+        archive.add(old)
+        store.remove_links([job['link'] for job in old])
+    return old
+
+
+class ArchiveStore:
+    """Compressed archive of old applications plus its compact index.
+    Only the index is read at startup; records are decompressed on first use.
+    """
+
+    def __init__(self, data_path):
+        self.archive_path, self.index_path = archive_paths_for(data_path)
+        self._records = None
+        self._clear_summary()
+
+    def _clear_summary(self):
+        # Every (re)load and rewrite goes through here, so the generation follows the contents
+        self.generation = next_generation()
+        self.total = 0
+        self._links = set()
+        self._postings = set()
+        # Company name -> positions of its records in the archive
+        self._companies = {}
+        self.roles = Counter()
+        self.dates = Counter()
+        self.statuses = Counter()
+        self.reached = Counter()
+
+    def open(self):
+        """Read the compact index, rebuilding it if it doesn't match the archive"""
+        self._records = None
+        self._clear_summary()
+        if not os.path.exists(self.archive_path):
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                summary = json.load(f)
+            stat = os.stat(self.archive_path)
+            if summary.get('version') != INDEX_VERSION or summary.get('archive_size') != stat.st_size \
+                    or summary.get('archive_mtime_ns') != stat.st_mtime_ns:
+                summary = None
+        except (OSError, ValueError):
+            summary = None
+        if summary is None:
+            self._summarize(self.records)
+            self._write_index()
+        else:
+            self._load_summary(summary)
+
+    @property
+    def records(self):
+        if self._records is None:
+            if os.path.exists(self.archive_path):
+                with open(self.archive_path, 'rb') as f:
+                    self._records = read_members(f.read())
+            else:
+                self._records = []
+        return self._records
+
+    def __len__(self):
+        return self.total
+
+    @property
+    def companies(self):
+        return self._companies.keys()
+
+    def date_range(self):
+        if not self.dates:
+            return None
+        return min(self.dates), max(self.dates)
+
+    def status_counts(self):
+        return dict(self.statuses)
+
+    def has_link(self, link):
+        return normalize_link(link) in self._links
+
+    def has_posting(self, link):
+        """Like has_link, but also matches other URL variants of the same job posting"""
+        if self.has_link(link):
+            return True
+        canonical = extract_job_link(link)
+        return canonical is not None and normalize_link(canonical) in self._postings
+
+    def find(self, link):
+        key = normalize_link(link)
+        if key not in self._links:
+            return None
+        for job in self.records:
+            if normalize_link(job.get('link')) == key:
+                return job
+        return None
+
+    def search_company(self, term):
+        """Archived records whose company contains term (case-insensitive)"""
+        term = term.lower()
+        positions = sorted(position for company, company_positions in self._companies.items()
+                           if term in company.lower() for position in company_positions)
+        if not positions:
+            return []
+        records = self.records
+        return [records[position] for position in positions]
+
+    # -------------------- Mutations --------------------
+    def add(self, jobs):
+        """Archive jobs; an archived record with the same link is replaced.
+        New links are appended as one gzip member, so the cost follows the batch, not the archive.
+        """
+        keys = {normalize_link(job.get('link')) for job in jobs}
+        if keys.isdisjoint(self._links):
+            self._append(jobs)
+            return
+        records = [job for job in self.records if normalize_link(job.get('link')) not in keys]
+        records.extend(jobs)
+        self._rewrite(records)
+
+    def remove_links(self, links):
+        """Take records out of the archive; returns them"""
+        keys = {normalize_link(link) for link in links}
+        removed = [job for job in self.records if normalize_link(job.get('link')) in keys]
+        if removed:
+            self._rewrite([job for job in self.records if normalize_link(job.get('link')) not in keys])
+        return removed
+
+    def replace_role(self, old_role, new_role, links=None):
+        """Give archived records with old_role (only those in links, if given) the role new_role.
+        Returns the normalized links of the records changed.
+        """
+        if not self.roles.get(old_role):
+            return []
+        keys = None if links is None else {normalize_link(link) for link in links}
+        changed = []
+        for job in self.records:
+            key = normalize_link(job.get('link'))
+            if job.get('role') == old_role and (keys is None or key in keys):
+                job['role'] = new_role
+                changed.append(key)
+        if changed:
+            self._rewrite(self.records)
+        return changed
+
+    # -------------------- Internal helpers --------------------
+    def _rewrite(self, records):
+        tmp_path = self.archive_path + '.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(records, f)
+        os.replace(tmp_path, self.archive_path)
+        self._records = records
+        self._summarize(records)
+        self._write_index()
+
+    def _append(self, jobs):
+        if not jobs:
+            return
+        with open(self.archive_path, 'ab') as f:
+            f.write(gzip.compress(json.dumps(jobs).encode('utf-8')))
+        if self._records is not None:
+            self._records.extend(jobs)
+        self.generation = next_generation()
+        self._summarize_more(jobs)
+        self._write_index()
+
+    def _summarize(self, records):
+        self._clear_summary()
+        self._summarize_more(records)
+
+    def _summarize_more(self, records):
+        """Add records, stored after the ones summarized so far, to the summary"""
+        index = JobIndex(records)
+        start = self.total
+        self.total += index.total
+        self.roles.update(index.roles)
+        self.dates.update(index.dates)
+        self.statuses.update({status: count for status, count in index.status_counts().items() if count})
+        self.reached.update(index.reached)
+        for position, job in enumerate(records, start):
+            self._links.add(normalize_link(job.get('link')))
+            canonical = extract_job_link(job.get('link'))
+            if canonical is not None:
+                self._postings.add(normalize_link(canonical))
+            company = JobIndex.company_key(job)
+            if company:
+                self._companies.setdefault(company, []).append(position)
+
+    def _load_summary(self, summary):
+        self.total = summary['total']
+        self._links = set(summary['links'])
+        self._postings = set(summary['postings'])
+        self._companies = summary['companies']
+        self.roles = Counter(summary['roles'])
+        # JSON object keys are strings
+        self.dates = Counter({int(ordinal): count for ordinal, count in summary['dates'].items()})
+        self.statuses = Counter(summary['statuses'])
+        self.reached = Counter(summary['reached'])
+
+    def _write_index(self):
+        stat = os.stat(self.archive_path)
+        summary = {
+            'version': INDEX_VERSION,
+            'archive_size': stat.st_size,
+            'archive_mtime_ns': stat.st_mtime_ns,
+            'total': self.total,
+            'links': sorted(self._links),
+            'postings': sorted(self._postings),
+            'companies': self._companies,
+            'roles': self.roles,
+            'dates': self.dates,
+            'statuses': self.statuses,
+            'reached': self.reached,
+        }
+        # The index only saves decompressing the archive; failing to write it is not an error
+        try:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(summary, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
@@ -0,0 +1,415 @@
+"""Command-line interface to the job data, for scripts and scheduled tasks.
+
+    python cli.py add "Acme" https://example.com/jobs/1 --role "ML Engineer"
+    python cli.py search acme
+    python cli.py search --text "kubernetes remote"
+    python cli.py stats --json
+    python cli.py import old_jobs.csv
+    python cli.py export - --format csv --include-archived
+    python cli.py compact --archive
+    python cli.py duplicates
+    python cli.py verify --repair
+    python cli.py merge laptop/job_data.json desktop/job_data.json
+
+Uses the same storage folder as the app. Only the Tk-free modules are imported,
+so this never loads tkinter or ttkbootstrap. Commands that write the data refuse to
+run while the app (or the API server) has the same data file open.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+from datetime import datetime
+
+from archive_store import ArchiveStore, archive_inactive
+from data_check import apply_repair, discard_repair, repair_paths_for, verify
+from data_lock import DataLock, DataLocked
+from index_file import NO_DATE, date_ordinal, normalize_link
+from job_status import STATUSES, label_for, new_job, status_change, status_of
+from job_store import JobStore
+from merge_data import merge_files
+from notes_store import TEXT_REFS, NotesStore, refs_of
+from settings_manager import SettingsManager
+from stats_manager import StatsManager
+
+CSV_FIELDS = ['company', 'link', 'role', 'applied_date', 'status']
+
+
+class CliError(Exception):
+    """A problem reported to the user as a one-line message (exit code 1)"""
+
+
+def _app_dir():
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def _data_file(args):
+    return args.data or SettingsManager(_app_dir()).get_data_file_path()
+
+
+def _written_file(args):
+    """The data file a writing command changes, or None for read-only commands"""
+    if args.command == 'merge':
+        return args.into or _data_file(args)
+    if args.command in ('add', 'import', 'compact') or (args.command == 'verify' and args.repair):
+        return _data_file(args)
+    return None
+
+
+def _open_storage(args):
+    settings_manager = SettingsManager(_app_dir())
+    data_file = args.data or settings_manager.get_data_file_path()
+    store = JobStore(data_file)
+    store.open()
+    archive = ArchiveStore(data_file)
+    archive.open()
+    return settings_manager, store, archive
+
+
+def _today():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def _resolve_role(settings_manager, role, add_role):
+    if not role:
+        return ''
+    catalog = settings_manager.role_catalog
+    known = catalog.get(role)
+    if known is not None:
+        return known
+    if not add_role:
+        raise CliError(f"unknown role '{role}' (add it in the app's settings or pass --add-role)")
+    settings_manager.add_job_role(role)
+    return role.strip()
+
+
+def _print_jobs(jobs, as_json, archived=()):
+    if as_json:
+        json.dump(list(jobs) + list(archived), sys.stdout, indent=4)
+        print()
+        return
+    for job, where in [(job, '') for job in jobs] + [(job, 'archived') for job in archived]:
+        print('\t'.join([job.get('applied_date', ''), label_for(status_of(job)), job.get('company', ''),
+                         job.get('role', ''), job.get('link', ''), where]).rstrip('\t'))
+
+
+def _finish(store):
+    store.save()
+    store.sync_index()
+
+
+# -------------------- Commands --------------------
+def cmd_add(args):
+    settings_manager, store, archive = _open_storage(args)
+    link = args.link.strip()
+    if store.has_link(link) or archive.has_link(link):
+        raise CliError(f"already tracked: {link}")
+    applied_date = args.date or _today()
+    if date_ordinal(applied_date) == NO_DATE:
+        raise CliError("dates must look like YYYY-MM-DD")
+    role = _resolve_role(settings_manager, args.role, args.add_role)
+    job = new_job(args.company, link, role, applied_date)
+    if args.status and args.status != job['status']:
+        job.update(status_change(job, args.status))
+    notes = NotesStore(store.data_path)
+    for field in TEXT_REFS:
+        text = getattr(args, field)
+        if text == '-':
+            text = sys.stdin.read()
+        ref = notes.put(text)
+        if ref:
+            job[TEXT_REFS[field]] = ref
+    # The near-duplicate check needs the records parsed
+    store.ensure_loaded()
+    for other in store.index.duplicates.candidates(job):
+        print(f"warning: possible duplicate of {other.get('applied_date', '')} {other['company']} "
+              f"{other.get('role', '')} {other['link']}", file=sys.stderr)
+    store.add(job)
+    _finish(store)
+    print(f"Added {job['company']}")
+
+
+def cmd_search(args):
+    _, store, archive = _open_storage(args)
+    if args.link:
+        key = normalize_link(args.term)
+        jobs = [job for job in [store.find(key)] if job is not None]
+        archived = [job for job in [archive.find(key)] if job is not None]
+    elif args.text:
+        # Ranked by relevance; archived records aren't in the full-text index
+        store.ensure_loaded()
+        notes = NotesStore(store.data_path)
+        jobs = [job for job, _ in notes.search(args.term, store.index.texts)]
+        archived = []
+        notes.close()
+    else:
+        term = args.term.lower()
+        jobs = [job for job in store.jobs if term in job.get('company', '').lower()]
+        archived = archive.search_company(args.term)
+    if args.status:
+        jobs = [job for job in jobs if status_of(job) == args.status]
+        archived = [job for job in archived if status_of(job) == args.status]
+    _print_jobs(jobs, args.json, archived)
+    return 0 if jobs or archived else 1
+
+
+def cmd_stats(args):
+    settings_manager, store, archive = _open_storage(args)
+    stats = StatsManager(store.jobs, settings_manager, store.index, archive).get_basic_stats()
+    if args.json:
+        json.dump(stats, sys.stdout, indent=4)
+        print()
+        return
+    print(f"Total Applications: {stats['total_applications']}")
+    print(f"Archived Applications: {stats['archived_applications']}")
+    print(f"Unique Companies: {stats['unique_companies']}")
+    print(f"Daily Application Rate: {stats['daily_rate']:.1f}")
+    print("Applications by Role:")
+    for role, count in sorted(stats['applications_by_role'].items(), key=lambda item: -item[1]):
+        print(f"  {role}: {count}")
+    print("Applications by Status:")
+    for status, count in stats['applications_by_status'].items():
+        print(f"  {label_for(status)}: {count}")
+
+
+def _read_records(path, fmt):
+    stream = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', newline='')
+    try:
+        if fmt == 'csv':
+            return list(csv.DictReader(stream))
+        records = json.load(stream)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    if not isinstance(records, list):
+        raise CliError("a JSON import must be a list of records")
+    return records
+
+
+def _import_record(record):
+    """A store record from an imported row, or None if it lacks a company or link"""
+    if not isinstance(record, dict):
+        return None
+    company = (record.get('company') or '').strip()
+    link = (record.get('link') or '').strip()
+    if not company or not link:
+        return None
+    history = record.get('status_history')
+    if isinstance(history, list) and history and all(isinstance(entry, dict) for entry in history):
+        # Exported from this app as JSON: keep the record as it is
+        return dict(record, company=company, link=link)
+    # Anything else (a CSV column holds the history as text) is rebuilt from the status
+    applied_date = (record.get('applied_date') or '').strip() or _today()
+    job = new_job(company, link, record.get('role') or '', applied_date)
+    status = (record.get('status') or '').strip().lower()
+    if status in STATUSES and status != job['status']:
+        job.update(status_change(job, status, applied_date))
+    return job
+
+
+def cmd_import(args):
+    _, store, archive = _open_storage(args)
+    fmt = args.format or ('csv' if args.file.lower().endswith('.csv') else 'json')
+    added = skipped = invalid = 0
+    for record in _read_records(args.file, fmt):
+        job = _import_record(record)
+        if job is None:
+            invalid += 1
+        elif store.has_link(job['link']) or archive.has_link(job['link']):
+            skipped += 1
+        else:
+            store.add(job)
+            added += 1
+    _finish(store)
+    print(f"Imported {added} applications, skipped {skipped} already tracked, {invalid} invalid")
+
+
+def cmd_export(args):
+    _, store, archive = _open_storage(args)
+    jobs = list(store.jobs)
+    if args.include_archived:
+        jobs.extend(archive.records)
+    fmt = args.format or ('csv' if args.file.lower().endswith('.csv') else 'json')
+    stream = sys.stdout if args.file == '-' else open(args.file, 'w', encoding='utf-8', newline='')
+    try:
+        if fmt == 'csv':
+            writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            for job in jobs:
+                writer.writerow(dict(job, status=status_of(job)))
+        else:
+            json.dump(jobs, stream, indent=4)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    if args.file != '-':
+        print(f"Exported {len(jobs)} applications to {args.file}")
+
+
+def cmd_compact(args):
+    settings_manager, store, archive = _open_storage(args)
+    if args.archive:
+        days = settings_manager.get_archive_after_days() if args.days is None else args.days
+        if days:
+            archived = archive_inactive(store, archive, days)
+            print(f"Archived {len(archived)} applications inactive for more than {days} days")
+    before = os.path.getsize(store.data_path) if os.path.exists(store.data_path) else 0
+    store.compact()
+    print(f"Rewrote {store.count()} applications ({before} -> {os.path.getsize(store.data_path)} bytes)")
+    notes = NotesStore(store.data_path)
+    if len(notes):
+        # Archived records keep their texts too
+        live = {ref for job in store.jobs + archive.records for ref in refs_of(job)}
+        print(f"Dropped {notes.compact(live)} unused notes and descriptions")
+        notes.close()
+
+
+def cmd_duplicates(args):
+    _, store, _ = _open_storage(args)
+    store.ensure_loaded()
+    groups = store.index.duplicates.groups()
+    if args.json:
+        json.dump(groups, sys.stdout, indent=4)
+        print()
+    else:
+        for number, group in enumerate(groups, 1):
+            if number > 1:
+                print()
+            _print_jobs(group, False)
+    return 1 if groups else 0
+
+
+def cmd_verify(args):
+    data_file = _data_file(args)
+    repair_path, rejected_path, backup_path = repair_paths_for(data_file)
+    if args.repair:
+        report = verify(data_file, repair_path, rejected_path)
+    else:
+        report = verify(data_file)
+    if args.json:
+        json.dump(report.as_dict(), sys.stdout, indent=4)
+        print()
+    else:
+        for kind, _, message in report.problems:
+            print(f"{kind}: {message}")
+        print(report.summary())
+    if args.repair:
+        if report.ok:
+            discard_repair(data_file)
+        elif not apply_repair(data_file, repair_path, report.stamp):
+            raise CliError("the data file changed during the check; nothing was replaced")
+        elif not args.json:
+            print(f"Repaired: kept {report.kept} of {report.records} records. "
+                  f"The original is in {backup_path}, dropped records in {rejected_path}")
+    return 0 if report.ok else 1
+
+
+def cmd_merge(args):
+    data_file = _data_file(args)
+    output = args.into or data_file
+    paths = list(args.files)
+    if not args.into and os.path.exists(data_file):
+        # Merging into the app's data keeps what's already tracked
+        paths.insert(0, data_file)
+    existed = os.path.exists(output)
+    result = merge_files(paths, output, workers=args.workers)
+    print(result.summary())
+    if existed:
+        print(f"The previous {output} is in {output}.bak")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='jobtracker', description="Job Application Tracker command line")
+    parser.add_argument('--data', help="data file to use instead of the app's job_data.json")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="track a new application")
+    add.add_argument('company')
+    add.add_argument('link')
+    add.add_argument('--role', default='', help="one of the configured roles")
+    add.add_argument('--add-role', action='store_true', help="add --role to the configured roles if it's new")
+    add.add_argument('--date', help="applied date as YYYY-MM-DD (default: today)")
+    add.add_argument('--status', choices=STATUSES)
+    add.add_argument('--notes', help="free-text notes ('-' reads them from stdin)")
+    add.add_argument('--description', help="the job description ('-' reads it from stdin)")
+    add.set_defaults(func=cmd_add)
+
+    search = commands.add_parser('search', help="find applications by company (or exact link)")
+    search.add_argument('term')
+    search_by = search.add_mutually_exclusive_group()
+    search_by.add_argument('--link', action='store_true', help="match the job link exactly")
+    search_by.add_argument('--text', action='store_true', help="ranked search of notes and descriptions")
+    search.add_argument('--status', choices=STATUSES)
+    search.add_argument('--json', action='store_true')
+    search.set_defaults(func=cmd_search)
+
+    stats = commands.add_parser('stats', help="print application statistics")
+    stats.add_argument('--json', action='store_true')
+    stats.set_defaults(func=cmd_stats)
+
+    import_ = commands.add_parser('import', help="add applications from a JSON or CSV file ('-' for stdin)")
+    import_.add_argument('file')
+    import_.add_argument('--format', choices=('json', 'csv'))
+    import_.set_defaults(func=cmd_import)
+
+    export = commands.add_parser('export', help="write applications to a JSON or CSV file ('-' for stdout)")
+    export.add_argument('file')
+    export.add_argument('--format', choices=('json', 'csv'))
+    export.add_argument('--include-archived', action='store_true')
+    export.set_defaults(func=cmd_export)
+
+    compact = commands.add_parser('compact', help="rewrite the data file and its index")
+    compact.add_argument('--archive', action='store_true', help="archive inactive applications first")
+    compact.add_argument('--days', type=int, help="inactivity age for --archive (default: the app setting)")
+    compact.set_defaults(func=cmd_compact)
+
+    duplicates = commands.add_parser('duplicates', help="list groups of likely duplicate applications "
+                                                        "(same company and role, close dates); exits 1 if any")
+    duplicates.add_argument('--json', action='store_true')
+    duplicates.set_defaults(func=cmd_duplicates)
+
+    verify_ = commands.add_parser('verify', help="check the data file for damaged records, bad dates, "
+                                                 "duplicate links and index mismatches; exits 1 on problems")
+    verify_.add_argument('--repair', action='store_true',
+                         help="replace the data file with a repaired copy (the original is kept as .bak)")
+    verify_.add_argument('--json', action='store_true')
+    verify_.set_defaults(func=cmd_verify)
+
+    merge = commands.add_parser('merge', help="combine data files (e.g. from other PCs) into the app's data, "
+                                              "deduplicated by link; the earliest application wins")
+    merge.add_argument('files', nargs='+')
+    merge.add_argument('--into', help="write the merged data here instead (the app's data is not included)")
+    merge.add_argument('--workers', type=int, help="worker processes (default: one per CPU; 1 = no pool)")
+    merge.set_defaults(func=cmd_merge)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        written = _written_file(args)
+        if written is None:
+            return args.func(args) or 0
+        # Two writers would overwrite each other's changes
+        with DataLock(written):
+            return args.func(args) or 0
+    except DataLocked as e:
+        print(f"error: {e}; close it and try again", file=sys.stderr)
+        return 1
+    except CliError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    # Merge workers re-run this module in frozen builds
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import tkinter as tk
+from collections import OrderedDict
+
+from index_file import normalize_link
+from job_links import extract_job_link, guess_company
+
+POLL_INTERVAL_MS = 700
+
+
+class CaptureQueue:
+    """Captured links waiting for confirmation, in capture order and without repeats"""
+
+    def __init__(self):
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, link):
+        return normalize_link(link) in self._items
+
+    def push(self, link):
+        """Queue a link; returns False if it is already waiting"""
+        key = normalize_link(link)
+        if key in self._items:
+            return False
+        self._items[key] = {'link': link, 'company': guess_company(link)}
+        return True
+
+    def remove(self, link):
+        self._items.pop(normalize_link(link), None)
+
+    def items(self):
+        return list(self._items.values())
+
+
+class ClipboardWatcher:
+    """Polls the clipboard from the Tk event loop and reports newly copied job links
+    as on_link(canonical_link, copied_text).
+    Uses Tk's own clipboard access, which is in-process and cheap enough to poll.
+    """
+
+    def __init__(self, root, on_link, interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.on_link = on_link
+        self.interval_ms = interval_ms
+        self._job = None
+        self._last_text = None
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def start(self):
+        if self.running:
+            return
+        # Whatever is on the clipboard already was not "just copied"
+        self._last_text = self._read()
+        self._job = self.root.after(self.interval_ms, self._poll)
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _read(self):
+        try:
+            return self.root.clipboard_get()
+        except tk.TclError:
+            # Empty clipboard or non-text content
+            return None
+
+    def _poll(self):
+        text = self._read()
+        if text != self._last_text:
+            self._last_text = text
+            link = extract_job_link(text)
+            if link:
+                self.on_link(link, text.strip())
+        self._job = self.root.after(self.interval_ms, self._poll)
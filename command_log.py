@@ -0,0 +1,214 @@
+from abc import ABC, abstractmethod
+from collections import deque
+
+from index_file import normalize_link
+from job_store import MISSING
+from migrations import upgraded_fields
+
+# Number of changes that can be undone
+UNDO_LIMIT = 100
+
+
+def _change(removed=(), inserted=(), updated=()):
+    """Summary of what a command did, so views can patch only the affected rows"""
+    return {'removed': list(removed), 'inserted': list(inserted), 'updated': list(updated)}
+
+
+class Command(ABC):
+    """A reversible change to a JobStore.
+    Commands keep only the delta they need to revert (the affected records
+    and old field values), never a copy of the whole job list.
+    """
+    label = "change"
+
+    @abstractmethod
+    def apply(self, store):
+        """Make the change; returns a change summary (see _change)"""
+
+    @abstractmethod
+    def revert(self, store):
+        """Undo what apply did; returns a change summary"""
+
+
+class AddJobs(Command):
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.label = "add" if len(self.jobs) == 1 else f"add {len(self.jobs)} applications"
+
+    def apply(self, store):
+        inserted = []
+        for job in self.jobs:
+            inserted.append((len(store.jobs), job))
+            store.add(job)
+        return _change(inserted=inserted)
+
+    def revert(self, store):
+        return _change(removed=store.remove_links([job['link'] for job in self.jobs]))
+
+
+class RestoreJobs(AddJobs):
+    """Moves jobs out of an ArchiveStore back into the store; undo archives them again"""
+
+    def __init__(self, archive, jobs):
+        super().__init__(jobs)
+        self.archive = archive
+        self.label = "restore" if len(self.jobs) == 1 else f"restore {len(self.jobs)} applications"
+
+    def apply(self, store):
+        self.archive.remove_links([job['link'] for job in self.jobs])
+        for job in self.jobs:
+            # Otherwise the next automatic archiving would move it straight back
+            job['keep_active'] = True
+        return super().apply(store)
+
+    def revert(self, store):
+        change = super().revert(store)
+        for job in self.jobs:
+            job.pop('keep_active', None)
+        self.archive.add(self.jobs)
+        return change
+
+
+class ArchiveJobs(Command):
+    """Moves jobs from the store into an ArchiveStore; undo brings them back where they were"""
+
+    def __init__(self, archive, jobs):
+        self.archive = archive
+        self.jobs = list(jobs)
+        self.removed = []
+        self.label = "archive" if len(self.jobs) == 1 else f"archive {len(self.jobs)} applications"
+
+    def apply(self, store):
+        for job in self.jobs:
+            job.pop('keep_active', None)
+        # The archive is written first, so a failure never loses records
+        self.archive.add(self.jobs)
+        self.removed = store.remove_links([job['link'] for job in self.jobs])
+        return _change(removed=self.removed)
+
+    def revert(self, store):
+        self.archive.remove_links([job['link'] for job in self.jobs])
+        for job in self.jobs:
+            # Otherwise the next automatic archiving would move them straight back
+            job['keep_active'] = True
+        store.insert_jobs(self.removed)
+        return _change(inserted=self.removed)
+
+
+class RemoveJobs(Command):
+    def __init__(self, links, label=None):
+        self.keys = {normalize_link(link) for link in links}
+        self.removed = []
+        self.label = label or ("delete" if len(self.keys) == 1 else f"delete {len(self.keys)} applications")
+
+    def apply(self, store):
+        self.removed = store.remove_links(self.keys)
+        return _change(removed=self.removed)
+
+    def revert(self, store):
+        store.insert_jobs(self.removed)
+        return _change(inserted=self.removed)
+
+
+class UpdateJobs(Command):
+    """Field changes for one or more jobs; changes maps link -> {field: new value}"""
+
+    def __init__(self, changes, label="edit"):
+        self.changes = {normalize_link(link): dict(fields) for link, fields in changes.items()}
+        self.label = label
+        self._undo = {}
+
+    @classmethod
+    def same_change(cls, links, fields, label="edit"):
+        return cls({link: fields for link in links}, label)
+
+    def apply(self, store):
+        # Remember the previous values, keyed by the link each job will have afterwards
+        self._undo = {}
+        for key, fields in self.changes.items():
+            job = store.find(key)
+            if job is None:
+                continue
+            new_key = normalize_link(fields.get('link', job.get('link')))
+            # update_fields upgrades old records; undo restores them exactly as they were
+            names = [*fields, *upgraded_fields(job)]
+            self._undo[new_key] = {name: job.get(name, MISSING) for name in names}
+        return _change(updated=store.update_fields(self.changes))
+
+    def revert(self, store):
+        return _change(updated=store.update_fields(self._undo))
+
+
+class RemapRole(UpdateJobs):
+    """Moves every application of a role to another role, archived ones included, and
+    removes the old role from the settings. Undo puts all three back.
+    """
+
+    def __init__(self, links, role, target, archive, settings_manager):
+        super().__init__({link: {'role': target} for link in links}, label=f"move {role} to {target}")
+        self.role = role
+        self.target = target
+        self.archive = archive
+        self.settings_manager = settings_manager
+        self.archived = []
+        self._roles = []
+
+    def apply(self, store):
+        # The archive goes first: if rewriting it fails nothing has changed yet
+        self.archived = self.archive.replace_role(self.role, self.target)
+        change = super().apply(store)
+        self._roles = list(self.settings_manager.get_job_roles())
+        self.settings_manager.remove_job_role(self.role)
+        return change
+
+    def revert(self, store):
+        self.archive.replace_role(self.target, self.role, self.archived)
+        change = super().revert(store)
+        # Restores the role in its old place in the list
+        self.settings_manager.update_job_roles(self._roles)
+        return change
+
+
+class CommandLog:
+    """Bounded undo/redo history for mutations of a JobStore"""
+
+    def __init__(self, store, limit=UNDO_LIMIT):
+        self.store = store
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+
+    def execute(self, command):
+        change = command.apply(self.store)
+        self._undo.append(command)
+        self._redo.clear()
+        return change
+
+    def undo(self):
+        """Revert the last command; returns (command, change) or None"""
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        change = command.revert(self.store)
+        self._redo.append(command)
+        return command, change
+
+    def redo(self):
+        """Re-apply the last undone command; returns (command, change) or None"""
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        change = command.apply(self.store)
+        self._undo.append(command)
+        return command, change
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
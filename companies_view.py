@@ -0,0 +1,100 @@
+from datetime import date
+
+import tkinter as tk
+import ttkbootstrap as ttk
+from index_file import NO_DATE
+
+# Rows inserted into the tree at a time; more are added as the list is scrolled
+CHUNK_SIZE = 200
+# Load the next chunk once the visible part reaches this fraction of the loaded rows
+LOAD_MORE_AT = 0.9
+SORT_KEYS = {
+    "Most applications": lambda group: (-group.count, group.name.lower()),
+    "Name": lambda group: group.name.lower(),
+    "Last applied": lambda group: (-group.last_date(), group.name.lower()),
+}
+
+
+def _format_date(ordinal):
+    return date.fromordinal(ordinal).isoformat() if ordinal != NO_DATE else ""
+
+
+class CompaniesView:
+    """Companies tab: one row per company, read from the grouped company index.
+    Only the first CHUNK_SIZE rows are inserted up front, the rest as the list scrolls.
+    """
+
+    def __init__(self, parent, get_index, on_open_company=None):
+        # Returns the JobIndex whose company_groups are listed
+        self.get_index = get_index
+        self.on_open_company = on_open_company
+        self._groups = []
+        self._loaded = 0
+        self.stale = True
+
+        top_frame = ttk.Frame(parent)
+        top_frame.pack(fill="x", padx=10, pady=(10,5))
+        ttk.Label(top_frame, text="Filter:").pack(side="left")
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self.refresh())
+        ttk.Entry(top_frame, textvariable=self.filter_var, width=30).pack(side="left", padx=5)
+        ttk.Label(top_frame, text="Sort by:").pack(side="left", padx=(10,0))
+        self.sort_var = tk.StringVar(value="Most applications")
+        sort_combo = ttk.Combobox(top_frame, textvariable=self.sort_var, values=list(SORT_KEYS),
+                                  width=18, state="readonly")
+        sort_combo.pack(side="left", padx=5)
+        sort_combo.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+        self.count_label = ttk.Label(top_frame, text="")
+        self.count_label.pack(side="right")
+
+        tree_frame = ttk.Frame(parent)
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.scrollbar = ttk.Scrollbar(tree_frame)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree = ttk.Treeview(tree_frame, columns=("company", "count", "roles", "first", "last"),
+                                 show="headings", yscrollcommand=self._on_scroll)
+        self.tree.heading("company", text="Company")
+        self.tree.heading("count", text="Applications")
+        self.tree.heading("roles", text="Roles")
+        self.tree.heading("first", text="First Applied")
+        self.tree.heading("last", text="Last Applied")
+        self.tree.column("count", width=90, anchor="center", stretch=False)
+        self.tree.column("first", width=100, anchor="center", stretch=False)
+        self.tree.column("last", width=100, anchor="center", stretch=False)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.config(command=self.tree.yview)
+        if on_open_company is not None:
+            self.tree.bind("<Double-1>", self._on_open)
+
+    def refresh(self):
+        """Re-read the company groups and show the first chunk of rows"""
+        self.stale = False
+        groups = self.get_index().company_groups.values()
+        term = self.filter_var.get().strip().lower()
+        if term:
+            groups = [group for group in groups if term in group.name.lower()]
+        self._groups = sorted(groups, key=SORT_KEYS[self.sort_var.get()])
+        self._loaded = 0
+        self.tree.delete(*self.tree.get_children())
+        self._load_more()
+        self.count_label.configure(text=f"{len(self._groups)} companies")
+
+    def _load_more(self):
+        end = min(self._loaded + CHUNK_SIZE, len(self._groups))
+        for group in self._groups[self._loaded:end]:
+            roles = ", ".join(f"{role} ({count})" if count > 1 else role
+                              for role, count in group.roles.most_common())
+            self.tree.insert("", "end", iid=group.name, values=(
+                group.name, group.count, roles,
+                _format_date(group.first_date()), _format_date(group.last_date())))
+        self._loaded = end
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._loaded < len(self._groups) and float(last) >= LOAD_MORE_AT:
+            self._load_more()
+
+    def _on_open(self, event):
+        company = self.tree.identify_row(event.y)
+        if company:
+            self.on_open_company(company)
@@ -0,0 +1,375 @@
+"""Streaming integrity check and repair of job_data.json.
+
+The data file is decoded one record at a time, so memory stays bounded by the
+largest record plus a couple of read chunks; duplicate links are tracked as 8-byte hashes.
+Problems found:
+    malformed  - text that isn't JSON, or a list element that isn't an object
+    missing    - no company or link
+    bad_date   - an applied_date (or status date) that isn't YYYY-MM-DD
+    status     - a status outside the pipeline (a repair maps it to a known one)
+    duplicate  - a link already used by an earlier record
+    index      - the sidecar index disagrees with the data
+A repair writes the usable records, canonically formatted, to a new file and the
+dropped ones (with the reason) to a rejected file, so nothing is thrown away.
+"""
+import json
+import os
+import re
+import shutil
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+
+from index_file import IndexFile, NO_DATE, date_ordinal, index_path_for, link_hash, remove_index
+from job_status import DEFAULT_STATUS, STATUS_LABELS, STATUSES
+from job_store import file_stamp, write_jobs
+from migrations import SCHEMA_FIELD, upgrade
+
+CHUNK_SIZE = 64 * 1024
+# Text that still doesn't parse after this many characters is treated as damaged
+MAX_RECORD_CHARS = 1024 * 1024
+# Problems listed individually in a report; all of them are counted
+MAX_LISTED = 200
+# Unambiguous date layouts a repair converts to YYYY-MM-DD
+REPAIRABLE_DATE_FORMATS = ('%Y/%m/%d', '%Y.%m.%d', '%Y%m%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M')
+TEXT_FIELDS = ('company', 'link', 'role')
+# Where the next record starts in files written by this app (used to resync after damage)
+_RECORD_START = re.compile(r',\n    \{')
+_WHITESPACE = re.compile(r'\s*')
+# Dates repeat a lot across records; a bounded memo keeps parsing cheap and memory flat
+_cached_ordinal = lru_cache(maxsize=4096)(date_ordinal)
+
+
+def _date_ordinal(value):
+    return _cached_ordinal(value) if isinstance(value, str) else NO_DATE
+
+
+def repair_paths_for(data_path):
+    """(repaired data, rejected records, backup of the original)"""
+    base = os.path.splitext(data_path)[0]
+    return base + '.repaired.json', base + '.rejected.json', data_path + '.bak'
+
+
+class CheckCancelled(Exception):
+    pass
+
+
+class CheckReport:
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.records = 0
+        self.kept = 0
+        self.repaired = 0
+        self.counts = Counter()
+        # (kind, record position, message), the first MAX_LISTED of them
+        self.problems = []
+        # 'missing', 'valid', 'stale' (rebuilt automatically) or 'mismatch'
+        self.index_state = 'missing'
+        self.changed_during_check = False
+        self.stamp = None
+
+    @property
+    def ok(self):
+        return not self.counts and not self.changed_during_check
+
+    def add(self, kind, position, message):
+        self.counts[kind] += 1
+        if len(self.problems) < MAX_LISTED:
+            self.problems.append((kind, position, message))
+
+    def summary(self):
+        if self.changed_during_check:
+            return "The data file changed while it was checked; run the check again."
+        if self.ok:
+            return f"No problems in {self.records} records (index: {self.index_state})."
+        kinds = ", ".join(f"{count} {kind}" for kind, count in sorted(self.counts.items()))
+        return f"{sum(self.counts.values())} problems in {self.records} records: {kinds}."
+
+    def as_dict(self):
+        return {
+            'data_path': self.data_path, 'records': self.records, 'kept': self.kept,
+            'repaired': self.repaired, 'counts': dict(self.counts), 'index': self.index_state,
+            'changed_during_check': self.changed_during_check,
+            'problems': [{'kind': kind, 'record': position, 'message': message}
+                         for kind, position, message in self.problems],
+        }
+
+
+def iter_elements(f, report, progress=None, cancelled=None):
+    """Yield (offset, length, value) for each element of the top-level JSON list in text file f.
+    Damaged stretches are reported and skipped; for those length is None and value is
+    the damaged text (as much of it as was in memory).
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    base = 0
+    eof = False
+
+    def read():
+        nonlocal buf, eof
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            eof = True
+        buf += chunk
+        if progress is not None:
+            progress(base + len(buf))
+        if cancelled is not None and cancelled():
+            raise CheckCancelled()
+
+    def skip_whitespace(i):
+        while True:
+            i = _WHITESPACE.match(buf, i).end()
+            if i < len(buf) or eof:
+                return i
+            read()
+
+    read()
+    i = skip_whitespace(0)
+    if buf[i:i + 1] != '[':
+        report.add('malformed', None, "the file is not a JSON list")
+        return
+    i = skip_whitespace(i + 1)
+    if buf[i:i + 1] == ']':
+        return
+    position = 0
+    while True:
+        try:
+            value, end = decoder.raw_decode(buf, i)
+            if end == len(buf) and not eof and not isinstance(value, (dict, list, str)):
+                # A number or literal cut off by the chunk boundary; decode it whole
+                read()
+                continue
+        except json.JSONDecodeError:
+            if not eof and len(buf) - i < MAX_RECORD_CHARS:
+                read()
+                continue
+            report.add('malformed', position, f"unreadable text at offset {base + i}")
+            match = _RECORD_START.search(buf, i + 1)
+            yield base + i, None, buf[i:match.start() if match else len(buf)]
+            while match is None and not eof:
+                # Keep only a tail long enough to contain a split record start
+                cut = max(len(buf) - 8, i)
+                base += cut
+                buf = buf[cut:]
+                i = 0
+                read()
+                match = _RECORD_START.search(buf)
+            if match is None:
+                report.add('malformed', position, "the rest of the file can't be read")
+                return
+            i = match.start() + 1
+            i = skip_whitespace(i)
+            position += 1
+            continue
+        yield base + i, end - i, value
+        position += 1
+        i = skip_whitespace(end)
+        if buf[i:i + 1] == ',':
+            i = skip_whitespace(i + 1)
+        elif buf[i:i + 1] == ']':
+            return
+        else:
+            report.add('malformed', position, "the list is truncated (no closing bracket)")
+            return
+        if i >= CHUNK_SIZE:
+            # Drop what has been decoded, once a chunk's worth of it has piled up
+            base += i
+            buf = buf[i:]
+            i = 0
+
+
+def _repair_date(value):
+    """value as YYYY-MM-DD if it is in one of the repairable layouts, else None"""
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    for layout in REPAIRABLE_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, layout).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+
+def _repair_status(value):
+    """The pipeline status value stands for (matching case-insensitively, by name or
+    label), or DEFAULT_STATUS if it matches none
+    """
+    if isinstance(value, str):
+        wanted = value.strip().lower()
+        for status in STATUSES:
+            if wanted in (status, STATUS_LABELS[status].lower()):
+                return status
+    return DEFAULT_STATUS
+
+
+def check_record(job, position, report):
+    """Report problems of one record, fixing what can be fixed in place.
+    Returns the reason to drop the record, or None to keep it.
+    """
+    if not isinstance(job, dict):
+        report.add('malformed', position, f"record {position + 1} is a {type(job).__name__}, not an object")
+        return 'not an object'
+    fixed = False
+    for field in TEXT_FIELDS:
+        value = job.get(field)
+        if value is not None and not isinstance(value, str):
+            job[field] = str(value)
+            fixed = True
+    company = (job.get('company') or '').strip()
+    link = (job.get('link') or '').strip()
+    if not company or not link:
+        missing = " and ".join(name for name, value in (('company', company), ('link', link)) if not value)
+        report.add('missing', position, f"record {position + 1} has no {missing}")
+        return f"no {missing}"
+    label = f"record {position + 1} ({company})"
+    if _date_ordinal(job.get('applied_date')) == NO_DATE:
+        repaired = _repair_date(job.get('applied_date'))
+        if repaired is not None:
+            report.add('bad_date', position, f"{label}: applied_date {job.get('applied_date')!r} read as {repaired}")
+            job['applied_date'] = repaired
+            fixed = True
+        else:
+            report.add('bad_date', position, f"{label}: unreadable applied_date {job.get('applied_date')!r}")
+    history = job.get('status_history')
+    if history is not None and not (isinstance(history, list) and all(isinstance(e, dict) for e in history)):
+        report.add('malformed', position, f"{label}: status_history is not a list of entries")
+        del job['status_history']
+        fixed = True
+    if 'status_history' not in job or 'status' not in job:
+        # Let the migration rebuild the pipeline fields
+        job.pop(SCHEMA_FIELD, None)
+    fixed = upgrade(job) or fixed
+    for entry in job['status_history']:
+        if _date_ordinal(entry.get('date')) == NO_DATE:
+            repaired = _repair_date(entry.get('date'))
+            report.add('bad_date', position, f"{label}: unreadable status date {entry.get('date')!r}")
+            if repaired is not None:
+                entry['date'] = repaired
+                fixed = True
+    if job.get('status') not in STATUSES:
+        repaired = _repair_status(job.get('status'))
+        report.add('status', position, f"{label}: unknown status {job.get('status')!r} read as {repaired}")
+        job['status'] = repaired
+        fixed = True
+    if fixed:
+        report.repaired += 1
+    return None
+
+
+def verify(data_path, repair_path=None, rejected_path=None, progress=None, cancelled=None):
+    """Check data_path in one streaming pass. With repair_path, also write the repaired
+    records there (and the dropped ones to rejected_path). progress(done, total) is
+    called per chunk; cancelled() returning True stops the check with CheckCancelled.
+    """
+    report = CheckReport(data_path)
+    report.stamp = file_stamp(data_path)
+    if report.stamp is None:
+        report.add('missing', None, "the data file does not exist")
+        return report
+    total = report.stamp[0]
+    index = IndexFile.open_if_valid(index_path_for(data_path), data_path)
+    if index is not None:
+        report.index_state = 'valid'
+    elif os.path.exists(index_path_for(data_path)):
+        report.index_state = 'stale'
+    seen = set()
+    rejected = _RejectedWriter(rejected_path if repair_path is not None else None)
+
+    def records(f):
+        for offset, length, job in iter_elements(f, report, progress and (lambda done: progress(done, total)),
+                                                 cancelled):
+            position = report.records
+            report.records += 1
+            if length is None:
+                rejected.write({'reason': 'unreadable', 'offset': offset, 'text': job})
+                continue
+            if index is not None:
+                _compare_index(index, position, offset, length, job, report)
+            reason = check_record(job, position, report)
+            if reason is None:
+                digest = link_hash(job['link'])
+                if digest in seen:
+                    report.add('duplicate', position, f"record {position + 1} repeats the link {job['link']}")
+                    reason = 'duplicate link'
+                else:
+                    seen.add(digest)
+            if reason is not None:
+                rejected.write({'reason': reason, 'record': job})
+                continue
+            report.kept += 1
+            yield job
+        if index is not None and report.records != index.record_count:
+            report.add('index', None, f"the index lists {index.record_count} records, the data has {report.records}")
+
+    try:
+        # newline='' keeps character offsets equal to the index's byte offsets for ASCII files
+        with open(data_path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            if repair_path is None:
+                for _ in records(f):
+                    pass
+            else:
+                with open(repair_path, 'wb') as out:
+                    write_jobs(out, records(f))
+    finally:
+        rejected.close()
+        if index is not None:
+            index.close()
+    if report.counts['index'] and report.index_state == 'valid':
+        report.index_state = 'mismatch'
+    report.changed_during_check = file_stamp(data_path) != report.stamp
+    return report
+
+
+class _RejectedWriter:
+    """Streams dropped records to a JSON list file (or nowhere, without a path)"""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8') if path else None
+        self.count = 0
+
+    def write(self, entry):
+        if self._file is None:
+            return
+        self._file.write(('[\n' if not self.count else ',\n') + json.dumps(entry, indent=4))
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.write('\n]' if self.count else '[]')
+            self._file.close()
+            self._file = None
+
+
+def _compare_index(index, position, offset, length, job, report):
+    if position >= index.record_count:
+        return
+    digest, index_offset, index_length, _, _, _ = index.record(position)
+    # Index spans start at the record's indentation, the decoder at its opening brace
+    if not (index_offset <= offset and index_offset + index_length == offset + length):
+        report.add('index', position, f"record {position + 1} is not where the index says")
+    elif isinstance(job, dict) and digest != link_hash(job.get('link')):
+        report.add('index', position, f"record {position + 1} has a different link than the index says")
+
+
+def discard_repair(data_path):
+    """Remove the repaired and rejected files of a check that won't be applied"""
+    for path in repair_paths_for(data_path)[:2]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def apply_repair(data_path, repair_path, expected_stamp=None):
+    """Replace data_path by the repaired file, keeping the original as a backup.
+    Refuses (returns False) if the data file changed since it was checked.
+    """
+    if expected_stamp is not None and file_stamp(data_path) != expected_stamp:
+        return False
+    backup_path = repair_paths_for(data_path)[2]
+    shutil.copyfile(data_path, backup_path)
+    os.replace(repair_path, data_path)
+    # The store rebuilds the index from the canonical file on the next load
+    remove_index(index_path_for(data_path))
+    return True
@@ -0,0 +1,76 @@
+import os
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# job_data.json.lock next to the data file. The lock is an OS file lock, not the file's
+# existence, so it goes away with the process that held it; the file itself may stay.
+LOCK_SUFFIX = '.lock'
+
+
+class DataLocked(Exception):
+    """Another process (the app, the API server or a CLI command) is using the data file"""
+
+
+def lock_path_for(data_path):
+    return data_path + LOCK_SUFFIX
+
+
+class DataLock:
+    """Advisory lock on one data file, held by whichever process may write it.
+    The app holds it for every open dataset; the API server and the CLI's writing
+    commands refuse to run without it.
+    """
+
+    def __init__(self, data_path):
+        self.path = lock_path_for(data_path)
+        self._file = None
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def acquire(self):
+        """Take the lock without waiting; raises DataLocked if another process holds it"""
+        if self._file is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        f = open(self.path, 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close()
+            raise DataLocked(f"{os.path.basename(self.path[:-len(LOCK_SUFFIX)])} is in use by another program "
+                             f"(the app, the API server or a command line tool)")
+        self._file = f
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -0,0 +1,120 @@
+import os
+from collections import OrderedDict
+
+from archive_store import ArchiveStore
+from command_log import CommandLog
+from data_lock import DataLock, DataLocked
+from job_store import JobStore
+from notes_store import NotesStore
+
+# Loaded data folders kept in memory for instant profile switches
+DEFAULT_CAPACITY = 3
+
+
+class Dataset:
+    """One data file with its archive, notes and undo history, opened and indexed"""
+
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.store = JobStore(data_path)
+        self.archive = ArchiveStore(data_path)
+        # Notes and descriptions; the pack and its search index are read on first use
+        self.notes = NotesStore(data_path)
+        # All record mutations go through the command log so they can be undone
+        self.command_log = CommandLog(self.store)
+        # Set if the archive couldn't be read (the dataset then has an empty one)
+        self.archive_error = None
+        # Held while the dataset is open, so the CLI doesn't write the file underneath
+        self.lock = DataLock(data_path)
+        # Set if another program holds the lock (the dataset is opened anyway)
+        self.lock_error = None
+
+    def open(self):
+        try:
+            self.lock.acquire()
+        except DataLocked as e:
+            self.lock_error = e
+        self.store.open()
+        try:
+            self.archive.open()
+        except Exception as e:
+            self.archive_error = e
+            self.archive = ArchiveStore(self.data_path)
+
+    def flush(self):
+        """Save pending changes and the index"""
+        if self.store.loaded:
+            self.store.save()
+        self.store.sync_index()
+        self.notes.save_index()
+
+    def changed_on_disk(self):
+        """Whether something else (the CLI, another app) wrote the data file since the store
+        last read or saved it, with no unsaved changes here that would be lost by reloading
+        """
+        return not self.store.dirty and self.store.changed_on_disk()
+
+    def close(self):
+        self.flush()
+        self.release()
+
+    def release(self):
+        """Close the files without saving"""
+        self.store.close()
+        self.lock.release()
+
+
+class DatasetCache:
+    """LRU cache of open datasets keyed by data file, so switching back to a recently
+    used profile needs no parsing or indexing. Evicted datasets are flushed and closed.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = max(int(capacity), 1)
+        self._datasets = OrderedDict()
+
+    @staticmethod
+    def _key(data_path):
+        return os.path.normcase(os.path.abspath(data_path))
+
+    def __len__(self):
+        return len(self._datasets)
+
+    def __contains__(self, data_path):
+        return self._key(data_path) in self._datasets
+
+    def get(self, data_path):
+        """The open dataset for data_path, opening it (and evicting the least recently used) if needed"""
+        key = self._key(data_path)
+        dataset = self._datasets.get(key)
+        if dataset is not None and not dataset.changed_on_disk():
+            self._datasets.move_to_end(key)
+            return dataset
+        if dataset is not None:
+            # Written elsewhere while cached: drop the stale copy without saving over it
+            dataset.release()
+            del self._datasets[key]
+        dataset = Dataset(data_path)
+        dataset.open()
+        self._datasets[key] = dataset
+        while len(self._datasets) > self.capacity:
+            oldest_key, oldest = next(iter(self._datasets.items()))
+            # Closing saves first; if that fails the dataset stays cached with its changes
+            oldest.close()
+            del self._datasets[oldest_key]
+        return dataset
+
+    def discard(self, data_path):
+        """Forget a dataset without saving it"""
+        dataset = self._datasets.pop(self._key(data_path), None)
+        if dataset is not None:
+            dataset.release()
+
+    def flush_all(self):
+        for dataset in self._datasets.values():
+            dataset.flush()
+
+    def close_all(self):
+        while self._datasets:
+            _, dataset = self._datasets.popitem(last=False)
+            dataset.close()
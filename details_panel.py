@@ -0,0 +1,215 @@
+import tkinter as tk
+import ttkbootstrap as ttk
+import pyperclip  # For copying to clipboard
+from job_status import STATUSES, history_of, label_for, status_of
+from notes_store import TEXT_REFS
+
+
+class DetailsPanel:
+    """Job details window that is built once and then only refreshed with new data.
+    Closing hides it; Left/Right (or Up/Down) step through the records on screen.
+    Edited notes and descriptions are saved when another record is shown or the window closes.
+    """
+
+    def __init__(self, root, get_records, on_edit=None, on_status_change=None, get_text=None, on_save_texts=None):
+        self.root = root
+        # Returns the list of records currently shown, used for next/previous
+        self.get_records = get_records
+        self.on_edit = on_edit
+        self.on_status_change = on_status_change
+        # get_text(ref) reads a stored text; on_save_texts(job, notes, description) stores them
+        self.get_text = get_text
+        self.on_save_texts = on_save_texts
+        self.window = None
+        self.job = None
+        self.position = None
+        self._copy_reset_job = None
+
+    def show(self, job, position=None):
+        first_show = self.window is None
+        if first_show:
+            self._build()
+        else:
+            self.save_texts()
+        self.job = job
+        self.position = position
+        self._fill()
+
+        if first_show:
+            self._center()
+        elif self.window.state() == "withdrawn":
+            self.window.deiconify()
+        self.window.lift()
+        self.window.focus_set()
+
+    def refresh(self):
+        """Redisplay the current job after it was edited"""
+        if self.window is not None and self.job is not None:
+            self._fill()
+
+    def hide(self):
+        if self.window is not None:
+            self.save_texts()
+            self.window.withdraw()
+
+    def save_texts(self):
+        """Store the notes and description of the current job if they were edited"""
+        if self.on_save_texts is None or self.job is None or not self.notes_text.edit_modified() \
+                and not self.description_text.edit_modified():
+            return
+        notes = self.notes_text.get("1.0", "end-1c")
+        description = self.description_text.get("1.0", "end-1c")
+        self.notes_text.edit_modified(False)
+        self.description_text.edit_modified(False)
+        self.on_save_texts(self.job, notes, description)
+
+    def step(self, delta):
+        """Show the next (delta=1) or previous (delta=-1) record of the current list"""
+        records = self.get_records()
+        if not records or self.position is None:
+            return
+        position = min(max(self.position + delta, 0), len(records) - 1)
+        if position != self.position:
+            self.show(records[position], position)
+
+    def _build(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.geometry("600x760")
+        self.window.transient(self.root)
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        content_frame = ttk.Frame(self.window, padding=20)
+        content_frame.pack(fill="both", expand=True)
+
+        # Company details
+        ttk.Label(content_frame, text="Company:",
+                 font=('TkDefaultFont', 12, 'bold')).pack(anchor="w", pady=(0,5))
+        self.company_label = ttk.Label(content_frame, font=('TkDefaultFont', 11))
+        self.company_label.pack(anchor="w", pady=(0,10))
+
+        self.meta_label = ttk.Label(content_frame, font=('TkDefaultFont', 10))
+        self.meta_label.pack(anchor="w", pady=(0,10))
+
+        # Status and its history
+        status_frame = ttk.Frame(content_frame)
+        status_frame.pack(fill="x", pady=(0,5))
+        self.status_label = ttk.Label(status_frame, font=('TkDefaultFont', 10, 'bold'))
+        self.status_label.pack(side="left")
+        if self.on_status_change is not None:
+            ttk.Button(status_frame, text="Update", style="secondary.TButton",
+                      command=self._change_status).pack(side="right")
+            self.status_var = tk.StringVar()
+            ttk.Combobox(status_frame, textvariable=self.status_var, width=12, state="readonly",
+                        values=[label_for(s) for s in STATUSES]).pack(side="right", padx=5)
+            ttk.Label(status_frame, text="Move to:").pack(side="right")
+        self.history_label = ttk.Label(content_frame, justify="left")
+        self.history_label.pack(anchor="w", pady=(0,20))
+
+        # Link details
+        ttk.Label(content_frame, text="Job Link:",
+                 font=('TkDefaultFont', 12, 'bold')).pack(anchor="w", pady=(0,5))
+        self.link_label = ttk.Label(content_frame, wraplength=550, cursor="hand2")
+        self.link_label.pack(anchor="w", fill="x", pady=(0,20))
+
+        # Notes and the pasted job description, one tab each
+        texts = ttk.Notebook(content_frame)
+        texts.pack(fill="both", expand=True)
+        self.notes_text = tk.Text(texts, height=8, wrap="word")
+        self.description_text = tk.Text(texts, height=8, wrap="word")
+        texts.add(self.notes_text, text="Notes")
+        texts.add(self.description_text, text="Job Description")
+        if self.on_save_texts is None:
+            for widget in (self.notes_text, self.description_text):
+                widget.configure(state="disabled")
+
+        action_frame = ttk.Frame(content_frame)
+        action_frame.pack(pady=10)
+        self.copy_btn = ttk.Button(action_frame, text="Copy Link", style="info.TButton",
+                                   command=self._copy_link)
+        self.copy_btn.pack(side="left", padx=5)
+        if self.on_edit is not None:
+            ttk.Button(action_frame, text="Edit", style="secondary.TButton",
+                      command=lambda: self.on_edit(self.job)).pack(side="left", padx=5)
+        if self.on_save_texts is not None:
+            ttk.Button(action_frame, text="Save Notes", style="success.TButton",
+                      command=self.save_texts).pack(side="left", padx=5)
+
+        # Navigation and close
+        nav_frame = ttk.Frame(content_frame)
+        nav_frame.pack(fill="x", pady=10)
+        ttk.Button(nav_frame, text="< Previous", style="secondary.TButton",
+                  command=lambda: self.step(-1)).pack(side="left")
+        self.position_label = ttk.Label(nav_frame)
+        self.position_label.pack(side="left", expand=True)
+        ttk.Button(nav_frame, text="Next >", style="secondary.TButton",
+                  command=lambda: self.step(1)).pack(side="right")
+
+        ttk.Button(content_frame, text="Close", command=self.hide).pack(pady=10)
+
+        for key, delta in (("<Left>", -1), ("<Up>", -1), ("<Right>", 1), ("<Down>", 1)):
+            self.window.bind(key, lambda e, d=delta: self._on_arrow(e, d))
+        self.window.bind("<Escape>", lambda e: self.hide())
+
+    def _fill(self):
+        job = self.job
+        self.window.title(f"Job Details - {job['company']}")
+        self.company_label.configure(text=job['company'])
+        self.meta_label.configure(
+            text=f"Role: {job.get('role') or 'Not Specified'}    Applied: {job.get('applied_date', '')}")
+        self.link_label.configure(text=job['link'])
+        self.status_label.configure(text=f"Status: {label_for(status_of(job))}")
+        self.history_label.configure(text="\n".join(
+            f"{entry.get('date', '')}  {label_for(entry.get('status', ''))}" for entry in history_of(job)))
+        if self.on_status_change is not None:
+            self.status_var.set(label_for(status_of(job)))
+        for widget, field in ((self.notes_text, TEXT_REFS['notes']),
+                              (self.description_text, TEXT_REFS['description'])):
+            if widget.edit_modified():
+                # Refreshed after another edit of this job: keep what is being typed
+                continue
+            ref = job.get(field)
+            state = widget.cget("state")
+            widget.configure(state="normal")
+            widget.delete("1.0", tk.END)
+            widget.insert("1.0", self.get_text(ref) if ref and self.get_text is not None else "")
+            widget.configure(state=state)
+            widget.edit_modified(False)
+
+        records = self.get_records()
+        if self.position is not None and records:
+            self.position_label.configure(text=f"{self.position + 1} of {len(records)}")
+        else:
+            self.position_label.configure(text="")
+        self._reset_copy_button()
+
+    def _on_arrow(self, event, delta):
+        # Arrow keys move the cursor inside the note boxes
+        if not isinstance(event.widget, tk.Text):
+            self.step(delta)
+
+    def _change_status(self):
+        for status in STATUSES:
+            if label_for(status) == self.status_var.get():
+                self.on_status_change(self.job, status)
+                return
+
+    def _copy_link(self):
+        pyperclip.copy(self.job['link'])
+        self.copy_btn.configure(text="Copied!", style="success.TButton")
+        if self._copy_reset_job is not None:
+            self.window.after_cancel(self._copy_reset_job)
+        self._copy_reset_job = self.window.after(1500, self._reset_copy_button)
+
+    def _reset_copy_button(self):
+        if self._copy_reset_job is not None:
+            self.window.after_cancel(self._copy_reset_job)
+            self._copy_reset_job = None
+        self.copy_btn.configure(text="Copy Link", style="info.TButton")
+
+    def _center(self):
+        self.window.update_idletasks()
+        width = self.window.winfo_width()
+        height = self.window.winfo_height()
+        x = (self.window.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.window.winfo_screenheight() // 2) - (height // 2)
+        self.window.geometry(f'{width}x{height}+{x}+{y}')
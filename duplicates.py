@@ -0,0 +1,100 @@
+import re
+from functools import lru_cache
+
+from index_file import NO_DATE, date_ordinal, normalize_link
+from role_catalog import role_key
+
+# Applications to the same company and role this many days apart are likely duplicates
+DUPLICATE_WINDOW_DAYS = 14
+# Legal-form words ignored when comparing company names ("Acme, Inc." matches "ACME")
+COMPANY_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'limited', 'corp', 'corporation',
+                    'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'bv', 'pvt', 'private'}
+_WORD = re.compile(r'[^\W_]+')
+
+
+@lru_cache(maxsize=4096)
+def company_key(name):
+    """Company name with case, punctuation and trailing legal forms removed"""
+    words = _WORD.findall((name or '').casefold())
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+class DuplicateIndex:
+    """Blocking index for near-duplicate applications. Jobs are bucketed by normalized
+    company, role and a window-sized slice of the applied date, so a lookup reads three
+    small buckets and the full report only compares jobs within neighbouring buckets.
+    """
+
+    def __init__(self, window=DUPLICATE_WINDOW_DAYS):
+        self.window = window
+        # (company, role, date slice) -> {id(job): (ordinal, job)}
+        self._blocks = {}
+
+    def _key(self, job, ordinal):
+        company = company_key(job.get('company') or '')
+        if not company or ordinal == NO_DATE:
+            return None
+        return company, role_key(job.get('role') or ''), ordinal // self.window
+
+    def add(self, job, ordinal=None):
+        ordinal = date_ordinal(job.get('applied_date')) if ordinal is None else ordinal
+        key = self._key(job, ordinal)
+        if key is not None:
+            self._blocks.setdefault(key, {})[id(job)] = (ordinal, job)
+
+    def remove(self, job, ordinal=None):
+        ordinal = date_ordinal(job.get('applied_date')) if ordinal is None else ordinal
+        key = self._key(job, ordinal)
+        block = self._blocks.get(key)
+        if block is not None:
+            block.pop(id(job), None)
+            if not block:
+                del self._blocks[key]
+
+    def candidates(self, job):
+        """Indexed jobs that look like duplicates of job (not counting job itself or its link)"""
+        ordinal = date_ordinal(job.get('applied_date'))
+        key = self._key(job, ordinal)
+        if key is None:
+            return []
+        company, role, bucket = key
+        link = normalize_link(job.get('link'))
+        found = []
+        for neighbour in (bucket - 1, bucket, bucket + 1):
+            for other_ordinal, other in self._blocks.get((company, role, neighbour), {}).values():
+                if (other is not job and abs(other_ordinal - ordinal) <= self.window
+                        and normalize_link(other.get('link')) != link):
+                    found.append(other)
+        return sorted(found, key=lambda other: other.get('applied_date', ''))
+
+    def groups(self):
+        """Lists of jobs linked by near-duplicate pairs, each sorted by date, oldest group first"""
+        parent = {}
+
+        def find(job_id):
+            while parent[job_id] != job_id:
+                parent[job_id] = parent[parent[job_id]]
+                job_id = parent[job_id]
+            return job_id
+
+        jobs = {}
+        for (company, role, bucket), block in self._blocks.items():
+            # Each pair of buckets is compared once: a bucket with itself and with the next one
+            entries = list(block.values())
+            following = list(self._blocks.get((company, role, bucket + 1), {}).values())
+            for i, (ordinal, job) in enumerate(entries):
+                for other_ordinal, other in entries[i + 1:] + following:
+                    if (abs(other_ordinal - ordinal) > self.window
+                            or normalize_link(job.get('link')) == normalize_link(other.get('link'))):
+                        continue
+                    for member in (job, other):
+                        jobs[id(member)] = member
+                        parent.setdefault(id(member), id(member))
+                    parent[find(id(job))] = find(id(other))
+        grouped = {}
+        for job_id, job in jobs.items():
+            grouped.setdefault(find(job_id), []).append(job)
+        groups = [sorted(group, key=lambda job: job.get('applied_date', '')) for group in grouped.values()]
+        return sorted(groups, key=lambda group: group[0].get('applied_date', ''))
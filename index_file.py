@@ -0,0 +1,222 @@
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from datetime import date, datetime
+
+# Sidecar index layout (all little-endian, fixed width except the string tables):
+#   header
+#   record table      record_count x RECORD   (file order)
+#   link table        record_count x LINK_ENTRY (sorted by link hash)
+#   date table        record_count x POSITION (newest first)
+#   company strings   (company_count + 1) offsets + UTF-8 blob
+#   role strings      (role_count + 1) offsets + UTF-8 blob
+MAGIC = b'JTIX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQqIIII')
+RECORD = struct.Struct('<8sQIIII')
+LINK_ENTRY = struct.Struct('<8sI')
+POSITION = struct.Struct('<I')
+
+NO_DATE = 0
+
+
+def normalize_link(link):
+    """Normalize a job link the same way duplicate checks compare them"""
+    return (link or '').strip().lower()
+
+
+def link_hash(link):
+    """64-bit digest of a normalized link"""
+    return hashlib.blake2b(normalize_link(link).encode('utf-8'), digest_size=8).digest()
+
+
+def date_ordinal(value):
+    """Day ordinal of an applied_date string, or NO_DATE if it can't be parsed"""
+    if not value:
+        return NO_DATE
+    try:
+        if 'T' in value:
+            return datetime.fromisoformat(value).date().toordinal()
+        if len(value) == 10 and value[4] == value[7] == '-':
+            # Fast path for the usual zero-padded YYYY-MM-DD (strptime is far slower)
+            try:
+                return date.fromisoformat(value).toordinal()
+            except ValueError:
+                pass
+        return datetime.strptime(value, '%Y-%m-%d').date().toordinal()
+    except Exception:
+        return NO_DATE
+
+
+def index_path_for(data_path):
+    """Path of the sidecar index that belongs to a data file"""
+    return os.path.splitext(data_path)[0] + '.idx'
+
+
+def _pack_strings(strings):
+    blob = bytearray()
+    offsets = [0]
+    for s in strings:
+        blob += s.encode('utf-8')
+        offsets.append(len(blob))
+    return b''.join(POSITION.pack(o) for o in offsets) + bytes(blob)
+
+
+def write_index(index_path, jobs, spans, data_stat, data_crc32):
+    """Write the sidecar index for jobs stored at the given byte spans."""
+    companies = {}
+    roles = {}
+    records = []
+    link_entries = []
+    for position, (job, (offset, length)) in enumerate(zip(jobs, spans)):
+        digest = link_hash(job.get('link', ''))
+        company_id = companies.setdefault(job.get('company', ''), len(companies))
+        role_id = roles.setdefault(job.get('role', ''), len(roles))
+        ordinal = date_ordinal(job.get('applied_date'))
+        records.append(RECORD.pack(digest, offset, length, ordinal, company_id, role_id))
+        link_entries.append((digest, position, ordinal))
+
+    link_table = sorted(link_entries, key=lambda e: (e[0], e[1]))
+    date_table = sorted(link_entries, key=lambda e: (e[2], e[1]), reverse=True)
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, 0, data_stat.st_size, data_stat.st_mtime_ns,
+                    data_crc32, len(jobs), len(companies), len(roles)),
+        b''.join(records),
+        b''.join(LINK_ENTRY.pack(digest, pos) for digest, pos, _ in link_table),
+        b''.join(POSITION.pack(pos) for _, pos, _ in date_table),
+        _pack_strings(companies),
+        _pack_strings(roles),
+    ]
+
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b''.join(parts))
+    os.replace(tmp_path, index_path)
+
+
+def remove_index(index_path):
+    """Delete a stale index; a missing index only costs one full parse"""
+    try:
+        os.remove(index_path)
+    except OSError:
+        pass
+
+
+class IndexFile:
+    """Read-only, memory-mapped view of a sidecar index"""
+
+    def __init__(self, index_path, data_path):
+        self.index_path = index_path
+        self.data_path = data_path
+        self._file = None
+        self._map = None
+
+    @classmethod
+    def open_if_valid(cls, index_path, data_path):
+        """Open the index if it still describes the data file, else return None"""
+        if not (os.path.exists(index_path) and os.path.exists(data_path)):
+            return None
+        index = cls(index_path, data_path)
+        try:
+            index._open()
+            if index._matches_data():
+                return index
+        except (OSError, ValueError, struct.error):
+            pass
+        index.close()
+        return None
+
+    def _open(self):
+        self._file = open(self.index_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.data_size, self.data_mtime_ns, self.data_crc32,
+         self.record_count, self.company_count, self.role_count) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Unsupported index file")
+
+        self._records_at = HEADER.size
+        self._links_at = self._records_at + self.record_count * RECORD.size
+        self._dates_at = self._links_at + self.record_count * LINK_ENTRY.size
+        self._companies_at = self._dates_at + self.record_count * POSITION.size
+        self._roles_at = self._companies_at + (self.company_count + 1) * POSITION.size + \
+            self._string_blob_size(self._companies_at, self.company_count)
+        expected_size = self._roles_at + (self.role_count + 1) * POSITION.size + \
+            self._string_blob_size(self._roles_at, self.role_count)
+        if expected_size != len(self._map):
+            raise ValueError("Truncated index file")
+
+    def _matches_data(self):
+        stat = os.stat(self.data_path)
+        if stat.st_size != self.data_size:
+            return False
+        if stat.st_mtime_ns == self.data_mtime_ns:
+            return True
+        # Same size but touched (copied, synced, restored): fall back to the checksum
+        with open(self.data_path, 'rb') as f:
+            return zlib.crc32(f.read()) == self.data_crc32
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # -------------------- Lookups --------------------
+    def record(self, position):
+        """(link_hash, offset, length, date_ordinal, company_id, role_id) of a record"""
+        return RECORD.unpack_from(self._map, self._records_at + position * RECORD.size)
+
+    def span(self, position):
+        _, offset, length, _, _, _ = self.record(position)
+        return offset, length
+
+    def spans(self):
+        return [self.span(position) for position in range(self.record_count)]
+
+    def positions_for_link(self, link):
+        """Positions whose link hash matches; callers confirm against the record"""
+        digest = link_hash(link)
+        lo, hi = 0, self.record_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._link_entry(mid)[0] < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        positions = []
+        while lo < self.record_count:
+            entry_digest, position = self._link_entry(lo)
+            if entry_digest != digest:
+                break
+            positions.append(position)
+            lo += 1
+        return positions
+
+    def positions_by_date(self):
+        """Record positions ordered newest applied_date first"""
+        for i in range(self.record_count):
+            yield POSITION.unpack_from(self._map, self._dates_at + i * POSITION.size)[0]
+
+    def company_name(self, company_id):
+        return self._string(self._companies_at, self.company_count, company_id)
+
+    def role_name(self, role_id):
+        return self._string(self._roles_at, self.role_count, role_id)
+
+    # -------------------- Internal helpers --------------------
+    def _link_entry(self, i):
+        return LINK_ENTRY.unpack_from(self._map, self._links_at + i * LINK_ENTRY.size)
+
+    def _string_blob_size(self, table_at, count):
+        return POSITION.unpack_from(self._map, table_at + count * POSITION.size)[0]
+
+    def _string(self, table_at, count, string_id):
+        start = POSITION.unpack_from(self._map, table_at + string_id * POSITION.size)[0]
+        end = POSITION.unpack_from(self._map, table_at + (string_id + 1) * POSITION.size)[0]
+        blob_at = table_at + (count + 1) * POSITION.size
+        return self._map[blob_at + start:blob_at + end].decode('utf-8')
@@ -0,0 +1,128 @@
+from collections import Counter
+
+from duplicates import DuplicateIndex
+from index_file import NO_DATE, date_ordinal
+from job_status import STATUSES, stages_reached, status_of
+from notes_store import refs_of
+
+NOT_SPECIFIED = 'Not Specified'
+
+
+def _decrement(counter, key):
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class CompanyGroup:
+    """Applications to one company: how many, for which roles, and when"""
+    __slots__ = ('name', 'count', 'roles', 'dates')
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.roles = Counter()
+        self.dates = Counter()
+
+    def first_date(self):
+        return min(self.dates) if self.dates else NO_DATE
+
+    def last_date(self):
+        return max(self.dates) if self.dates else NO_DATE
+
+
+class JobIndex:
+    """Counters over the loaded records (companies, roles, applied dates) plus
+    per-status buckets, per-company groups, near-duplicate blocks and the records behind each stored
+    note or description. JobStore keeps them current on
+    every mutation, so statistics and the status/company views never need a full scan.
+    """
+
+    def __init__(self, jobs=()):
+        self.total = 0
+        self.companies = Counter()
+        self.roles = Counter()
+        self.dates = Counter()
+        # status -> {id(job): job}, and how many jobs ever reached each status
+        self.status_buckets = {status: {} for status in STATUSES}
+        self.reached = Counter()
+        # company -> CompanyGroup, for the Companies view
+        self.company_groups = {}
+        # Blocking index behind the near-duplicate checks
+        self.duplicates = DuplicateIndex()
+        # text ref -> {id(job): job}, the records full-text search results map back to
+        self.texts = {}
+        for job in jobs:
+            self.add(job)
+
+    @staticmethod
+    def company_key(job):
+        return (job.get('company') or '').strip()
+
+    @staticmethod
+    def role_key(job):
+        return job.get('role', NOT_SPECIFIED) or NOT_SPECIFIED
+
+    def add(self, job):
+        self.total += 1
+        company = self.company_key(job)
+        role = self.role_key(job)
+        ordinal = date_ordinal(job.get('applied_date'))
+        if company:
+            self.companies[company] += 1
+            group = self.company_groups.get(company)
+            if group is None:
+                group = self.company_groups[company] = CompanyGroup(company)
+            group.count += 1
+            group.roles[role] += 1
+            if ordinal != NO_DATE:
+                group.dates[ordinal] += 1
+        self.roles[role] += 1
+        if ordinal != NO_DATE:
+            self.dates[ordinal] += 1
+        self.duplicates.add(job, ordinal)
+        for ref in refs_of(job):
+            self.texts.setdefault(ref, {})[id(job)] = job
+        self.status_buckets.setdefault(status_of(job), {})[id(job)] = job
+        self.reached.update(stages_reached(job))
+
+    def remove(self, job):
+        self.total -= 1
+        company = self.company_key(job)
+        role = self.role_key(job)
+        ordinal = date_ordinal(job.get('applied_date'))
+        if company:
+            _decrement(self.companies, company)
+            group = self.company_groups[company]
+            group.count -= 1
+            if group.count <= 0:
+                del self.company_groups[company]
+            else:
+                _decrement(group.roles, role)
+                if ordinal != NO_DATE:
+                    _decrement(group.dates, ordinal)
+        _decrement(self.roles, role)
+        if ordinal != NO_DATE:
+            _decrement(self.dates, ordinal)
+        self.duplicates.remove(job, ordinal)
+        for ref in refs_of(job):
+            holders = self.texts.get(ref)
+            if holders is not None:
+                holders.pop(id(job), None)
+                if not holders:
+                    del self.texts[ref]
+        self.status_buckets.get(status_of(job), {}).pop(id(job), None)
+        for stage in stages_reached(job):
+            _decrement(self.reached, stage)
+
+    def jobs_with_status(self, status):
+        return list(self.status_buckets.get(status, {}).values())
+
+    def status_counts(self):
+        return {status: len(bucket) for status, bucket in self.status_buckets.items()}
+
+    def date_range(self):
+        """(first, last) applied date ordinals, or None if no record has a valid date"""
+        if not self.dates:
+            return None
+        return min(self.dates), max(self.dates)
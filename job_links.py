@@ -0,0 +1,54 @@
+import re
+from urllib.parse import parse_qs, urlsplit
+
+# Ignore clipboard contents that are clearly not a single URL
+MAX_CLIPBOARD_LENGTH = 2048
+
+_URL = re.compile(r'https?://[^\s<>"\']+', re.IGNORECASE)
+_LINKEDIN_VIEW = re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)')
+
+
+def extract_job_link(text):
+    """Return a canonical job-posting URL found in text, or None.
+    LinkedIn links are reduced to /jobs/view/<id>/ so tracking parameters
+    and search-page variants of the same posting compare equal.
+    """
+    if not text or len(text) > MAX_CLIPBOARD_LENGTH:
+        return None
+    match = _URL.search(text.strip())
+    if not match:
+        return None
+    url = match.group(0).rstrip('.,;)')
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    path = parts.path
+
+    if host.endswith('linkedin.com'):
+        view = _LINKEDIN_VIEW.search(path)
+        job_id = view.group(1) if view else parse_qs(parts.query).get('currentJobId', [None])[0]
+        if job_id and job_id.isdigit():
+            return f"https://www.linkedin.com/jobs/view/{job_id}/"
+        return None
+    if host.endswith('indeed.com') and path.startswith('/viewjob'):
+        job_key = parse_qs(parts.query).get('jk', [None])[0]
+        return f"https://{host}/viewjob?jk={job_key}" if job_key else None
+    if host in ('boards.greenhouse.io', 'job-boards.greenhouse.io', 'jobs.lever.co') \
+            or host.endswith('.myworkdayjobs.com') or host.endswith('.ashbyhq.com'):
+        return f"https://{host}{path.rstrip('/')}"
+    return None
+
+
+def guess_company(link):
+    """Company name implied by an ATS URL (LinkedIn links don't carry one)"""
+    parts = urlsplit(link)
+    host = parts.netloc.lower()
+    segments = [s for s in parts.path.split('/') if s]
+    slug = None
+    if host in ('boards.greenhouse.io', 'job-boards.greenhouse.io', 'jobs.lever.co') \
+            or host.endswith('.ashbyhq.com'):
+        slug = segments[0] if segments else None
+    elif host.endswith('.myworkdayjobs.com'):
+        slug = host.split('.')[0]
+    if not slug:
+        return ""
+    return slug.replace('-', ' ').replace('_', ' ').title()
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+# Pipeline stages, in the order an application normally moves through them
+STATUSES = ('applied', 'interview', 'offer', 'rejected')
+STATUS_LABELS = {
+    'applied': 'Applied',
+    'interview': 'Interview',
+    'offer': 'Offer',
+    'rejected': 'Rejected',
+}
+DEFAULT_STATUS = 'applied'
+# Stages used for the conversion funnel on the Statistics tab
+FUNNEL = ('applied', 'interview', 'offer')
+
+
+def new_job(company, link, role, applied_date):
+    """A new application record, starting in the applied status"""
+    return {
+        'company': company.strip(),  # Strip spaces from all text fields
+        'link': link.strip(),
+        'role': role.strip(),
+        'applied_date': applied_date,
+        'status': DEFAULT_STATUS,
+        'status_history': [{'status': DEFAULT_STATUS, 'date': applied_date}],
+    }
+
+
+def status_of(job):
+    """Current status; records from before status tracking count as applied"""
+    return job.get('status') or DEFAULT_STATUS
+
+
+def history_of(job):
+    """Status history as a list of {'status', 'date'} entries, oldest first"""
+    history = job.get('status_history')
+    if history:
+        return history
+    return [{'status': DEFAULT_STATUS, 'date': job.get('applied_date', '')}]
+
+
+def stages_reached(job):
+    """Every status the application has been in, including the current one"""
+    return {entry.get('status') for entry in history_of(job)} | {status_of(job)}
+
+
+def label_for(status):
+    return STATUS_LABELS.get(status, status.title())
+
+
+def status_change(job, status, when=None):
+    """Field changes that move job to status and append the transition to its history"""
+    when = when or datetime.now().isoformat(timespec='seconds')
+    history = [dict(entry) for entry in history_of(job)]
+    history.append({'status': status, 'date': when})
+    return {'status': status, 'status_history': history}
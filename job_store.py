@@ -0,0 +1,493 @@
+import itertools
+import json
+import os
+import zlib
+
+from index_file import IndexFile, index_path_for, normalize_link, remove_index, write_index
+from job_index import JobIndex
+from job_links import extract_job_link
+from migrations import needs_upgrade, upgrade
+
+# Field value used by update_fields() to delete a field
+MISSING = object()
+# Records upgraded in memory per upgrade_batch() call
+UPGRADE_BATCH_SIZE = 500
+# Shared by every store (and the archive), so a generation number is never reused
+_generations = itertools.count(1)
+
+
+def next_generation():
+    return next(_generations)
+
+
+def file_stamp(path):
+    """(size, mtime_ns) of a file, or None if it doesn't exist; changes with every write"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def record_bytes(job):
+    return ('    ' + json.dumps(job, indent=4).replace('\n', '\n    ')).encode('ascii')
+
+
+def serialize_jobs(jobs):
+    """Render jobs exactly like json.dump(jobs, f, indent=4) and note each record's byte span.
+    Output is pure ASCII (ensure_ascii), so character and byte offsets are the same.
+    """
+    if not jobs:
+        return b'[]', []
+    parts = [b'[\n']
+    spans = []
+    position = 2
+    for i, job in enumerate(jobs):
+        if i:
+            parts.append(b',\n')
+            position += 2
+        text = record_bytes(job)
+        spans.append((position, len(text)))
+        parts.append(text)
+        position += len(text)
+    parts.append(b'\n]')
+    return b''.join(parts), spans
+
+
+def write_records(f, records, spans=None):
+    """Stream records already encoded by record_bytes in the serialize_jobs layout; returns the count.
+    With spans (a list), each record's (offset, length) is appended to it.
+    """
+    count = 0
+    position = 2
+    for text in records:
+        if count:
+            position += 2
+        f.write((b',\n' if count else b'[\n') + text)
+        if spans is not None:
+            spans.append((position, len(text)))
+        position += len(text)
+        count += 1
+    f.write(b'\n]' if count else b'[]')
+    return count
+
+
+def write_jobs(f, jobs, spans=None):
+    """Stream jobs to a binary file in the serialize_jobs layout; returns how many were written"""
+    return write_records(f, (record_bytes(job) for job in jobs), spans)
+
+
+class FullRewrite:
+    """A full, streamed write of a store's records to a side file, meant for a worker thread.
+    JobStore.finish_rewrite() swaps it in on the owning thread, unless the records or
+    the file changed in the meantime.
+    """
+
+    def __init__(self, store):
+        self.jobs = list(store.jobs)
+        self.generation = store.generation
+        self.stamp = store._stamp
+        self.path = store.data_path + '.rewrite.tmp'
+        self.spans = []
+        self.error = None
+
+    def run(self):
+        try:
+            with open(self.path, 'wb') as f:
+                write_jobs(f, self.jobs, self.spans)
+        except Exception as e:
+            # Includes a record edited on the owning thread while it was being encoded
+            self.error = e
+
+
+class JobStore:
+    """Owns job_data.json, its sidecar index and the in-memory indexes (links, counters).
+    When a valid index exists the records are only parsed on first real use.
+    Saves only rewrite the part of the file after the first changed record; the
+    index is refreshed by sync_index() (on close) rather than on every save.
+    The file is stamped after every read and write: if anything else wrote it since,
+    the next save replaces it whole instead of patching byte offsets that moved.
+    """
+
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.index_path = index_path_for(data_path)
+        self._jobs = None
+        self._links = {}
+        # Company/role/date counters, maintained by every mutation below
+        self.index = JobIndex()
+        # Canonical posting URL -> job, built on first use by has_posting()
+        self._postings = None
+        self._index_file = None
+        # Byte spans of the records on disk (None if the file layout is unknown) and
+        # how many leading records in memory are still identical to what is on disk
+        self._spans = None
+        self._persisted = 0
+        self._index_stale = False
+        # file_stamp() of the data file as this store last read or wrote it
+        self._stamp = None
+        # Records before this position are known to be in the current schema
+        self._upgraded_until = 0
+        # Changes whenever the records do, to tell cached query results apart
+        self.generation = next_generation()
+
+    def open(self):
+        """Open the store, parsing the data file only if there is no valid index"""
+        self.close()
+        self._stamp = file_stamp(self.data_path)
+        if self._stamp is None:
+            self._set_jobs([])
+            return
+        self._index_file = IndexFile.open_if_valid(self.index_path, self.data_path)
+        if self._index_file is None:
+            self.load()
+
+    def load(self):
+        """Parse every record and rebuild the in-memory indexes"""
+        if self._index_file is not None and self.changed_on_disk():
+            # Written elsewhere since the index was checked; its spans may be wrong now
+            self.close()
+        with open(self.data_path, 'rb') as f:
+            raw = f.read()
+            stat = os.fstat(f.fileno())
+        self._stamp = stat.st_size, stat.st_mtime_ns
+        jobs = json.loads(raw)
+        if self._index_file is not None:
+            # The index was valid, so its spans describe this exact file
+            spans = self._index_file.spans()
+            self.close()
+            self._set_jobs(jobs)
+            self._mark_persisted(spans)
+            return
+        # Files written by this store are canonical, so their index can be rebuilt
+        # without touching the data. Anything else gets indexed on the next save.
+        data, spans = serialize_jobs(jobs)
+        self._set_jobs(jobs)
+        if data == raw:
+            self._mark_persisted(spans)
+            self._write_index(zlib.crc32(data))
+        else:
+            remove_index(self.index_path)
+
+    def reset(self):
+        """Forget all records (used when the data file can't be read)"""
+        self.close()
+        self._set_jobs([])
+        self._mark_persisted(None)
+
+    def close(self):
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    @property
+    def loaded(self):
+        return self._jobs is not None
+
+    @property
+    def jobs(self):
+        self.ensure_loaded()
+        return self._jobs
+
+    def ensure_loaded(self):
+        """Parse the data file now if only its index was opened"""
+        if self._jobs is None:
+            self.load()
+
+    def count(self):
+        if self._jobs is not None:
+            return len(self._jobs)
+        return self._index_file.record_count
+
+    def head(self, n):
+        """First n records in file order, read through the index if not loaded yet"""
+        if self._jobs is not None:
+            return self._jobs[:n]
+        count = min(n, self._index_file.record_count)
+        with open(self.data_path, 'rb') as f:
+            records = [self._read_record(f, position) for position in range(count)]
+        for job in records:
+            upgrade(job)
+        return records
+
+    def has_link(self, link):
+        """Whether a job with this link (case/whitespace-insensitive) is tracked"""
+        key = normalize_link(link)
+        if self._jobs is not None:
+            return key in self._links
+        positions = self._index_file.positions_for_link(key)
+        if not positions:
+            return False
+        # Hash hits are confirmed against the record itself
+        with open(self.data_path, 'rb') as f:
+            return any(normalize_link(self._read_record(f, p).get('link')) == key for p in positions)
+
+    def find(self, link):
+        """The job with this link, or None"""
+        self.ensure_loaded()
+        return self._links.get(normalize_link(link))
+
+    def has_posting(self, link):
+        """Like has_link, but also matches other URL variants of the same job posting"""
+        if self.has_link(link):
+            return True
+        canonical = extract_job_link(link)
+        if canonical is None:
+            return False
+        if self._postings is None:
+            self._postings = {}
+            for job in self.jobs:
+                self._index_posting(job)
+        return normalize_link(canonical) in self._postings
+
+    # -------------------- Mutations --------------------
+    def add(self, job):
+        upgrade(job)
+        self.jobs.append(job)
+        self._links[normalize_link(job.get('link'))] = job
+        self.index.add(job)
+        if self._postings is not None:
+            self._index_posting(job)
+        self.generation = next_generation()
+
+    def remove_link(self, link):
+        return self.remove_links([link])
+
+    def remove_links(self, links):
+        """Remove every job whose link is in links in a single pass.
+        Returns the removed (position, job) pairs so the removal can be reverted.
+        """
+        keys = {normalize_link(link) for link in links}
+        kept = []
+        removed = []
+        for position, job in enumerate(self.jobs):
+            if normalize_link(job.get('link')) in keys:
+                removed.append((position, job))
+            else:
+                kept.append(job)
+        if not removed:
+            return []
+        self._persisted = min(self._persisted, removed[0][0])
+        self._upgraded_until = min(self._upgraded_until, removed[0][0])
+        self._jobs = kept
+        for key in keys:
+            self._links.pop(key, None)
+        for _, job in removed:
+            self.index.remove(job)
+        self._postings = None
+        self.generation = next_generation()
+        return removed
+
+    def insert_jobs(self, pairs):
+        """Insert (position, job) pairs, positions ascending and relative to the resulting list.
+        This is the exact inverse of remove_links().
+        """
+        if not pairs:
+            return
+        jobs = self.jobs
+        if pairs[0][0] >= len(jobs):
+            # Pure append, the common case when undoing a delete at the end
+            jobs.extend(job for _, job in pairs)
+        else:
+            merged = []
+            remaining = iter(jobs)
+            for position, job in pairs:
+                while len(merged) < position:
+                    merged.append(next(remaining))
+                merged.append(job)
+            merged.extend(remaining)
+            self._jobs = merged
+        for _, job in pairs:
+            upgrade(job)
+            self._links[normalize_link(job.get('link'))] = job
+            self.index.add(job)
+        self._persisted = min(self._persisted, pairs[0][0])
+        self._upgraded_until = min(self._upgraded_until, pairs[0][0])
+        self._postings = None
+        self.generation = next_generation()
+
+    def update_fields(self, updates):
+        """Apply per-job field changes keyed by normalized link, in a single pass.
+        A value of MISSING removes the field. Returns the updated jobs.
+        Records in an old schema are upgraded first, since they are rewritten anyway.
+        """
+        updated = []
+        for position, job in enumerate(self.jobs):
+            old_key = normalize_link(job.get('link'))
+            fields = updates.get(old_key)
+            if fields is None:
+                continue
+            self.index.remove(job)
+            upgrade(job)
+            for name, value in fields.items():
+                if value is MISSING:
+                    job.pop(name, None)
+                else:
+                    job[name] = value
+            self.index.add(job)
+            new_key = normalize_link(job.get('link'))
+            if new_key != old_key:
+                self._links.pop(old_key, None)
+                self._links[new_key] = job
+                self._postings = None
+            self._persisted = min(self._persisted, position)
+            # An undo can put back fields of the old schema
+            self._upgraded_until = min(self._upgraded_until, position)
+            updated.append(job)
+        if updated:
+            self.generation = next_generation()
+        return updated
+
+    def update_links(self, links, changes):
+        """Apply the same field changes to every job whose link is in links; returns the count"""
+        return len(self.update_fields({normalize_link(link): changes for link in links}))
+
+    def clear(self):
+        self.close()
+        self._set_jobs([])
+        self._persisted = 0
+
+    def changed_on_disk(self):
+        """Whether something else wrote (or removed) the data file since this store last read or wrote it"""
+        return file_stamp(self.data_path) != self._stamp
+
+    @property
+    def dirty(self):
+        if self._jobs is None:
+            return False
+        if self._spans is None:
+            return True
+        return not (self._persisted == len(self._spans) == len(self._jobs))
+
+    def save(self):
+        """Persist pending changes, rewriting only the records after the unchanged prefix.
+        If the file was written elsewhere since, the recorded offsets mean nothing any more,
+        so it is replaced whole (atomically) with this store's records.
+        """
+        jobs = self.jobs
+        if not self.dirty:
+            return
+        if self._spans is None or self._persisted == 0 or self.changed_on_disk():
+            self._write_full(jobs)
+        else:
+            self._write_tail(jobs)
+        self._index_stale = True
+
+    def compact(self):
+        """Rewrite the whole data file in canonical form and rebuild its index"""
+        self._write_full(self.jobs)
+        self._index_stale = True
+        self.sync_index()
+
+    def upgrade_batch(self, limit=UPGRADE_BATCH_SIZE):
+        """Upgrade the next batch of up to limit records still in an old schema, in memory.
+        They are written by the next save or a FullRewrite. Returns True while more remain.
+        """
+        jobs = self.jobs
+        start = next((position for position in range(self._upgraded_until, len(jobs))
+                      if needs_upgrade(jobs[position])), None)
+        if start is None:
+            self._upgraded_until = len(jobs)
+            return False
+        end = min(start + limit, len(jobs))
+        for job in jobs[start:end]:
+            upgrade(job)
+        self._persisted = min(self._persisted, start)
+        self._upgraded_until = end
+        return end < len(jobs)
+
+    def begin_rewrite(self):
+        """A FullRewrite of the current records; run() it off this thread, then finish_rewrite()"""
+        return FullRewrite(self)
+
+    def finish_rewrite(self, rewrite):
+        """Replace the data file with a finished FullRewrite. Returns False, dropping it,
+        if it failed or the records or the file changed since it began.
+        """
+        if rewrite.error is not None or rewrite.generation != self.generation \
+                or rewrite.stamp != self._stamp or self.changed_on_disk():
+            try:
+                os.remove(rewrite.path)
+            except OSError:
+                pass
+            return False
+        self.close()
+        os.replace(rewrite.path, self.data_path)
+        self._stamp = file_stamp(self.data_path)
+        self._spans = rewrite.spans
+        self._persisted = len(rewrite.jobs)
+        self._index_stale = True
+        return True
+
+    def sync_index(self):
+        """Bring the sidecar index up to date with the data file (call before exit)"""
+        if not self._index_stale or self._spans is None or self.changed_on_disk():
+            return
+        with open(self.data_path, 'rb') as f:
+            data_crc32 = zlib.crc32(f.read())
+        self._write_index(data_crc32)
+
+    # -------------------- Internal helpers --------------------
+    def _set_jobs(self, jobs):
+        # Records in an old schema stay as they are until edited or upgraded by
+        # upgrade_batch(); readers go through the job_status helpers
+        self._upgraded_until = 0
+        self._jobs = jobs
+        self._links = {normalize_link(job.get('link')): job for job in jobs}
+        self.index = JobIndex(jobs)
+        self._postings = None
+        self.generation = next_generation()
+
+    def _index_posting(self, job):
+        canonical = extract_job_link(job.get('link'))
+        if canonical is not None:
+            self._postings[normalize_link(canonical)] = job
+
+    def _mark_persisted(self, spans):
+        self._spans = spans
+        self._persisted = len(spans) if spans is not None else 0
+        self._index_stale = False
+
+    def _write_full(self, jobs):
+        data, spans = serialize_jobs(jobs)
+        self.close()
+        tmp_path = self.data_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.data_path)
+        self._stamp = file_stamp(self.data_path)
+        self._spans = spans
+        self._persisted = len(jobs)
+
+    def _write_tail(self, jobs):
+        keep = self._persisted
+        offset, length = self._spans[keep - 1]
+        position = offset + length
+        spans = self._spans[:keep]
+        parts = []
+        for job in jobs[keep:]:
+            text = record_bytes(job)
+            parts.append(b',\n' + text)
+            spans.append((position + 2, len(text)))
+            position += 2 + len(text)
+        parts.append(b'\n]')
+        with open(self.data_path, 'r+b') as f:
+            f.seek(offset + length)
+            f.write(b''.join(parts))
+            f.truncate()
+        self._stamp = file_stamp(self.data_path)
+        self._spans = spans
+        self._persisted = len(jobs)
+
+    def _read_record(self, f, position):
+        offset, length = self._index_file.span(position)
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+    def _write_index(self, data_crc32):
+        # The index is only a startup accelerator; failing to write it is not an error
+        try:
+            write_index(self.index_path, self._jobs, self._spans, os.stat(self.data_path), data_crc32)
+            self._index_stale = False
+        except OSError:
+            remove_index(self.index_path)
@@ -1,15 +1,61 @@
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import filedialog
+from tkinter import simpledialog
 import ttkbootstrap as ttk
 from ttkbootstrap.scrolled import ScrolledFrame
 import json
+import multiprocessing
 import os
 import sys
-from datetime import datetime
-import pyperclip  # For copying to clipboard
+import threading
+import time
+from datetime import datetime, timedelta
 from stats_manager import StatsManager
+from query_cache import QueryCache
+from tree_rows import TreeRows
+from api_server import ApiServer, CallQueue, ServerThread, StoreBackend
 from settings_manager import SettingsManager
+from dataset_cache import Dataset, DatasetCache
+from data_check import CheckCancelled, apply_repair, discard_repair, file_stamp, repair_paths_for, verify
+from merge_data import merge_files
+from archive_store import inactive_jobs
+from index_file import NO_DATE, date_ordinal, normalize_link
+from notifications import Notifier
+from clipboard_capture import CaptureQueue, ClipboardWatcher
+from details_panel import DetailsPanel
+from companies_view import CompaniesView
+from role_picker import RolePicker
+from role_catalog import role_key
+from reminders import FOLLOWED_UP_FIELD, REMIND_ON_FIELD, ReminderScheduler
+from command_log import AddJobs, ArchiveJobs, RemapRole, RemoveJobs, RestoreJobs, UpdateJobs
+from job_store import MISSING
+from notes_store import TEXT_REFS, refs_of
+from job_status import STATUSES, label_for, new_job, status_change, status_of
+
+# For the launch-time probe (startup_probe.py)
+IMPORTS_DONE = time.time()
+# Same as startup_probe.PROBE_ENV; that module is only imported when it is set
+PROBE_ENV = 'JOBTRACKER_STARTUP_PROBE'
+
+# Records rendered straight from the index before the full data file is parsed,
+# and rendered at once before the rest of a list is built at idle time
+FIRST_PAGE_SIZE = 50
+# Rows built, and cleared rows destroyed, per idle callback; input is handled in between
+RENDER_BATCH_SIZE = 20
+TEARDOWN_BATCH_SIZE = 50
+# Delay before startup maintenance (archiving old records, upgrading records
+# from older data files) runs, so it never competes with the first render
+MAINTENANCE_DELAY_MS = 3000
+# Pause between batches of old records being upgraded in memory
+UPGRADE_STEP_MS = 200
+# How far "Remind Me Later" pushes a follow-up reminder back
+SNOOZE_DAYS = 3
+# How often the progress of a background data check is shown
+CHECK_POLL_MS = 100
+# Why add_job() didn't add a record (the reason in its (added, reason) result)
+ALREADY_TRACKED = "tracked"
+DUPLICATE_DECLINED = "duplicate"
 
 class JobTracker:
     def __init__(self, root):
@@ -26,35 +72,366 @@ class JobTracker:
         # SettingsManager manages storage paths
         self.settings_manager = SettingsManager(self.app_dir)
         self.data_file = self.settings_manager.get_data_file_path()
+        # Recently used profiles stay loaded and indexed, so switching back is instant
+        self.datasets = DatasetCache()
 
         # Before loading the app UI, ensure storage location and user name are set
         self._ensure_initial_setup()
         self.load_data()
         
-        # Initialize stats manager
-        self.stats_manager = StatsManager(self.jobs, self.settings_manager)
+        # Bumped whenever the results frame is cleared so deferred renders can tell they are stale
+        self._render_generation = 0
+        # Whether rows of the current list are still being built, and the pending idle callback
+        self._render_pending = False
+        self._render_job = None
+        # Which list the results frame shows ("all", "search" or "status") and its records
+        self._view = "all"
+        self._status_filter = None
+        self._displayed_jobs = []
+        # Search results, status lists and statistics for the current data generation,
+        # and the (query, generation) the results frame currently shows
+        self.queries = QueryCache()
+        self._shown = None
+        # Info frame path -> row widgets/state for the rendered rows, plus the rows in display order
+        self._record_rows = {}
+        self._row_list = []
+        # Normalized links of the records ticked for batch actions
+        self._selected_links = set()
+        self.details_panel = DetailsPanel(self.root, lambda: self._displayed_jobs,
+                                          on_edit=self.show_edit_job_dialog,
+                                          on_status_change=lambda job, status: self.set_status([job], status),
+                                          get_text=lambda ref: self.notes.get(ref),
+                                          on_save_texts=self.save_job_texts)
+        # Pending idle callback that saves and refreshes statistics after edits
+        self._flush_job = None
+        # Local API server thread and the queue its calls reach the Tk thread through;
+        # Tk is only woken (once per batch) when calls arrive
+        self._api_calls = CallQueue(wake=lambda: self.root.after(0, self._api_calls.drain))
+        self._api_thread = None
+        # Follow-up reminders; loaded with the records during startup maintenance
+        self.reminders = ReminderScheduler(self.root, self._on_follow_ups_due,
+                                           self.settings_manager.get_follow_up_days())
+        # Background data check: its thread, shared progress state and last report
+        self._check_thread = None
+        self._check_cancel = threading.Event()
+        self._merge_thread = None
+        self._check_state = None
+        self._check_report = None
+        # Pending startup maintenance pass, batch of the background schema upgrade and
+        # the thread writing the upgraded file
+        self._maintenance_job = None
+        self._upgrade_job = None
+        self._rewrite_thread = None
         
         self.create_widgets()
         # Show all records when app starts
         self.show_all_records()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._schedule_maintenance()
+        if self.settings_manager.is_api_enabled():
+            self.start_api()
+        
+    @property
+    def jobs(self):
+        """All job records (parses the data file on first access)"""
+        return self.store.jobs
         
     def load_data(self):
+        """Make the dataset for self.data_file current, from the cache when it was used recently"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    self.jobs = json.load(f)
-            else:
-                self.jobs = []
+            self.dataset = self.datasets.get(self.data_file)
         except Exception as e:
             messagebox.showerror("Error", f"Error loading data: {str(e)}")
-            self.jobs = []
+            self.dataset = Dataset(self.data_file)
+            self.dataset.store.reset()
+        if self.dataset.archive_error is not None:
+            messagebox.showerror("Error", f"Error loading archive: {str(self.dataset.archive_error)}")
+            self.dataset.archive_error = None
+        if self.dataset.lock_error is not None:
+            messagebox.showwarning("Warning", f"{self.dataset.lock_error}. Changes saved here and there "
+                                              f"may overwrite each other; close the other program first.")
+            self.dataset.lock_error = None
+        self.store = self.dataset.store
+        # All record mutations go through the command log so they can be undone
+        self.command_log = self.dataset.command_log
+        # Old applications live in a compressed archive; only its compact index is read here
+        self.archive = self.dataset.archive
+        # Notes and job descriptions, stored outside the records
+        self.notes = self.dataset.notes
             
     def save_data(self):
+        if self.store.dirty and self.store.changed_on_disk():
+            if not messagebox.askyesno(
+                    "Data Changed",
+                    "The data file was changed outside the app since it was loaded.\n\n"
+                    "Save your changes over it? Choose No to discard them and load the file as it is now."):
+                self._reload_data()
+                return
+        try:
+            self.store.save()
+        except Exception as e:
+            messagebox.showerror("Error", f"Error saving data: {str(e)}")
+
+    def _reload_data(self):
+        """Drop the current dataset, unsaved changes included, and load the data file again"""
+        self.datasets.discard(self.data_file)
+        self.load_data()
+        self.reload_views()
+        self._load_reminders()
+
+    def _schedule_flush(self):
+        """Save and refresh statistics once the UI is idle, coalescing a burst of edits"""
+        if self._flush_job is None:
+            self._flush_job = self.root.after_idle(self._flush)
+
+    def _flush(self):
+        self._flush_job = None
+        self.save_data()
+        self.refresh_statistics()
+        self.refresh_companies()
+
+    def _schedule_maintenance(self):
+        """(Re)start the delayed maintenance pass, dropping one still pending for another dataset"""
+        for job in (self._maintenance_job, self._upgrade_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self._upgrade_job = None
+        self._maintenance_job = self.root.after(MAINTENANCE_DELAY_MS, self._startup_maintenance)
+
+    def _startup_maintenance(self):
+        self._maintenance_job = None
+        if not self.store.loaded:
+            return
+        self.archive_old_records(automatic=True)
+        self._write_back_upgrades(self.store)
+        self._load_reminders()
+        self._compact_notes()
+    
+    def _write_back_upgrades(self, store, upgraded=False):
+        """Upgrade records from older data files a batch at a time between UI events, then
+        write the whole file once in a background thread
+        """
+        self._upgrade_job = None
+        if store is not self.store:
+            # The profile was switched; its maintenance starts over when it is active again
+            return
+        if store.upgrade_batch():
+            self._upgrade_job = self.root.after(UPGRADE_STEP_MS, self._write_back_upgrades, store, True)
+            return
+        if not (upgraded or store.dirty) or self._rewrite_thread is not None:
+            return
+        rewrite = store.begin_rewrite()
+        self._rewrite_thread = threading.Thread(target=rewrite.run, name="job-tracker-upgrade", daemon=True)
+        self._rewrite_thread.start()
+        self._poll_rewrite(store, rewrite)
+    
+    def _poll_rewrite(self, store, rewrite):
+        if self._rewrite_thread.is_alive():
+            self.root.after(CHECK_POLL_MS, self._poll_rewrite, store, rewrite)
+            return
+        self._rewrite_thread = None
+        try:
+            # Dropped if anything was edited meanwhile; the next save writes the upgrades then
+            store.finish_rewrite(rewrite)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error saving data: {str(e)}")
+    
+    def _loaded_index(self):
+        """The live JobIndex, parsing the data file first if startup left it unparsed"""
+        self.store.ensure_loaded()
+        return self.store.index
+    
+    def _on_tab_changed(self, event):
+        if self._stats_stale:
+            self.refresh_statistics()
+        if self.companies_view.stale:
+            self.refresh_companies()
+    
+    def refresh_companies(self):
+        """Rebuild the Companies list now if it's on screen, otherwise when it's next opened"""
+        if self.notebook.select() == str(self.companies_tab):
+            self.companies_view.refresh()
+        else:
+            self.companies_view.stale = True
+    
+    def show_company_records(self, company):
+        """Switch to the Applications tab and list one company's records"""
+        self.search_type.set("company")
+        self.search_var.set(company)
+        self.notebook.select(self.main_tab)
+        self.search_job()
+    
+    def is_tracked(self, link):
+        """Whether a link is already tracked, in the working set or the archive"""
+        return self.store.has_link(link) or self.archive.has_link(link)
+    
+    def archive_old_records(self, automatic=False):
+        """Move applications inactive for longer than the configured age to the archive"""
+        days = self.settings_manager.get_archive_after_days()
+        if not days:
+            if not automatic:
+                self.notifier.info("Archiving is turned off (0 days).")
+            return
+        old = inactive_jobs(self.store, days)
+        if not old:
+            if not automatic:
+                self.notifier.info(f"No applications inactive for more than {days} days.")
+            return
+        try:
+            # An undoable command, so even automatic archiving keeps the undo history
+            self.run_command(ArchiveJobs(self.archive, old))
+        except Exception as e:
+            messagebox.showerror("Error", f"Error archiving applications: {str(e)}")
+            return
+        self.notifier.info(f"Archived {len(old)} applications inactive for more than {days} days (Undo brings them back)")
+    
+    def restore_archived(self, link):
+        """Move an archived application back into the working set"""
+        job = self.archive.find(link)
+        if job is None:
+            return
+        try:
+            self.run_command(RestoreJobs(self.archive, [job]))
+        except Exception as e:
+            messagebox.showerror("Error", f"Error restoring application: {str(e)}")
+            return
+        self.refresh_view()
+        self.notifier.success(f"Restored {job['company']}")
+
+    def flush_pending(self):
+        """Write any scheduled save and the startup index right away"""
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+            self._flush_job = None
+            self.save_data()
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.jobs, f, indent=4)
+            self.dataset.flush()
+        except Exception:
+            # A stale index only means one full parse on the next launch
+            pass
+
+    def on_close(self):
+        if self.details_panel.window is not None:
+            self.details_panel.save_texts()
+        self.stop_api()
+        self.reminders.stop()
+        self._check_cancel.set()
+        self.flush_pending()
+        try:
+            self.datasets.close_all()
         except Exception as e:
             messagebox.showerror("Error", f"Error saving data: {str(e)}")
+        self.root.destroy()
+    
+    # -------------------- Storage profiles --------------------
+    def switch_profile(self, name):
+        """Swap in another profile's data and settings and re-render every view"""
+        if name == self.settings_manager.get_active_profile():
+            return
+        # Persist pending edits; the dataset stays cached for switching back
+        self.flush_pending()
+        self.settings_manager.switch_profile(name)
+        self.data_file = self.settings_manager.get_data_file_path()
+        self.load_data()
+        self.reload_views()
+        self._schedule_maintenance()
+        self.notifier.info(f"Switched to profile {name}")
+    
+    def _on_profile_selected(self, event=None):
+        self.switch_profile(self.profile_var.get())
+    
+    def add_profile(self):
+        name = simpledialog.askstring("New Profile", "Profile name:", parent=self.root)
+        if not name or not name.strip():
+            return
+        folder = filedialog.askdirectory(title=f"Choose the storage folder for {name.strip()}")
+        if not folder:
+            return
+        if not self.settings_manager.add_profile(name, folder):
+            messagebox.showwarning("Warning", f"A profile named '{name.strip()}' already exists")
+            return
+        self._update_profile_choices()
+        self.switch_profile(name.strip())
+    
+    def remove_profile(self):
+        name = self.removable_profile_var.get()
+        if not name:
+            messagebox.showwarning("Warning", "Please choose a profile to remove (the active one can't be removed)")
+            return
+        if not messagebox.askyesno("Confirm", f"Remove the profile '{name}'? Its folder and data are kept."):
+            return
+        if self.settings_manager.remove_profile(name):
+            self._update_profile_choices()
+            self.notifier.info(f"Removed profile {name}")
+    
+    def _update_profile_choices(self):
+        profiles = list(self.settings_manager.get_profiles())
+        active = self.settings_manager.get_active_profile()
+        self.profile_combo['values'] = profiles
+        self.profile_var.set(active)
+        if hasattr(self, 'removable_profile_combo'):
+            self.removable_profile_combo['values'] = [name for name in profiles if name != active]
+            self.removable_profile_var.set("")
+    
+    def _greeting_text(self):
+        user_name = self.settings_manager.get_user_name()
+        return f"Welcome back, {user_name}!" if user_name else "Welcome to Job Application Tracker!"
+    
+    def reload_views(self):
+        """Re-render everything that shows the current data or settings (after a folder or profile change)"""
+        self._selected_links.clear()
+        self._update_selection_label()
+        # The new dataset's reminders are loaded by the maintenance pass scheduled after a switch
+        self.reminders.load([], self.settings_manager.get_follow_up_days())
+        self._update_follow_up_button()
+        self.details_panel.hide()
+        self._update_history_buttons()
+        self.greeting_label.config(text=self._greeting_text())
+        self._update_profile_choices()
+        self.storage_dir_var.set(self.settings_manager.get_storage_directory())
+        self.settings_name_var.set(self.settings_manager.get_user_name())
+        self.archive_days_var.set(str(self.settings_manager.get_archive_after_days()))
+        self.follow_up_days_var.set(str(self.settings_manager.get_follow_up_days()))
+        self._refresh_roles_list()
+        self.show_all_records()
+        self.refresh_statistics()
+        self.refresh_companies()
+    
+    # -------------------- Local API --------------------
+    def start_api(self):
+        """Serve the localhost API; requests are answered from the Tk thread's store"""
+        if self._api_thread is not None and self._api_thread.running:
+            return True
+        backend = StoreBackend(lambda: self.store, lambda: self.archive, on_add=self._api_add)
+        server = ApiServer(backend, self.settings_manager.get_api_port(), self._api_calls)
+        self._api_thread = ServerThread(server)
+        if not self._api_thread.start():
+            self.notifier.error(f"Could not start the local API: {self._api_thread.error}")
+            self._api_thread = None
+            return False
+        self.notifier.info(f"Local API listening on port {server.port}")
+        return True
+    
+    def stop_api(self):
+        if self._api_thread is not None:
+            self._api_thread.stop()
+            self._api_thread = None
+    
+    def _api_add(self, job):
+        """Add a job posted by the browser extension through the regular (undoable) add path"""
+        added, _ = self.add_job(job['company'], job['link'], job['role'], job['applied_date'],
+                                confirm_duplicates=False)
+        return added
+    
+    def toggle_api(self):
+        enabled = self.api_enabled_var.get()
+        if enabled and not self.start_api():
+            self.api_enabled_var.set(False)
+            return
+        if not enabled:
+            self.stop_api()
+            self.notifier.info("Local API stopped")
+        self.settings_manager.set_api_enabled(enabled)
 
     def _ensure_initial_setup(self):
         """Prompt for storage folder and user name only on true first run.
@@ -154,11 +531,21 @@ class JobTracker:
         greeting_frame.pack(fill="x", padx=10, pady=(10,5))
         
         # User greeting
-        user_name = self.settings_manager.get_user_name()
-        greeting_text = f"Welcome back, {user_name}!" if user_name else "Welcome to Job Application Tracker!"
-        greeting_label = ttk.Label(greeting_frame, text=greeting_text, 
+        self.greeting_label = ttk.Label(greeting_frame, text=self._greeting_text(),
                                  font=('TkDefaultFont', 12, 'bold'))
-        greeting_label.pack(side="left")
+        self.greeting_label.pack(side="left")
+        
+        # Profile switcher
+        self.profile_var = tk.StringVar()
+        self.profile_combo = ttk.Combobox(greeting_frame, textvariable=self.profile_var,
+                                          state="readonly", width=20)
+        self.profile_combo.pack(side="right")
+        self.profile_combo.bind("<<ComboboxSelected>>", self._on_profile_selected)
+        ttk.Label(greeting_frame, text="Profile:").pack(side="right", padx=5)
+        self._update_profile_choices()
+        
+        # Status bar for non-modal feedback (packed before the notebook so it keeps its space)
+        self.notifier = Notifier(self.root)
         
         # Create notebook for tabs
         self.notebook = ttk.Notebook(self.root)
@@ -168,6 +555,10 @@ class JobTracker:
         self.main_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.main_tab, text="Applications")
         
+        # Companies tab
+        self.companies_tab = ttk.Frame(self.notebook)
+        self.notebook.add(self.companies_tab, text="Companies")
+        
         # Stats tab
         self.stats_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.stats_tab, text="Statistics")
@@ -177,8 +568,11 @@ class JobTracker:
         self.notebook.add(self.settings_tab, text="Settings")
         
         self.create_main_tab()
+        self.companies_view = CompaniesView(self.companies_tab, self._loaded_index,
+                                            on_open_company=self.show_company_records)
         self.create_stats_tab()
         self.create_settings_tab()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
     def create_stats_tab(self):
         """Create the statistics tab with basic analytics only"""
@@ -200,6 +594,9 @@ class JobTracker:
         self.daily_rate_label = ttk.Label(basic_stats_frame, text="Daily Application Rate: 0.0")
         self.daily_rate_label.pack(anchor="w", pady=2)
         
+        self.archived_label = ttk.Label(basic_stats_frame, text="Archived Applications: 0")
+        self.archived_label.pack(anchor="w", pady=2)
+        
         # Applications by Role Section
         roles_frame = ttk.LabelFrame(stats_container, text="Applications by Role", padding=10)
         roles_frame.pack(fill="x", padx=5, pady=5)
@@ -209,13 +606,33 @@ class JobTracker:
         self.roles_tree.heading("count", text="Applications")
         self.roles_tree.pack(fill="x", pady=5)
         
+        # Status pipeline and conversion funnel
+        pipeline_frame = ttk.LabelFrame(stats_container, text="Application Pipeline", padding=10)
+        pipeline_frame.pack(fill="x", padx=5, pady=5)
+        
+        self.status_tree = ttk.Treeview(pipeline_frame, columns=("status", "current", "reached", "conversion"),
+                                        show="headings", height=len(STATUSES))
+        self.status_tree.heading("status", text="Status")
+        self.status_tree.heading("current", text="Currently")
+        self.status_tree.heading("reached", text="Ever Reached")
+        self.status_tree.heading("conversion", text="Conversion")
+        self.status_tree.pack(fill="x", pady=5)
+        
         # Refresh button
         ttk.Button(stats_container, text="Refresh Statistics", 
                   command=self.refresh_statistics,
                   style="info.TButton").pack(pady=10)
         
-        # Initial statistics update
-        self.refresh_statistics()
+        # Diagnostics: how often views were served from the query cache
+        self.cache_label = ttk.Label(stats_container, text="", bootstyle="secondary")
+        self.cache_label.pack(pady=(0, 10))
+        self._shown_stats = None
+        
+        # Tables are diffed on refresh instead of being rebuilt
+        self.roles_rows = TreeRows(self.roles_tree)
+        self.status_rows = TreeRows(self.status_tree)
+        # Statistics are computed the first time the tab is opened, not at startup
+        self._stats_stale = True
     
     def create_settings_tab(self):
         """Create the settings tab for managing user preferences"""
@@ -245,16 +662,89 @@ class JobTracker:
         def choose_folder():
             folder = filedialog.askdirectory(title="Choose storage folder")
             if folder:
+                # Persist pending edits before the data file is copied or swapped
+                self.flush_pending()
                 # Apply new storage directory
                 self.settings_manager.set_storage_directory(folder)
-                # Update internal data path and reload data
+                # Update internal data path, reload data and re-render every view
                 self.data_file = self.settings_manager.get_data_file_path()
-                self.storage_dir_var.set(self.settings_manager.get_storage_directory())
                 self.load_data()
-                self.refresh_statistics()
+                self.reload_views()
 
         ttk.Button(storage_frame, text="Change Folder", command=choose_folder, style="secondary.TButton").grid(row=0, column=2, padx=5, pady=5)
         
+        # Profiles: named storage folders, switched from the combobox next to the greeting
+        ttk.Label(storage_frame, text="Profiles:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        profile_frame = ttk.Frame(storage_frame)
+        profile_frame.grid(row=1, column=1, columnspan=2, padx=5, pady=5, sticky="w")
+        ttk.Button(profile_frame, text="New Profile...", command=self.add_profile,
+                  style="info.TButton").pack(side="left", padx=(0, 5))
+        self.removable_profile_var = tk.StringVar()
+        self.removable_profile_combo = ttk.Combobox(profile_frame, textvariable=self.removable_profile_var,
+                                                    state="readonly", width=20)
+        self.removable_profile_combo.pack(side="left", padx=5)
+        ttk.Button(profile_frame, text="Remove Profile", command=self.remove_profile,
+                  style="danger.TButton").pack(side="left")
+        self._update_profile_choices()
+        
+        ttk.Label(storage_frame, text="Other Devices:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.merge_button = ttk.Button(storage_frame, text="Merge Data Files...", command=self.merge_data_files,
+                                       style="info.TButton")
+        self.merge_button.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+        
+        # Archive Section
+        archive_frame = ttk.LabelFrame(settings_container, text="Archive", padding=10)
+        archive_frame.pack(fill="x", padx=5, pady=5)
+        
+        ttk.Label(archive_frame, text="Archive applications inactive for more than").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.archive_days_var = tk.StringVar(value=str(self.settings_manager.get_archive_after_days()))
+        ttk.Spinbox(archive_frame, textvariable=self.archive_days_var, from_=0, to=3650,
+                   increment=30, width=6).grid(row=0, column=1, padx=5, pady=5)
+        ttk.Label(archive_frame, text="days (0 = never)").grid(row=0, column=2, padx=5, pady=5, sticky="w")
+        ttk.Button(archive_frame, text="Archive Now", command=self.archive_now,
+                  style="secondary.TButton").grid(row=0, column=3, padx=5, pady=5)
+        
+        # Follow-up Reminders Section
+        follow_up_frame = ttk.LabelFrame(settings_container, text="Follow-up Reminders", padding=10)
+        follow_up_frame.pack(fill="x", padx=5, pady=5)
+        
+        ttk.Label(follow_up_frame, text="Remind me to follow up").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.follow_up_days_var = tk.StringVar(value=str(self.settings_manager.get_follow_up_days()))
+        ttk.Spinbox(follow_up_frame, textvariable=self.follow_up_days_var, from_=0, to=365,
+                   increment=1, width=6).grid(row=0, column=1, padx=5, pady=5)
+        ttk.Label(follow_up_frame, text="days after applying without a status change (0 = never)").grid(row=0, column=2, padx=5, pady=5, sticky="w")
+        
+        # Browser Extension Section
+        api_frame = ttk.LabelFrame(settings_container, text="Browser Extension", padding=10)
+        api_frame.pack(fill="x", padx=5, pady=5)
+        
+        self.api_enabled_var = tk.BooleanVar(value=self.settings_manager.is_api_enabled())
+        ttk.Checkbutton(api_frame,
+                       text=f"Serve the local API on port {self.settings_manager.get_api_port()} (this computer only)",
+                       variable=self.api_enabled_var,
+                       command=self.toggle_api,
+                       bootstyle="round-toggle").pack(anchor="w")
+        
+        # Data Check Section
+        check_frame = ttk.LabelFrame(settings_container, text="Data Check", padding=10)
+        check_frame.pack(fill="x", padx=5, pady=5)
+        
+        check_buttons = ttk.Frame(check_frame)
+        check_buttons.pack(fill="x")
+        self.check_button = ttk.Button(check_buttons, text="Verify Data", command=self.verify_data,
+                                       style="info.TButton")
+        self.check_button.pack(side="left")
+        self.repair_button = ttk.Button(check_buttons, text="Repair", command=self.repair_data,
+                                        style="warning.TButton", state="disabled")
+        self.repair_button.pack(side="left", padx=5)
+        self.check_progress = ttk.Progressbar(check_buttons, maximum=100)
+        self.check_progress.pack(side="left", fill="x", expand=True, padx=5)
+        
+        self.check_label = ttk.Label(check_frame, text="Checks the data file for damaged records, bad dates, "
+                                                       "duplicate links and index mismatches.")
+        self.check_label.pack(anchor="w", pady=(5,0))
+        self.check_problems = tk.Listbox(check_frame, height=5)
+        
         # Job Roles Section
         roles_frame = ttk.LabelFrame(settings_container, text="Job Roles", padding=10)
         roles_frame.pack(fill="x", padx=5, pady=5)
@@ -305,11 +795,10 @@ class JobTracker:
             messagebox.showwarning("Warning", "Please enter a role name")
             return
             
-        if new_role in self.settings_manager.get_job_roles():
+        if not self.settings_manager.add_job_role(new_role):
             messagebox.showwarning("Warning", "This role already exists")
             return
             
-        self.settings_manager.add_job_role(new_role)
         self.roles_listbox.insert(tk.END, new_role)
         self.new_role_var.set("")
     
@@ -321,44 +810,305 @@ class JobTracker:
             return
             
         role = self.roles_listbox.get(selection[0])
-        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to remove the role '{role}'?"):
+        self._loaded_index()
+        usage = self._role_usage().get(role, 0)
+        if usage:
+            # Records still use the role; ask where they should go first
+            self.show_remap_role_dialog(role, usage)
+        elif messagebox.askyesno("Confirm Delete", f"Are you sure you want to remove the role '{role}'?"):
             self.settings_manager.remove_job_role(role)
             self.roles_listbox.delete(selection[0])
     
+    def show_remap_role_dialog(self, role, usage):
+        """Pick the role that takes over a removed role's applications"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Remove Role")
+        dialog.geometry("450x230")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill="both", expand=True)
+        
+        ttk.Label(main_frame, text=f"{usage} applications use '{role}'.\nMove them to:",
+                 font=('TkDefaultFont', 10)).pack(anchor="w", pady=(0,5))
+        target_var = tk.StringVar()
+        target_picker = RolePicker(main_frame, lambda text, limit: self._role_choices(text, limit, exclude=(role,)),
+                                   textvariable=target_var, width=40)
+        target_picker.pack(fill="x", pady=(0,10))
+        
+        feedback_label = ttk.Label(main_frame, text="")
+        feedback_label.pack(anchor="w")
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x", pady=(10,0))
+        ttk.Button(button_frame, text="Cancel",
+                  command=dialog.destroy).pack(side="right", padx=5)
+        
+        def remap(event=None):
+            target = self._resolve_role(target_var.get(), exclude=(role,))
+            if target is None:
+                feedback_label.configure(text="Pick the role to move them to", bootstyle="warning")
+                return
+            dialog.destroy()
+            self.remove_role_with_remap(role, target)
+        
+        ttk.Button(button_frame, text="Move and Remove",
+                  command=remap,
+                  style="danger.TButton").pack(side="right", padx=5)
+        
+        dialog.bind("<Return>", remap)
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+        target_picker.focus_set()
+    
+    def remove_role_with_remap(self, role, target):
+        """Move every application of role to target in one pass, then remove role (one undo step)"""
+        links = [job['link'] for job in self.jobs if job.get('role') == role]
+        command = RemapRole(links, role, target, self.archive, self.settings_manager)
+        try:
+            self.run_command(command)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error updating archived applications: {str(e)}")
+            return
+        self._refresh_roles_list()
+        self.refresh_statistics()
+        self.notifier.success(f"Moved {len(links) + len(command.archived)} applications to {target} and removed {role}")
+    
+    def _refresh_roles_list(self):
+        self.roles_listbox.delete(0, tk.END)
+        for role in self.settings_manager.get_job_roles():
+            self.roles_listbox.insert(tk.END, role)
+    
+    def _role_usage(self):
+        """Applications per role from the stats engine (working set and archive)"""
+        return StatsManager(None, self.settings_manager, self.store.index, self.archive).role_usage()
+    
+    def _role_choices(self, text, limit, exclude=()):
+        return self.settings_manager.role_catalog.matches(text, self._role_usage(), limit, exclude)
+    
+    def _resolve_role(self, text, exclude=()):
+        """The configured role typed or picked in a RolePicker, or None if text isn't one exactly"""
+        return self.settings_manager.role_catalog.resolve(text, exclude)
+    
+    def _save_archive_days(self):
+        """Store the archiving age from the settings tab; returns False if it isn't a number"""
+        try:
+            days = int(self.archive_days_var.get().strip())
+        except ValueError:
+            messagebox.showwarning("Warning", "Please enter the archiving age as a whole number of days")
+            return False
+        self.settings_manager.set_archive_after_days(days)
+        self.archive_days_var.set(str(self.settings_manager.get_archive_after_days()))
+        return True
+    
+    def archive_now(self):
+        if self._save_archive_days():
+            self.archive_old_records()
+    
+    # -------------------- Data check --------------------
+    def verify_data(self):
+        """Check the data file in a background thread, preparing a repaired copy as it goes"""
+        if self._check_thread is not None:
+            return
+        # The check reads the file, so pending edits go in first
+        self.flush_pending()
+        data_file = self.data_file
+        repair_path, rejected_path, _ = repair_paths_for(data_file)
+        state = self._check_state = {'done': 0, 'total': 0, 'report': None, 'error': None}
+        self._check_cancel.clear()
+        
+        def run():
+            try:
+                state['report'] = verify(data_file, repair_path, rejected_path,
+                                         progress=lambda done, total: state.update(done=done, total=total),
+                                         cancelled=self._check_cancel.is_set)
+            except CheckCancelled:
+                discard_repair(data_file)
+            except Exception as e:
+                state['error'] = e
+                discard_repair(data_file)
+        
+        self._check_report = None
+        self.check_button.configure(state="disabled")
+        self.repair_button.configure(state="disabled")
+        self.check_problems.pack_forget()
+        self.check_label.configure(text="Checking...", bootstyle="default")
+        self._check_thread = threading.Thread(target=run, name="job-tracker-check", daemon=True)
+        self._check_thread.start()
+        self._poll_check()
+    
+    def _poll_check(self):
+        state = self._check_state
+        if state['total']:
+            self.check_progress.configure(value=100 * min(state['done'] / state['total'], 1))
+        if self._check_thread.is_alive():
+            self.root.after(CHECK_POLL_MS, self._poll_check)
+            return
+        self._check_thread = None
+        self.check_button.configure(state="normal")
+        if state['error'] is not None:
+            self.check_label.configure(text=f"The check failed: {state['error']}", bootstyle="danger")
+            return
+        report = self._check_report = state['report']
+        if report is None:
+            return
+        if report.ok:
+            discard_repair(report.data_path)
+        self.check_label.configure(text=report.summary(), bootstyle="success" if report.ok else "warning")
+        self.check_problems.delete(0, tk.END)
+        for kind, _, message in report.problems:
+            self.check_problems.insert(tk.END, f"{kind}: {message}")
+        if report.problems:
+            self.check_problems.pack(fill="x", pady=(5,0))
+        if not report.ok and not report.changed_during_check:
+            self.repair_button.configure(state="normal")
+    
+    def repair_data(self):
+        """Swap in the repaired copy from the last check and reload it"""
+        report = self._check_report
+        if report is None:
+            return
+        repair_path, rejected_path, backup_path = repair_paths_for(report.data_path)
+        if not messagebox.askyesno("Repair Data",
+                                   f"Replace the data file with the repaired copy?\n\n"
+                                   f"{report.kept} of {report.records} records are kept. The original is saved as "
+                                   f"{os.path.basename(backup_path)} and dropped records go to "
+                                   f"{os.path.basename(rejected_path)}."):
+            return
+        self.flush_pending()
+        try:
+            replaced = apply_repair(report.data_path, repair_path, report.stamp)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error repairing data: {str(e)}")
+            return
+        if not replaced:
+            messagebox.showwarning("Warning", "The data changed since it was checked. Please verify it again.")
+            return
+        self._check_report = None
+        self.repair_button.configure(state="disabled")
+        # The cached copy describes the old file; drop it without saving over the repair
+        if os.path.abspath(report.data_path) == os.path.abspath(self.data_file):
+            self._reload_data()
+        else:
+            self.datasets.discard(report.data_path)
+        self.check_label.configure(text=f"Repaired: kept {report.kept} of {report.records} records.",
+                                   bootstyle="success")
+        self.notifier.success("Data repaired")
+    
+    # -------------------- Merge --------------------
+    def merge_data_files(self):
+        """Merge job_data.json files from other devices into the current data in a background thread"""
+        if self._merge_thread is not None:
+            return
+        files = filedialog.askopenfilenames(title="Choose data files to merge",
+                                            filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not files:
+            return
+        self.flush_pending()
+        data_file = self.data_file
+        # Merged into a side file first, so edits made meanwhile are never overwritten
+        merged_path = os.path.splitext(data_file)[0] + '.merged.json'
+        paths = ([data_file] if os.path.exists(data_file) else []) + list(files)
+        state = {'stamp': file_stamp(data_file), 'result': None, 'error': None}
+        
+        def run():
+            try:
+                state['result'] = merge_files(paths, merged_path)
+            except Exception as e:
+                state['error'] = e
+        
+        self.merge_button.configure(state="disabled")
+        self.notifier.info(f"Merging {len(files)} file(s)...")
+        self._merge_thread = threading.Thread(target=run, name="job-tracker-merge", daemon=True)
+        self._merge_thread.start()
+        self._poll_merge(data_file, merged_path, state)
+    
+    def _poll_merge(self, data_file, merged_path, state):
+        if self._merge_thread.is_alive():
+            self.root.after(CHECK_POLL_MS, self._poll_merge, data_file, merged_path, state)
+            return
+        self._merge_thread = None
+        self.merge_button.configure(state="normal")
+        if state['error'] is not None:
+            if os.path.exists(merged_path):
+                os.remove(merged_path)
+            messagebox.showerror("Error", f"Error merging data: {str(state['error'])}")
+            return
+        self.flush_pending()
+        if not os.path.exists(data_file):
+            os.replace(merged_path, data_file)
+        elif not apply_repair(data_file, merged_path, state['stamp']):
+            os.remove(merged_path)
+            messagebox.showwarning("Warning", "The data changed while merging. Please merge again.")
+            return
+        # The cached copy describes the old file; drop it without saving over the merge
+        if os.path.abspath(data_file) == os.path.abspath(self.data_file):
+            self._reload_data()
+        else:
+            self.datasets.discard(data_file)
+        self.notifier.success(state['result'].summary())
+    
+    def _save_follow_up_days(self):
+        """Store the follow-up delay from the settings tab and reschedule; False if it isn't a number"""
+        try:
+            days = int(self.follow_up_days_var.get().strip())
+        except ValueError:
+            messagebox.showwarning("Warning", "Please enter the follow-up delay as a whole number of days")
+            return False
+        if days != self.settings_manager.get_follow_up_days():
+            self.settings_manager.set_follow_up_days(days)
+            self._load_reminders()
+        self.follow_up_days_var.set(str(self.settings_manager.get_follow_up_days()))
+        return True
+    
     def save_settings(self):
         """Save user settings"""
+        if not self._save_archive_days() or not self._save_follow_up_days():
+            return
         name = self.settings_name_var.get().strip()
         self.settings_manager.update_user_name(name)
         
         # Update greeting
-        greeting_text = f"Welcome back, {name}!" if name else "Welcome to Job Application Tracker!"
-        for widget in self.root.winfo_children():
-            if isinstance(widget, ttk.Frame):
-                for child in widget.winfo_children():
-                    if isinstance(child, ttk.Label):
-                        child.config(text=greeting_text)
-                        break
-                break
+        self.greeting_label.config(text=self._greeting_text())
         
-        messagebox.showinfo("Success", "Settings saved successfully!")
+        self.notifier.success("Settings saved successfully!")
     
     def refresh_statistics(self):
-        """Update all basic statistics"""
-        # Update stats manager with current data
-        self.stats_manager = StatsManager(self.jobs, self.settings_manager)
+        """Update the statistics now if the tab is on screen, otherwise when it's next opened"""
+        if self.notebook.select() != str(self.stats_tab):
+            self._stats_stale = True
+            return
+        self._stats_stale = False
+        
+        def compute():
+            # Counters come from the live index
+            self.stats_manager = StatsManager(self.jobs, self.settings_manager, self.store.index, self.archive)
+            return self.stats_manager.get_basic_stats()
         
-        # Get basic stats
-        stats = self.stats_manager.get_basic_stats()
+        stats = self._cached(("stats",), compute)
+        self.cache_label.config(text=self.queries.summary())
+        if stats is self._shown_stats:
+            # Nothing changed since these numbers were put on screen
+            return
+        self._shown_stats = stats
         
         # Update labels
         self.total_apps_label.config(text=f"Total Applications: {stats['total_applications']}")
         self.unique_companies_label.config(text=f"Unique Companies: {stats['unique_companies']}")
         self.daily_rate_label.config(text=f"Daily Application Rate: {stats['daily_rate']:.1f}")
-        
-        # Update roles tree
-        self.roles_tree.delete(*self.roles_tree.get_children())
-        for role, count in stats['applications_by_role'].items():
-            self.roles_tree.insert("", "end", values=(role, count))
+        self.archived_label.config(text=f"Archived Applications: {stats.get('archived_applications', 0)}")
+        
+        # Update roles tree (only rows whose counts changed are touched)
+        self.roles_rows.update((role, (role, count)) for role, count in stats['applications_by_role'].items())
+        
+        # Update pipeline tree
+        funnel = {stage: (reached, conversion) for stage, reached, conversion in stats['funnel']}
+        status_rows = []
+        for status, count in stats['applications_by_status'].items():
+            reached, conversion = funnel.get(status, ("-", None))
+            conversion_text = f"{conversion:.1f}%" if conversion is not None else "-"
+            status_rows.append((status, (label_for(status), count, reached, conversion_text)))
+        self.status_rows.update(status_rows)
     
     def create_main_tab(self):
         # Search Frame
@@ -376,6 +1126,8 @@ class JobTracker:
                        value="link").pack(side="left", padx=5)
         ttk.Radiobutton(search_frame, text="Search by Company", variable=self.search_type, 
                        value="company").pack(side="left", padx=5)
+        ttk.Radiobutton(search_frame, text="Search Notes", variable=self.search_type,
+                       value="text").pack(side="left", padx=5)
         
         # Search Button
         ttk.Button(search_frame, text="Search", command=self.search_job, 
@@ -385,12 +1137,25 @@ class JobTracker:
         ttk.Button(search_frame, text="Show All", command=self.show_all_records,
                   style="info.TButton").pack(side="left", padx=5)
         
+        # Status filter, served from the per-status index buckets
+        ttk.Label(search_frame, text="Status:").pack(side="left", padx=(10, 0))
+        self.status_filter_var = tk.StringVar(value="All")
+        status_filter = ttk.Combobox(search_frame, textvariable=self.status_filter_var, width=12,
+                                     state="readonly", values=["All"] + [label_for(s) for s in STATUSES])
+        status_filter.pack(side="left", padx=5)
+        status_filter.bind("<<ComboboxSelected>>", self._on_status_filter)
+        
+        # Keeps the Add dialog open for the next entry after saving
+        self.add_another_var = tk.BooleanVar(value=False)
+        
         # Add Application Button
         add_button = ttk.Button(self.main_tab, text="Add New Application", 
                               command=self.show_add_job_dialog,
                               style="success.TButton")
         add_button.pack(padx=10, pady=5)
         
+        self.create_capture_panel()
+        
         # Results Frame
         result_frame = ttk.LabelFrame(self.main_tab, text="Job Applications", padding=10)
         result_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -409,6 +1174,51 @@ class JobTracker:
                   command=self.delete_all_records,
                   style="danger.TButton").pack(side="right")
         
+        ttk.Button(top_frame, text="Find Duplicates", command=self.show_duplicates_dialog,
+                  style="secondary.TButton").pack(side="left", padx=(10, 0))
+        
+        # Follow-up reminders that are due
+        self.follow_up_button = ttk.Button(top_frame, text="Follow-ups (0)", command=self.show_follow_ups_dialog,
+                                           style="secondary.TButton")
+        self.follow_up_button.pack(side="left", padx=10)
+        
+        # Undo/Redo
+        self.redo_button = ttk.Button(top_frame, text="Redo", command=self.redo,
+                                      style="secondary.TButton", state="disabled")
+        self.redo_button.pack(side="right", padx=5)
+        self.undo_button = ttk.Button(top_frame, text="Undo", command=self.undo,
+                                      style="secondary.TButton", state="disabled")
+        self.undo_button.pack(side="right")
+        self.root.bind("<Control-z>", lambda e: self.undo())
+        self.root.bind("<Control-y>", lambda e: self.redo())
+        self.root.bind("<Control-Shift-Z>", lambda e: self.redo())
+        
+        # Batch actions on the ticked records
+        selection_frame = ttk.Frame(result_frame)
+        selection_frame.pack(fill="x", pady=(0, 5))
+        
+        self.selection_label = ttk.Label(selection_frame, text="0 selected")
+        self.selection_label.pack(side="left")
+        
+        ttk.Button(selection_frame, text="Select All", command=self.select_all_records,
+                  style="secondary.TButton").pack(side="left", padx=5)
+        ttk.Button(selection_frame, text="Clear Selection", command=self.clear_selection,
+                  style="secondary.TButton").pack(side="left")
+        
+        ttk.Button(selection_frame, text="Delete Selected", command=self.delete_selected_records,
+                  style="danger.TButton").pack(side="right")
+        ttk.Button(selection_frame, text="Set Status", command=self.change_status_of_selected,
+                  style="info.TButton").pack(side="right", padx=5)
+        self.batch_status_var = tk.StringVar()
+        ttk.Combobox(selection_frame, textvariable=self.batch_status_var, width=12, state="readonly",
+                    values=[label_for(s) for s in STATUSES]).pack(side="right")
+        ttk.Button(selection_frame, text="Set Role", command=self.change_role_of_selected,
+                  style="info.TButton").pack(side="right", padx=5)
+        self.batch_role_var = tk.StringVar()
+        self.batch_role_combo = RolePicker(selection_frame, self._role_choices,
+                                           textvariable=self.batch_role_var, width=25)
+        self.batch_role_combo.pack(side="right")
+        
         # Results Canvas and Scrollbar
         canvas_frame = ttk.Frame(result_frame)
         canvas_frame.pack(fill="both", expand=True)
@@ -417,7 +1227,10 @@ class JobTracker:
         
         canvas = tk.Canvas(canvas_frame)
         scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        self.results_frame = ttk.Frame(canvas)
+        self.results_host = ttk.Frame(canvas)
+        # Rows live in a page frame that is swapped out whole when the list is cleared
+        self.results_frame = ttk.Frame(self.results_host)
+        self.results_frame.pack(fill="both", expand=True)
         
         canvas.configure(yscrollcommand=scrollbar.set)
         
@@ -426,7 +1239,7 @@ class JobTracker:
         scrollbar.grid(row=0, column=1, sticky="ns")
         
         # Create window in canvas
-        self.canvas_window = canvas.create_window((0, 0), window=self.results_frame, anchor="nw")
+        self.canvas_window = canvas.create_window((0, 0), window=self.results_host, anchor="nw")
         
         # Configure canvas scrolling
         def configure_scroll(event):
@@ -434,89 +1247,420 @@ class JobTracker:
             # Update the canvas window width to match the canvas
             canvas.itemconfig(self.canvas_window, width=canvas.winfo_width())
         
-        self.results_frame.bind("<Configure>", configure_scroll)
+        self.results_host.bind("<Configure>", configure_scroll)
         canvas.bind("<Configure>", lambda e: canvas.itemconfig(self.canvas_window, width=canvas.winfo_width()))
         
+        # A single class binding opens details for every record row
+        self.root.bind_class("JobRecord", "<Button-1>", self._on_record_click)
+        
         # Bind mouse wheel
         def on_mousewheel(event):
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         canvas.bind_all("<MouseWheel>", on_mousewheel)
         
+    def create_capture_panel(self):
+        """Quick capture: job links copied anywhere are checked and queued for one-click adding"""
+        capture_frame = ttk.LabelFrame(self.main_tab, text="Quick Capture", padding=10)
+        capture_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.capture_queue = CaptureQueue()
+        self.clipboard_watcher = ClipboardWatcher(self.root, self.on_link_captured)
+        
+        top_frame = ttk.Frame(capture_frame)
+        top_frame.pack(fill="x")
+        
+        self.capture_enabled_var = tk.BooleanVar(value=self.settings_manager.is_clipboard_capture_enabled())
+        ttk.Checkbutton(top_frame, text="Watch clipboard for job links",
+                       variable=self.capture_enabled_var,
+                       command=self.toggle_clipboard_capture,
+                       bootstyle="round-toggle").pack(side="left")
+        
+        self.capture_count_label = ttk.Label(top_frame, text="")
+        self.capture_count_label.pack(side="right")
+        
+        self.capture_listbox = tk.Listbox(capture_frame, height=3)
+        self.capture_listbox.pack(fill="x", pady=5)
+        self.capture_listbox.bind("<<ListboxSelect>>", self._on_capture_selected)
+        
+        form_frame = ttk.Frame(capture_frame)
+        form_frame.pack(fill="x")
+        
+        ttk.Label(form_frame, text="Company:").pack(side="left")
+        self.capture_company_var = tk.StringVar()
+        company_entry = ttk.Entry(form_frame, textvariable=self.capture_company_var, width=25)
+        company_entry.pack(side="left", padx=5)
+        company_entry.bind("<Return>", lambda e: self.confirm_captured_link())
+        
+        ttk.Label(form_frame, text="Role:").pack(side="left")
+        roles = self.settings_manager.get_job_roles()
+        self.capture_role_var = tk.StringVar(value=roles[0] if roles else "")
+        self.capture_role_combo = RolePicker(form_frame, self._role_choices,
+                                             textvariable=self.capture_role_var, width=25)
+        self.capture_role_combo.pack(side="left", padx=5)
+        
+        ttk.Button(form_frame, text="Dismiss", style="secondary.TButton",
+                  command=self.dismiss_captured_link).pack(side="right", padx=5)
+        ttk.Button(form_frame, text="Add", style="success.TButton",
+                  command=self.confirm_captured_link).pack(side="right", padx=5)
+        
+        self._refresh_capture_list()
+        if self.capture_enabled_var.get():
+            self.clipboard_watcher.start()
+    
+    def toggle_clipboard_capture(self):
+        enabled = self.capture_enabled_var.get()
+        self.settings_manager.set_clipboard_capture(enabled)
+        if enabled:
+            self.clipboard_watcher.start()
+            self.notifier.info("Watching the clipboard for job links")
+        else:
+            self.clipboard_watcher.stop()
+            self.notifier.info("Clipboard capture stopped")
+    
+    def on_link_captured(self, link, copied_text):
+        """Flag already-applied links immediately, queue new ones for confirmation"""
+        if (self.store.has_posting(link) or self.store.has_link(copied_text)
+                or self.archive.has_posting(link) or self.archive.has_link(copied_text)):
+            self.notifier.warning(f"Already applied: {link}", toast=True)
+            return
+        if self.capture_queue.push(link):
+            self._refresh_capture_list(select_last=True)
+            self.notifier.info(f"Captured {link}", toast=True)
+    
+    def _refresh_capture_list(self, select_last=False):
+        items = self.capture_queue.items()
+        self.capture_listbox.delete(0, tk.END)
+        for item in items:
+            self.capture_listbox.insert(tk.END, item['link'])
+        self.capture_count_label.configure(text=f"{len(items)} waiting" if items else "")
+        if select_last and items:
+            self.capture_listbox.selection_clear(0, tk.END)
+            self.capture_listbox.selection_set(tk.END)
+            self.capture_company_var.set(items[-1]['company'])
+    
+    def _selected_capture(self):
+        selection = self.capture_listbox.curselection()
+        items = self.capture_queue.items()
+        if selection:
+            return items[selection[0]]
+        return items[-1] if items else None
+    
+    def _on_capture_selected(self, event=None):
+        item = self._selected_capture()
+        if item:
+            self.capture_company_var.set(item['company'])
+    
+    def confirm_captured_link(self):
+        """Add the selected captured link with the company and role from the form"""
+        item = self._selected_capture()
+        if item is None:
+            return
+        company = self.capture_company_var.get().strip()
+        role = self._resolve_role(self.capture_role_var.get())
+        if not company or not role:
+            self.notifier.warning("Enter a company and pick a role from the list to add this link")
+            return
+        self.capture_role_var.set(role)
+        added, _ = self.add_job(company, item['link'], role, datetime.now().strftime('%Y-%m-%d'))
+        if added:
+            self.capture_queue.remove(item['link'])
+            self.capture_company_var.set("")
+            self._refresh_capture_list(select_last=True)
+    
+    def dismiss_captured_link(self):
+        item = self._selected_capture()
+        if item is not None:
+            self.capture_queue.remove(item['link'])
+            self._refresh_capture_list(select_last=True)
+    
     def delete_record(self, job_link):
         """Delete a single record by its job link"""
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this job application?"):
-            self.jobs = [job for job in self.jobs if job['link'] != job_link]
-            self.save_data()
+            self.run_command(RemoveJobs([job_link]))
+    
+    def _toggle_selection(self, row_key):
+        row = self._record_rows[row_key]
+        key = normalize_link(row['job']['link'])
+        if row['select_var'].get():
+            self._selected_links.add(key)
+        else:
+            self._selected_links.discard(key)
+        self._update_selection_label()
+    
+    def _update_selection_label(self):
+        self.selection_label.configure(text=f"{len(self._selected_links)} selected")
+    
+    def select_all_records(self):
+        """Tick every record in the current list"""
+        self._selected_links.update(normalize_link(job['link']) for job in self._displayed_jobs)
+        for row in self._record_rows.values():
+            row['select_var'].set(True)
+        self._update_selection_label()
+    
+    def clear_selection(self):
+        self._selected_links.clear()
+        for row in self._record_rows.values():
+            row['select_var'].set(False)
+        self._update_selection_label()
+    
+    def delete_selected_records(self):
+        """Delete all ticked records with one confirmation, one pass and one save"""
+        count = len(self._selected_links)
+        if not count:
+            self.notifier.info("No records selected.")
+            return
+        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {count} selected job applications?"):
+            self.run_command(RemoveJobs(self._selected_links))
+    
+    def change_role_of_selected(self):
+        """Set the role of all ticked records in one pass"""
+        role = self._resolve_role(self.batch_role_var.get())
+        if not self._selected_links or not role:
+            self.notifier.warning("Select records and pick a role from the list first.")
+            return
+        self.batch_role_var.set(role)
+        change = self.run_command(UpdateJobs.same_change(self._selected_links, {'role': role},
+                                                         label="role change"))
+        self.notifier.success(f"Changed the role of {len(change['updated'])} applications to {role}")
+    
+    def change_status_of_selected(self):
+        """Move all ticked records to the chosen pipeline status"""
+        status = self._status_from_label(self.batch_status_var.get())
+        if not self._selected_links or status is None:
+            self.notifier.warning("Select records and a status first.")
+            return
+        jobs = [job for job in map(self.store.find, self._selected_links) if job is not None]
+        changed = self.set_status(jobs, status)
+        self.notifier.success(f"Moved {changed} applications to {label_for(status)}")
+    
+    def set_status(self, jobs, status):
+        """Move jobs to a status, appending the transition to each status history"""
+        changes = {job['link']: status_change(job, status) for job in jobs if status_of(job) != status}
+        if changes:
+            self.run_command(UpdateJobs(changes, label=f"status change to {label_for(status)}"))
+        return len(changes)
+    
+    @staticmethod
+    def _status_from_label(label):
+        for status in STATUSES:
+            if label_for(status) == label:
+                return status
+        return None
+    
+    def _on_status_filter(self, event=None):
+        status = self._status_from_label(self.status_filter_var.get())
+        if status is None:
             self.show_all_records()
+        else:
+            self.show_status_records(status)
     
-    def delete_all_records(self):
-        """Delete all records after confirmation"""
-        if not self.jobs:
-            messagebox.showinfo("Info", "No records to delete.")
+    def show_status_records(self, status):
+        """List the applications currently in a status, straight from its index bucket"""
+        if self._is_shown(("status", status)):
+            self.status_filter_var.set(label_for(status))
             return
-            
-        if messagebox.askyesno("Confirm Delete All", 
-                              "Are you sure you want to delete ALL job applications?\nThis action cannot be undone!"):
-            self.jobs = []
-            self.save_data()
+        self.clear_results_frame()
+        self._view = "status"
+        self._status_filter = status
+        self.status_filter_var.set(label_for(status))
+        # Buckets cover every record once the data is loaded (which _cached makes sure of)
+        jobs = self._cached(("status", status), lambda: self.store.index.jobs_with_status(status))
+        self._displayed_jobs = list(jobs)
+        self._render_rows(jobs)
+        self.update_record_count(len(jobs))
+        if not jobs:
+            ttk.Label(self.results_frame,
+                     text=f"No applications with status {label_for(status)}.",
+                     padding=20).pack()
+        self._mark_shown(("status", status))
+    
+    def refresh_view(self):
+        """Re-run whatever produced the current list"""
+        if self._view == "search":
+            self.search_job()
+        elif self._view == "status":
+            self.show_status_records(self._status_filter)
+        else:
             self.show_all_records()
     
-    def show_details(self, job):
-        """Show detailed view in a popup window"""
-        detail_window = tk.Toplevel(self.root)
-        detail_window.title(f"Job Details - {job['company']}")
-        detail_window.geometry("600x400")
-        
-        # Make the window modal
-        detail_window.transient(self.root)
-        detail_window.grab_set()
+    def run_command(self, command):
+        """Apply a record mutation through the undo log and patch the view"""
+        change = self.command_log.execute(command)
+        self._after_change(change)
+        return change
+    
+    def undo(self):
+        result = self.command_log.undo()
+        if result is None:
+            self.notifier.info("Nothing to undo.")
+            return
+        command, change = result
+        self._after_change(change)
+        if isinstance(command, RemapRole):
+            self._refresh_roles_list()
+        self.notifier.info(f"Undid {command.label}")
+    
+    def redo(self):
+        result = self.command_log.redo()
+        if result is None:
+            self.notifier.info("Nothing to redo.")
+            return
+        command, change = result
+        self._after_change(change)
+        if isinstance(command, RemapRole):
+            self._refresh_roles_list()
+        self.notifier.info(f"Redid {command.label}")
+    
+    def _after_change(self, change):
+        self._apply_change(change)
+        self.reminders.apply_change(change)
+        self._update_follow_up_button()
+        self._update_history_buttons()
+        # Saving (only the changed tail of the file) and statistics wait for idle
+        self._schedule_flush()
+    
+    def _update_history_buttons(self):
+        self.undo_button.configure(state="normal" if self.command_log.can_undo else "disabled")
+        self.redo_button.configure(state="normal" if self.command_log.can_redo else "disabled")
+    
+    def _apply_change(self, change):
+        """Patch only the affected rows instead of re-rendering the list"""
+        removed_keys = {normalize_link(job['link']) for _, job in change['removed']}
+        if removed_keys & self._selected_links:
+            self._selected_links -= removed_keys
+            self._update_selection_label()
+        if change['updated']:
+            self._refresh_rows(change['updated'])
+            if self._view == "status":
+                # Edited records may have left (or joined) the filtered status
+                self.refresh_view()
+                return
+        if not (change['removed'] or change['inserted']):
+            return
         
-        # Content frame
-        content_frame = ttk.Frame(detail_window, padding=20)
-        content_frame.pack(fill="both", expand=True)
-        
-        # Company details
-        ttk.Label(content_frame, text="Company:", 
-                 font=('TkDefaultFont', 12, 'bold')).pack(anchor="w", pady=(0,5))
-        company_frame = ttk.Frame(content_frame)
-        company_frame.pack(fill="x", pady=(0,20))
-        ttk.Label(company_frame, text=job['company'], 
-                 font=('TkDefaultFont', 11)).pack(side="left")
-        
-        # Link details
-        ttk.Label(content_frame, text="Job Link:", 
-                 font=('TkDefaultFont', 12, 'bold')).pack(anchor="w", pady=(0,5))
-        link_frame = ttk.Frame(content_frame)
-        link_frame.pack(fill="x", pady=(0,20))
-        link_text = ttk.Label(link_frame, text=job['link'], 
-                          wraplength=550, cursor="hand2")
-        link_text.pack(side="left", fill="x", expand=True)
-        
-        def copy_link():
-            pyperclip.copy(job['link'])
-            copy_btn.configure(text="Copied!", style="success.TButton")
-            detail_window.after(1500, lambda: copy_btn.configure(text="Copy Link", style="info.TButton"))
-            
-        copy_btn = ttk.Button(content_frame, text="Copy Link", style="info.TButton",
-                          command=copy_link)
-        copy_btn.pack(pady=20)
+        if self._render_pending:
+            # Rows are still being filled in; just start over
+            self.refresh_view()
+            return
+        if self._view != "all" and change['inserted']:
+            # Whether restored records match the filter is the filter's business
+            self.refresh_view()
+            return
         
-        # Close button
-        ttk.Button(content_frame, text="Close", 
-                  command=detail_window.destroy).pack(pady=10)
+        if self._view == "all":
+            self._displayed_jobs = self.jobs
+        else:
+            self._displayed_jobs = [job for job in self._displayed_jobs
+                                    if normalize_link(job['link']) not in removed_keys]
+        if not self._displayed_jobs or not self._row_list:
+            # Empty before or after: let the regular renderers handle the empty-state message
+            self.refresh_view()
+            return
         
-        # Center the window
-        detail_window.update_idletasks()
-        width = detail_window.winfo_width()
-        height = detail_window.winfo_height()
-        x = (detail_window.winfo_screenwidth() // 2) - (width // 2)
-        y = (detail_window.winfo_screenheight() // 2) - (height // 2)
-        detail_window.geometry(f'{width}x{height}+{x}+{y}')
-    
-    def create_record_frame(self, job, parent_frame, index=None):
-        """Create a frame for a single record with delete button"""
+        # Drop deleted rows, insert restored/added ones in place, then renumber
+        if removed_keys:
+            kept = []
+            for row in self._row_list:
+                if normalize_link(row['job']['link']) in removed_keys:
+                    row['frame'].destroy()
+                    del self._record_rows[row['key']]
+                else:
+                    kept.append(row)
+            self._row_list = kept
+        for position, job in change['inserted']:
+            before = self._row_list[position]['frame'] if position < len(self._row_list) else None
+            self.create_record_frame(job, self.results_frame, position + 1, before=before)
+        for position, row in enumerate(self._row_list):
+            if row['position'] != position:
+                row['position'] = position
+                row['number_label'].configure(text=f"#{position + 1}")
+        self.update_record_count(len(self._displayed_jobs))
+    
+    def _refresh_rows(self, jobs):
+        """Update the text of rendered rows (and the details window) for edited jobs"""
+        edited = {id(job) for job in jobs}
+        for row in self._row_list:
+            if id(row['job']) in edited:
+                row['company_label'].configure(text=f"Company: {row['job']['company']}")
+                row['link_label'].configure(text=f"Job Link: {self._short_link(row['job']['link'])}")
+                row['status_label'].configure(text=f"Status: {label_for(status_of(row['job']))}")
+        if self.details_panel.job is not None and id(self.details_panel.job) in edited:
+            self.details_panel.refresh()
+    
+    def delete_all_records(self):
+        """Delete all records after confirmation"""
+        if not self.store.count():
+            self.notifier.info("No records to delete.")
+            return
+            
+        if messagebox.askyesno("Confirm Delete All", 
+                              "Are you sure you want to delete ALL job applications?\nYou can restore them with Undo (Ctrl+Z)."):
+            self.run_command(RemoveJobs([job['link'] for job in self.jobs], label="delete all"))
+    
+    def show_details(self, job, position=None):
+        """Show a job in the shared details window"""
+        self.details_panel.show(job, position)
+    
+    # -------------------- Notes --------------------
+    def save_job_texts(self, job, notes, description):
+        """Store a job's notes and description and point the record at them (undoable)"""
+        if self.store.find(job['link']) is not job:
+            # Deleted or archived while its details were open
+            return
+        try:
+            refs = {TEXT_REFS['notes']: self.notes.put(notes),
+                    TEXT_REFS['description']: self.notes.put(description)}
+        except Exception as e:
+            messagebox.showerror("Error", f"Error saving notes: {str(e)}")
+            return
+        changes = {field: ref or MISSING for field, ref in refs.items() if job.get(field) != ref}
+        if changes:
+            self.run_command(UpdateJobs({job['link']: changes}, label="notes"))
+            self.notifier.success(f"Saved notes for {job['company']}")
+    
+    def _compact_notes(self):
+        """Drop notes no record points at anymore, once they take up much of the pack"""
+        if not len(self.notes) or self.command_log.can_undo or self.command_log.can_redo:
+            # Undo could bring back a record pointing at a dropped text
+            return
+        live = set(self._loaded_index().texts)
+        if not self.notes.needs_compaction(live):
+            return
+        try:
+            live.update(ref for job in self.archive.records for ref in refs_of(job))
+            if self.notes.needs_compaction(live):
+                self.notes.compact(live)
+        except Exception:
+            # Unused notes only cost disk space
+            pass
+    
+    def _on_record_click(self, event):
+        """Open the details of the record row that was clicked"""
+        # Labels sit inside the row's info frame, which is what the lookup is keyed on
+        row = self._record_rows.get(str(event.widget)) or self._record_rows.get(event.widget.winfo_parent())
+        if row:
+            self.show_details(row['job'], row['position'])
+    
+    def _on_view_details(self, row_key):
+        row = self._record_rows[row_key]
+        self.show_details(row['job'], row['position'])
+    
+    @staticmethod
+    def _short_link(link):
+        # Truncate link if it's too long
+        if len(link) > 60:
+            return link[:57] + "..."
+        return link
+    
+    def create_record_frame(self, job, parent_frame, index=None, before=None):
+        """Create a frame for a single record with delete button.
+        With before, the row is packed ahead of that frame instead of at the end.
+        """
         record_frame = ttk.Frame(parent_frame)
-        record_frame.pack(fill="x", padx=5, pady=5)
+        if before is not None:
+            record_frame.pack(fill="x", padx=5, pady=5, before=before)
+        else:
+            record_frame.pack(fill="x", padx=5, pady=5)
         
         # Add a border around each record
         record_border = ttk.LabelFrame(record_frame, text="")
@@ -526,12 +1670,18 @@ class JobTracker:
         content_frame = ttk.Frame(record_border)
         content_frame.pack(fill="x", padx=10, pady=5)
         
+        # Selection tick for batch actions
+        select_var = tk.BooleanVar(value=normalize_link(job['link']) in self._selected_links)
+        select_check = ttk.Checkbutton(content_frame, variable=select_var)
+        select_check.pack(side="left", padx=(0, 5))
+        
         # Record number
         number_frame = ttk.Frame(content_frame, width=50)
         number_frame.pack(side="left", padx=(0, 10))
         number_frame.pack_propagate(False)  # Keep fixed width
-        ttk.Label(number_frame, text=f"#{index}", 
-                 font=('TkDefaultFont', 10, 'bold')).pack(anchor="center")
+        number_label = ttk.Label(number_frame, text=f"#{index}", 
+                                font=('TkDefaultFont', 10, 'bold'))
+        number_label.pack(anchor="center")
 
         # Left side: Company and truncated link
         info_frame = ttk.Frame(content_frame)
@@ -541,18 +1691,34 @@ class JobTracker:
                                 font=('TkDefaultFont', 10, 'bold'))
         company_label.pack(anchor="w")
         
-        # Truncate link if it's too long
-        link_text = job['link']
-        if len(link_text) > 60:
-            link_text = link_text[:57] + "..."
-        link_label = ttk.Label(info_frame, text=f"Job Link: {link_text}")
+        link_label = ttk.Label(info_frame, text=f"Job Link: {self._short_link(job['link'])}")
         link_label.pack(anchor="w")
         
-        # Make the entire info frame clickable
-        for widget in [company_label, link_label, info_frame]:
-            widget.bind("<Button-1>", lambda e, j=job: self.show_details(j))
-            widget.bind("<Enter>", lambda e, w=widget: w.configure(cursor="hand2"))
-            widget.bind("<Leave>", lambda e, w=widget: w.configure(cursor=""))
+        status_label = ttk.Label(info_frame, text=f"Status: {label_for(status_of(job))}")
+        status_label.pack(anchor="w")
+        
+        # Make the entire info frame clickable via the shared "JobRecord" class binding
+        row_key = str(info_frame)
+        row = {
+            'key': row_key,
+            'job': job,
+            'position': index - 1 if index else None,
+            'frame': record_frame,
+            'number_label': number_label,
+            'company_label': company_label,
+            'link_label': link_label,
+            'status_label': status_label,
+            'select_var': select_var,
+        }
+        self._record_rows[row_key] = row
+        if before is not None:
+            self._row_list.insert(row['position'], row)
+        else:
+            self._row_list.append(row)
+        select_check.configure(command=lambda: self._toggle_selection(row_key))
+        for widget in [company_label, link_label, status_label, info_frame]:
+            widget.configure(cursor="hand2")
+            widget.bindtags(("JobRecord",) + widget.bindtags())
         
         # Right side: Buttons
         button_frame = ttk.Frame(content_frame)
@@ -560,70 +1726,230 @@ class JobTracker:
         
         # View Details button
         ttk.Button(button_frame, text="View Details", style="info.TButton",
-                  command=lambda j=job: self.show_details(j)).pack(side="left", padx=5)
+                  command=lambda: self._on_view_details(row_key)).pack(side="left", padx=5)
+        
+        # Edit button
+        ttk.Button(button_frame, text="Edit", style="secondary.TButton",
+                  command=lambda: self.show_edit_job_dialog(self._record_rows[row_key]['job'])).pack(side="left", padx=(0, 5))
         
         # Delete button
         ttk.Button(button_frame, text="Delete", style="danger.TButton",
-                  command=lambda l=job['link']: self.delete_record(l)).pack(side="left")
+                  command=lambda: self.delete_record(self._record_rows[row_key]['job']['link'])).pack(side="left")
+    
+    def create_archived_frame(self, job, parent_frame):
+        """Create a read-only row for an archived record with a restore button"""
+        record_frame = ttk.Frame(parent_frame)
+        record_frame.pack(fill="x", padx=5, pady=5)
+        
+        record_border = ttk.LabelFrame(record_frame, text="Archived")
+        record_border.pack(fill="x", padx=2, pady=2)
+        
+        content_frame = ttk.Frame(record_border)
+        content_frame.pack(fill="x", padx=10, pady=5)
+        
+        info_frame = ttk.Frame(content_frame)
+        info_frame.pack(side="left", fill="x", expand=True)
+        ttk.Label(info_frame, text=f"Company: {job['company']}",
+                 font=('TkDefaultFont', 10, 'bold')).pack(anchor="w")
+        ttk.Label(info_frame, text=f"Job Link: {self._short_link(job['link'])}").pack(anchor="w")
+        ttk.Label(info_frame, text=f"Applied: {job.get('applied_date', '')}    "
+                                   f"Status: {label_for(status_of(job))}").pack(anchor="w")
+        
+        ttk.Button(content_frame, text="Restore", style="success.TButton",
+                  command=lambda: self.restore_archived(job['link'])).pack(side="right", padx=(10,0))
     
     def clear_results_frame(self):
-        """Clear all widgets from results frame"""
-        for widget in self.results_frame.winfo_children():
+        """Empty the results frame at once, cancelling any render still in progress.
+        The old rows are destroyed a batch at a time while the UI is idle.
+        """
+        self._render_generation += 1
+        if self._render_job is not None:
+            self.root.after_cancel(self._render_job)
+            self._render_job = None
+        self._render_pending = False
+        self._record_rows.clear()
+        self._row_list = []
+        self._displayed_jobs = []
+        self._shown = None
+        old_page = self.results_frame
+        old_page.pack_forget()
+        self.results_frame = ttk.Frame(self.results_host)
+        self.results_frame.pack(fill="both", expand=True)
+        self.root.after_idle(self._destroy_page, old_page)
+    
+    def _destroy_page(self, page, widgets=None, start=0):
+        if widgets is None:
+            widgets = page.winfo_children()
+        end = start + TEARDOWN_BATCH_SIZE
+        for widget in widgets[start:end]:
             widget.destroy()
+        if end < len(widgets):
+            self.root.after_idle(self._destroy_page, page, widgets, end)
+        else:
+            page.destroy()
+    
+    def _render_rows(self, items, create=None, start=0, then=None):
+        """Build rows for items[start:]: the first page right away, the rest in batches at idle
+        time. create(item, position) builds one row (a record row by default). then() runs once
+        all rows are there; clearing the results frame cancels the rest.
+        """
+        create = create or self._create_row
+        generation = self._render_generation
+        self._render_pending = True
+        
+        def render(start, count):
+            self._render_job = None
+            if generation != self._render_generation:
+                return
+            end = min(start + count, len(items))
+            for position in range(start, end):
+                create(items[position], position)
+            if end < len(items):
+                self._render_job = self.root.after_idle(render, end, RENDER_BATCH_SIZE)
+                return
+            self._render_pending = False
+            if then is not None:
+                then()
+        
+        render(start, FIRST_PAGE_SIZE)
+    
+    def _create_row(self, job, position):
+        self.create_record_frame(job, self.results_frame, position + 1)
     
     def update_record_count(self, count=None):
         """Update the record count label"""
         if count is None:
-            count = len(self.jobs)
+            count = self.store.count()
         self.record_count_label.configure(text=f"Total Records: {count}")
     
     def show_all_records(self):
         self.search_var.set("")  # Clear search field
+        self.status_filter_var.set("All")
+        if self._is_shown(("all",)):
+            # Already on screen and nothing changed since
+            return
+        self._view = "all"
         self.clear_results_frame()
         
-        if not self.jobs:
+        if not self.store.count():
             ttk.Label(self.results_frame, 
                      text="No job applications recorded yet.",
                      padding=20).pack()
             self.update_record_count(0)
             return
             
-        for index, job in enumerate(self.jobs, 1):
-            self.create_record_frame(job, self.results_frame, index)
+        if self.store.loaded:
+            self._displayed_jobs = self.jobs
+            self._render_rows(self.jobs)
+            self._mark_shown(("all",))
+        else:
+            # Startup: show the first page from the index, parse the rest once the window is up
+            first_page = self.store.head(FIRST_PAGE_SIZE)
+            self._displayed_jobs = first_page
+            for index, job in enumerate(first_page, 1):
+                self.create_record_frame(job, self.results_frame, index)
+            generation = self._render_generation
+            self._render_pending = True
+            self._render_job = self.root.after_idle(lambda: self._render_remaining(len(first_page), generation))
         
         self.update_record_count()
     
+    def _render_remaining(self, start, generation):
+        """Append the records after the first page, unless the view changed meanwhile"""
+        self._render_job = None
+        if generation != self._render_generation:
+            return
+        self._displayed_jobs = self.jobs
+        # Re-point the first-page rows at the fully parsed records
+        for row in self._record_rows.values():
+            row['job'] = self.jobs[row['position']]
+        self._render_rows(self.jobs, start=start)
+        self._mark_shown(("all",))
+    
+    # -------------------- Query cache --------------------
+    def _data_generation(self):
+        return self.store.generation, self.archive.generation
+    
+    def _cached(self, query, compute):
+        """compute() for query, served from memory until the records or the archive change"""
+        self._loaded_index()
+        return self.queries.get(query, self._data_generation(), compute)
+    
+    def _is_shown(self, query):
+        """Whether the results frame already shows query for the current data"""
+        return self._shown == (query, self._data_generation())
+    
+    def _mark_shown(self, query):
+        self._shown = (query, self._data_generation())
+    
     def search_job(self):
         search_term = self.search_var.get().strip()
         if not search_term:
             self.show_all_records()  # If search is empty, show all records
             return
-            
+        
+        search_type = self.search_type.get()
+        query = ("search", search_type, search_term.lower())
+        self.status_filter_var.set("All")
+        if self._is_shown(query):
+            return
         self.clear_results_frame()
-        found = False
-        found_count = 0
-        
-        for index, job in enumerate(self.jobs, 1):
-            if self.search_type.get() == "link":
-                # Exact match for links (after stripping spaces)
-                if search_term.lower().strip() == job['link'].lower().strip():
-                    self.create_record_frame(job, self.results_frame, found_count + 1)
-                    found = True
-                    found_count += 1
-            else:
-                # Partial match for company names
-                if search_term.lower() in job['company'].lower():
-                    self.create_record_frame(job, self.results_frame, found_count + 1)
-                    found = True
-                    found_count += 1
+        self._view = "search"
+        if search_type == "text":
+            self._search_notes(search_term)
+            self._mark_shown(query)
+            return
+        
+        jobs, archived = self._cached(query, lambda: self._find_jobs(search_type, search_term))
+        self._displayed_jobs = list(jobs)
+        
+        def show_archived():
+            if archived:
+                ttk.Label(self.results_frame, text=f"Archived ({len(archived)})",
+                         font=('TkDefaultFont', 10, 'bold')).pack(anchor="w", padx=10, pady=(10,0))
+                self._render_rows(archived, lambda job, _: self.create_archived_frame(job, self.results_frame))
         
-        self.update_record_count(found_count)
+        # Archived matches go below the tracked ones, once those are all built
+        self._render_rows(jobs, then=show_archived)
+        self.update_record_count(len(jobs) + len(archived))
                 
-        if not found:
+        if not (jobs or archived):
             ttk.Label(self.results_frame, 
                      text="No matching applications found.\nClick 'Show All' to view all records.",
                      padding=20).pack()
+        self._mark_shown(query)
+    
+    def _find_jobs(self, search_type, search_term):
+        """(matching records, matching archived records) for a link or company search"""
+        if search_type == "link":
+            # Exact match for links (after stripping spaces)
+            term = search_term.lower().strip()
+            jobs = [job for job in self.jobs if term == job['link'].lower().strip()]
+            # Archived applications are matched through the archive's index first
+            archived = [job for job in [self.archive.find(search_term)] if job is not None]
+        else:
+            # Partial match for company names
+            term = search_term.lower()
+            jobs = [job for job in self.jobs if term in job['company'].lower()]
+            archived = self.archive.search_company(search_term)
+        return jobs, archived
             
+    def _search_notes(self, query):
+        """List the applications whose notes or description match query, most relevant first"""
+        try:
+            ranked = self._cached(("search", "text", query.lower()),
+                                  lambda: self.notes.search(query, self.store.index.texts))
+        except Exception as e:
+            messagebox.showerror("Error", f"Error searching notes: {str(e)}")
+            ranked = []
+        self._displayed_jobs = [job for job, _ in ranked]
+        self._render_rows(self._displayed_jobs)
+        self.update_record_count(len(ranked))
+        if not ranked:
+            ttk.Label(self.results_frame,
+                     text="No notes or descriptions match.\nClick 'Show All' to view all records.",
+                     padding=20).pack()
+    
     def show_add_job_dialog(self):
         """Show popup dialog for adding new job application"""
         dialog = tk.Toplevel(self.root)
@@ -642,7 +1968,8 @@ class JobTracker:
         ttk.Label(main_frame, text="Company Name:", 
                  font=('TkDefaultFont', 10)).pack(anchor="w", pady=(0,5))
         company_var = tk.StringVar()
-        ttk.Entry(main_frame, textvariable=company_var, width=50).pack(fill="x", pady=(0,15))
+        company_entry = ttk.Entry(main_frame, textvariable=company_var, width=50)
+        company_entry.pack(fill="x", pady=(0,15))
         
         # Job Link
         ttk.Label(main_frame, text="Job Link:", 
@@ -654,41 +1981,76 @@ class JobTracker:
         ttk.Label(main_frame, text="Role:", 
                  font=('TkDefaultFont', 10)).pack(anchor="w", pady=(0,5))
         role_var = tk.StringVar()
-        role_combo = ttk.Combobox(main_frame, textvariable=role_var, 
-                                width=47, state="readonly")
-        role_combo['values'] = self.settings_manager.get_job_roles()
+        role_combo = RolePicker(main_frame, self._role_choices, textvariable=role_var, width=47)
         role_combo.pack(fill="x", pady=(0,15))
         
         # Current Date (display only)
         current_date = datetime.now().strftime('%Y-%m-%d')
         ttk.Label(main_frame, text="Application Date:", 
                  font=('TkDefaultFont', 10)).pack(anchor="w", pady=(0,5))
-        ttk.Label(main_frame, text=current_date,
-                 font=('TkDefaultFont', 10, 'bold')).pack(anchor="w", pady=(0,20))
+        date_label = ttk.Label(main_frame, text=current_date,
+                              font=('TkDefaultFont', 10, 'bold'))
+        date_label.pack(anchor="w", pady=(0,10))
+        
+        # Inline feedback instead of modal popups while entering many applications
+        feedback_label = ttk.Label(main_frame, text="")
+        feedback_label.pack(anchor="w")
         
         # Buttons frame
         button_frame = ttk.Frame(main_frame)
-        button_frame.pack(fill="x", pady=(20,0))
+        button_frame.pack(fill="x", pady=(10,0))
+        
+        ttk.Checkbutton(button_frame, text="Add another after saving",
+                       variable=self.add_another_var).pack(side="left")
         
         ttk.Button(button_frame, text="Cancel",
                   command=dialog.destroy).pack(side="right", padx=5)
         
-        def save_job():
+        def save_job(event=None):
             company = company_var.get().strip()
             link = link_var.get().strip()
             role = role_var.get().strip()
             
             if not company or not link or not role:
-                messagebox.showwarning("Warning", "Please fill in all fields")
+                feedback_label.configure(text="Please fill in all fields", bootstyle="warning")
+                return
+            role = self._resolve_role(role)
+            if role is None:
+                feedback_label.configure(text="Pick a role from the list (new roles are added in Settings)",
+                                         bootstyle="warning")
                 return
+            role_var.set(role)
             
-            if self.add_job(company, link, role, current_date):
-                dialog.destroy()  # Only close if add_job was successful
+            # Stamp the date at save time; the dialog may stay open across many entries
+            applied_date = datetime.now().strftime('%Y-%m-%d')
+            added, reason = self.add_job(company, link, role, applied_date)
+            if not added:
+                if reason == ALREADY_TRACKED:
+                    text = "Not saved: this job is already in the tracker"
+                else:
+                    text = "Not saved: you chose not to add this possible duplicate"
+                feedback_label.configure(text=text, bootstyle="warning")
+                return
+            
+            if self.add_another_var.get():
+                # Keep the role selected; most runs of entries share it
+                company_var.set("")
+                link_var.set("")
+                date_label.configure(text=applied_date)
+                feedback_label.configure(text=f"Saved {company}. Ready for the next one.",
+                                         bootstyle="success")
+                company_entry.focus_set()
+            else:
+                dialog.destroy()
         
         ttk.Button(button_frame, text="Save",
                   command=save_job,
                   style="success.TButton").pack(side="right", padx=5)
         
+        dialog.bind("<Return>", save_job)
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+        company_entry.focus_set()
+        
         # Center the window
         dialog.update_idletasks()
         width = dialog.winfo_width()
@@ -697,34 +2059,300 @@ class JobTracker:
         y = (dialog.winfo_screenheight() // 2) - (height // 2)
         dialog.geometry(f'{width}x{height}+{x}+{y}')
     
-    def add_job(self, company, link, role, date):
-        """Add a new job application"""
+    def show_edit_job_dialog(self, job):
+        """Edit a record in place; the original application date is kept unless changed"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Edit Application - {job['company']}")
+        dialog.geometry("600x440")
+        
+        # Make the window modal
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill="both", expand=True)
+        
+        ttk.Label(main_frame, text="Company Name:", 
+                 font=('TkDefaultFont', 10)).pack(anchor="w", pady=(0,5))
+        company_var = tk.StringVar(value=job.get('company', ''))
+        company_entry = ttk.Entry(main_frame, textvariable=company_var, width=50)
+        company_entry.pack(fill="x", pady=(0,15))
+        
+        ttk.Label(main_frame, text="Job Link:", 
+                 font=('TkDefaultFont', 10)).pack(anchor="w", pady=(0,5))
+        link_var = tk.StringVar(value=job.get('link', ''))
+        ttk.Entry(main_frame, textvariable=link_var, width=50).pack(fill="x", pady=(0,15))
+        
+        ttk.Label(main_frame, text="Role:", 
+                 font=('TkDefaultFont', 10)).pack(anchor="w", pady=(0,5))
+        old_role = job.get('role', '')
+        
+        def role_choices(text, limit):
+            choices = self._role_choices(text, limit)
+            if old_role and old_role not in self.settings_manager.role_catalog \
+                    and role_key(text) in role_key(old_role):
+                # Keep roles that were removed from settings selectable for old records
+                choices = [old_role] + choices[:limit - 1]
+            return choices
+        
+        role_var = tk.StringVar(value=old_role)
+        RolePicker(main_frame, role_choices, textvariable=role_var, width=47).pack(fill="x", pady=(0,15))
+        
+        ttk.Label(main_frame, text="Application Date (YYYY-MM-DD):", 
+                 font=('TkDefaultFont', 10)).pack(anchor="w", pady=(0,5))
+        date_var = tk.StringVar(value=job.get('applied_date', ''))
+        ttk.Entry(main_frame, textvariable=date_var, width=20).pack(anchor="w", pady=(0,10))
+        
+        feedback_label = ttk.Label(main_frame, text="")
+        feedback_label.pack(anchor="w")
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x", pady=(10,0))
+        
+        ttk.Button(button_frame, text="Cancel",
+                  command=dialog.destroy).pack(side="right", padx=5)
+        
+        def save_edit(event=None):
+            values = {
+                'company': company_var.get().strip(),
+                'link': link_var.get().strip(),
+                'role': role_var.get().strip(),
+                'applied_date': date_var.get().strip(),
+            }
+            if not all(values.values()):
+                feedback_label.configure(text="Please fill in all fields", bootstyle="warning")
+                return
+            if values['role'] != old_role:
+                values['role'] = self._resolve_role(values['role'])
+                if values['role'] is None:
+                    feedback_label.configure(text="Pick a role from the list", bootstyle="warning")
+                    return
+                role_var.set(values['role'])
+            if date_ordinal(values['applied_date']) == NO_DATE:
+                feedback_label.configure(text="Enter the date as YYYY-MM-DD", bootstyle="warning")
+                return
+            
+            old_key = normalize_link(job['link'])
+            new_key = normalize_link(values['link'])
+            if new_key != old_key and self.is_tracked(values['link']):
+                feedback_label.configure(text="This job link already exists in the tracker",
+                                         bootstyle="warning")
+                return
+            
+            changes = {name: value for name, value in values.items() if job.get(name) != value}
+            if changes:
+                self.run_command(UpdateJobs({job['link']: changes}))
+                if old_key in self._selected_links and new_key != old_key:
+                    self._selected_links.discard(old_key)
+                    self._selected_links.add(new_key)
+                self.notifier.success(f"Updated {values['company']}")
+            dialog.destroy()
+        
+        ttk.Button(button_frame, text="Save",
+                  command=save_edit,
+                  style="success.TButton").pack(side="right", padx=5)
+        
+        dialog.bind("<Return>", save_edit)
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+        company_entry.focus_set()
+    
+    def show_duplicates_dialog(self):
+        """Report groups of likely duplicate applications (same company and role, close dates)"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Possible Duplicates")
+        dialog.geometry("700x420")
+        dialog.transient(self.root)
+        
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill="both", expand=True)
+        
+        summary_label = ttk.Label(main_frame, text="")
+        summary_label.pack(anchor="w", pady=(0,5))
+        
+        tree = ttk.Treeview(main_frame, columns=("role", "applied", "link"), height=12)
+        tree.heading("#0", text="Company")
+        tree.heading("role", text="Role")
+        tree.heading("applied", text="Applied")
+        tree.heading("link", text="Link")
+        tree.pack(fill="both", expand=True)
+        
+        def fill():
+            tree.delete(*tree.get_children())
+            groups = self._loaded_index().duplicates.groups()
+            for number, group in enumerate(groups):
+                parent = tree.insert("", "end", iid=f"group-{number}", open=True,
+                                     text=f"{group[0]['company']} ({len(group)})",
+                                     values=(group[0].get('role', ''), "", ""))
+                for job in group:
+                    tree.insert(parent, "end", iid=normalize_link(job['link']), text=job['company'],
+                                values=(job.get('role', ''), job.get('applied_date', ''), job['link']))
+            summary_label.configure(text=f"{len(groups)} groups of likely duplicates" if groups
+                                    else "No likely duplicates found.")
+        
+        def selected_jobs():
+            jobs = [self.store.find(key) for key in tree.selection() if not key.startswith("group-")]
+            return [job for job in jobs if job is not None]
+        
+        def open_details(event=None):
+            jobs = selected_jobs()
+            if jobs:
+                self.show_details(jobs[0])
+        
+        def delete_selected():
+            jobs = selected_jobs()
+            if not jobs:
+                self.notifier.info("Select the applications to delete first.")
+                return
+            if not messagebox.askyesno("Confirm", f"Delete {len(jobs)} selected applications?", parent=dialog):
+                return
+            self.run_command(RemoveJobs([job['link'] for job in jobs], label="delete duplicates"))
+            fill()
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x", pady=(10,0))
+        ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Delete Selected", command=delete_selected,
+                  style="danger.TButton").pack(side="right", padx=5)
+        ttk.Button(button_frame, text="View Details", command=open_details,
+                  style="info.TButton").pack(side="left")
+        
+        tree.bind("<Double-1>", open_details)
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+        fill()
+    
+    # -------------------- Follow-up reminders --------------------
+    def _load_reminders(self):
+        self.reminders.load(self.jobs, self.settings_manager.get_follow_up_days())
+        self._update_follow_up_button()
+    
+    def _due_follow_ups(self):
+        """Jobs whose follow-up reminder is due, longest waiting first"""
+        jobs = (self.store.find(link) for link in self.reminders.due_links())
+        return [job for job in jobs if job is not None]
+    
+    def _update_follow_up_button(self):
+        count = len(self.reminders.due_links())
+        self.follow_up_button.configure(text=f"Follow-ups ({count})",
+                                        style="warning.TButton" if count else "secondary.TButton")
+    
+    def _on_follow_ups_due(self, links):
+        self._update_follow_up_button()
+        jobs = [job for job in (self.store.find(link) for link in links) if job is not None]
+        if not jobs:
+            return
+        others = f" and {len(jobs) - 1} more" if len(jobs) > 1 else ""
+        self.notifier.warning(f"Time to follow up on {jobs[0]['company']}{others}", toast=True)
+    
+    def mark_followed_up(self, jobs):
+        today = datetime.now().strftime('%Y-%m-%d')
+        self.run_command(UpdateJobs.same_change([job['link'] for job in jobs], {FOLLOWED_UP_FIELD: today},
+                                                label="follow-up"))
+    
+    def snooze_follow_ups(self, jobs, days=SNOOZE_DAYS):
+        remind_on = (datetime.now() + timedelta(days=days)).strftime('%Y-%m-%d')
+        self.run_command(UpdateJobs.same_change([job['link'] for job in jobs], {REMIND_ON_FIELD: remind_on},
+                                                label="snooze"))
+    
+    def show_follow_ups_dialog(self):
+        """List the applications due for a follow-up, to open, mark done or snooze"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Follow-ups")
+        dialog.geometry("650x380")
+        dialog.transient(self.root)
+        
+        main_frame = ttk.Frame(dialog, padding=20)
+        main_frame.pack(fill="both", expand=True)
+        
+        tree = ttk.Treeview(main_frame, columns=("company", "role", "applied"), show="headings", height=10)
+        tree.heading("company", text="Company")
+        tree.heading("role", text="Role")
+        tree.heading("applied", text="Applied")
+        tree.pack(fill="both", expand=True)
+        
+        def fill():
+            tree.delete(*tree.get_children())
+            for job in self._due_follow_ups():
+                tree.insert("", "end", iid=normalize_link(job['link']),
+                            values=(job.get('company', ''), job.get('role', ''), job.get('applied_date', '')))
+        
+        def selected_jobs():
+            jobs = [self.store.find(key) for key in tree.selection()]
+            return [job for job in jobs if job is not None]
+        
+        def act(action):
+            jobs = selected_jobs()
+            if not jobs:
+                self.notifier.info("Select the applications first.")
+                return
+            action(jobs)
+            fill()
+        
+        def open_details(event=None):
+            jobs = selected_jobs()
+            if jobs:
+                self.show_details(jobs[0])
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill="x", pady=(10,0))
+        ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side="right", padx=5)
+        ttk.Button(button_frame, text=f"Remind Me in {SNOOZE_DAYS} Days",
+                  command=lambda: act(self.snooze_follow_ups),
+                  style="secondary.TButton").pack(side="right", padx=5)
+        ttk.Button(button_frame, text="Followed Up",
+                  command=lambda: act(self.mark_followed_up),
+                  style="success.TButton").pack(side="right", padx=5)
+        ttk.Button(button_frame, text="View Details", command=open_details,
+                  style="info.TButton").pack(side="left")
+        
+        tree.bind("<Double-1>", open_details)
+        dialog.bind("<Escape>", lambda e: dialog.destroy())
+        fill()
+    
+    def add_job(self, company, link, role, date, confirm_duplicates=True):
+        """Add a new job application.
+        Returns (added, reason): (True, None), or (False, ALREADY_TRACKED or DUPLICATE_DECLINED).
+        """
         # Strip spaces from link before checking
         link = link.strip()
         
-        # Check if job already exists
-        for job in self.jobs:
-            if job['link'].lower().strip() == link.lower():
-                messagebox.showwarning("Warning", "This job link already exists in the tracker")
-                return False  # Return False to indicate failure
-                
-        self.jobs.append({
-            'company': company.strip(),  # Strip spaces from all text fields
-            'link': link,
-            'role': role.strip(),
-            'applied_date': date
-        })
-        
-        self.save_data()
-        messagebox.showinfo("Success", "Job application added successfully!")
-        self.show_all_records()  # Refresh the display to show all records including the new one
-        self.update_record_count()  # Update the record counter
-        self.refresh_statistics()  # Update statistics tab
-        return True  # Return True to indicate success
+        # Check if job already exists (including archived applications)
+        if self.is_tracked(link):
+            self.notifier.warning("This job link already exists in the tracker")
+            return False, ALREADY_TRACKED
+        
+        job = new_job(company, link, role, date)
+        # Reposts under a new link: same company and role applied to within a few days
+        similar = self._loaded_index().duplicates.candidates(job)
+        if similar:
+            earlier = similar[-1]
+            message = (f"You applied to {earlier['company']} for {earlier.get('role') or 'this role'} "
+                       f"on {earlier.get('applied_date', '')}")
+            if confirm_duplicates:
+                if not messagebox.askyesno("Possible Duplicate", f"{message}.\nAdd this application anyway?"):
+                    return False, DUPLICATE_DECLINED
+            else:
+                self.notifier.warning(f"Possible duplicate: {message}")
+        if self._view == "all":
+            # The new row is appended in place; saving and statistics wait for idle
+            self.run_command(AddJobs([job]))
+        else:
+            self.reminders.apply_change(self.command_log.execute(AddJobs([job])))
+            self._update_history_buttons()
+            self._schedule_flush()
+            self.show_all_records()  # Leave the search results to show the new record
+        self.notifier.success(f"Added {job['company']} ({job['role']})")
+        return True, None
 
 def main():
+    # Merge workers re-run the executable in frozen builds
+    multiprocessing.freeze_support()
     root = ttk.Window(themename="cosmo")
     app = JobTracker(root)
+    probe_path = os.environ.get(PROBE_ENV)
+    if probe_path:
+        # Launched by startup_probe: report the timings once the window is up, then quit
+        import startup_probe
+        startup_probe.report(root, probe_path, IMPORTS_DONE, app.on_close)
     root.mainloop()
 
 if __name__ == "__main__":
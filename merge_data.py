@@ -0,0 +1,168 @@
+"""Merge several job_data.json files (say from two PCs, or an old storage folder)
+into one, deduplicated by posting: links are normalized, and job-board links
+are reduced to their canonical posting URL (so tracking parameters don't count).
+
+Files are parsed and deduplicated in a process pool, one file per task, and the
+per-file results are then combined in input order; the pool also encodes the
+output, which is where most of the time goes for large histories. Records keep
+the order of the first file they appear in, and records new to the merge are
+appended after them. When two records share a posting the one with the earliest
+applied_date wins (the earlier input on a tie), and the other record fills in its
+missing fields and adds its status changes. Notes and descriptions the result
+refers to are copied over.
+"""
+import json
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from index_file import NO_DATE, date_ordinal, index_path_for, normalize_link, remove_index
+from job_links import extract_job_link
+from job_status import history_of
+from job_store import record_bytes, write_records
+from migrations import SCHEMA_FIELD, upgrade
+from notes_store import NotesStore, refs_of
+
+# Below this much input, parsing in-process beats starting worker processes
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+# Output records encoded per worker task
+ENCODE_CHUNK = 5000
+
+
+class MergeResult:
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.read = 0
+        self.written = 0
+        # Links found in more than one record, and records that weren't objects with a link
+        self.conflicts = 0
+        self.skipped = 0
+
+    def summary(self):
+        return (f"Merged {self.read} records from {len(self.inputs)} files into {self.written} "
+                f"({self.conflicts} duplicates combined, {self.skipped} unusable skipped)")
+
+
+def _sort_ordinal(job):
+    ordinal = date_ordinal(job.get('applied_date'))
+    return ordinal if ordinal != NO_DATE else float('inf')
+
+
+def posting_key(link):
+    """Deduplication key of a link: its canonical posting URL if it has one, normalized"""
+    return normalize_link(extract_job_link(link) or link)
+
+
+def merge_records(first, second):
+    """Combine two records of the same posting; first is the one read earlier"""
+    winner, other = (second, first) if _sort_ordinal(second) < _sort_ordinal(first) else (first, second)
+    merged = dict(winner)
+    for field, value in other.items():
+        if merged.get(field) in (None, '', [], {}) and value not in (None, '', [], {}):
+            merged[field] = value
+    other_history = history_of(other)
+    if other_history[0].get('status') == history_of(winner)[0].get('status'):
+        # Both start with the application itself; the winner's date stands for it
+        other_history = other_history[1:]
+    history = []
+    seen = set()
+    for entry in history_of(winner) + other_history:
+        key = (entry.get('status'), entry.get('date'))
+        if key not in seen:
+            seen.add(key)
+            history.append(dict(entry))
+    history.sort(key=lambda entry: str(entry.get('date') or ''))
+    merged['status_history'] = history
+    # The status is whatever the most recent change left it at
+    merged['status'] = history[-1].get('status') or merged.get('status')
+    merged[SCHEMA_FIELD] = max(winner.get(SCHEMA_FIELD, 1), other.get(SCHEMA_FIELD, 1))
+    return merged
+
+
+def load_unique(path):
+    """Parse one data file and fold its own duplicates; runs in a worker process.
+    Returns (records keyed by posting_key() in first-seen order, records read, conflicts, skipped).
+    """
+    with open(path, 'rb') as f:
+        jobs = json.load(f)
+    if not isinstance(jobs, list):
+        raise ValueError(f"{path} is not a list of applications")
+    unique = {}
+    conflicts = skipped = 0
+    for job in jobs:
+        if not isinstance(job, dict) or not (job.get('link') or '').strip():
+            skipped += 1
+            continue
+        upgrade(job)
+        key = posting_key(job['link'])
+        if key in unique:
+            conflicts += 1
+            unique[key] = merge_records(unique[key], job)
+        else:
+            unique[key] = job
+    return unique, len(jobs), conflicts, skipped
+
+
+def encode_records(jobs):
+    """Canonical bytes of each record; runs in a worker process"""
+    return [record_bytes(job) for job in jobs]
+
+
+def _combine(parts, result):
+    merged = {}
+    for unique, read, conflicts, skipped in parts:
+        result.read += read
+        result.conflicts += conflicts
+        result.skipped += skipped
+        for key, job in unique.items():
+            if key in merged:
+                result.conflicts += 1
+                merged[key] = merge_records(merged[key], job)
+            else:
+                merged[key] = job
+    # Combined records stay where they first appeared; new ones follow in input order
+    return list(merged.values())
+
+
+def _copy_texts(paths, output_path, jobs):
+    """Bring the notes and descriptions the merged records point at into the output's pack"""
+    target = NotesStore(output_path)
+    wanted = {ref for job in jobs for ref in refs_of(job) if ref not in target}
+    for path in paths:
+        if not wanted:
+            break
+        source = NotesStore(path)
+        if os.path.abspath(source.pack_path) != os.path.abspath(target.pack_path):
+            wanted.difference_update(target.copy_from(source, wanted))
+
+
+def merge_files(paths, output_path, workers=None):
+    """Merge the data files in paths into output_path (which may be one of them).
+    The output is written canonically, with the first file's records in their
+    order and new ones appended; an existing output file is kept as output_path + '.bak'.
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    result = MergeResult(paths)
+    total_size = sum(os.path.getsize(path) for path in paths)
+    tmp_path = output_path + '.tmp'
+    workers = workers or os.cpu_count() or 1
+    if total_size >= PARALLEL_MIN_BYTES and workers > 1:
+        # spawn behaves the same everywhere and is safe next to the GUI's threads
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            jobs = _combine(pool.map(load_unique, paths), result)
+            chunks = [jobs[i:i + ENCODE_CHUNK] for i in range(0, len(jobs), ENCODE_CHUNK)]
+            with open(tmp_path, 'wb') as f:
+                result.written = write_records(f, (text for texts in pool.map(encode_records, chunks)
+                                                   for text in texts))
+    else:
+        jobs = _combine(map(load_unique, paths), result)
+        with open(tmp_path, 'wb') as f:
+            result.written = write_records(f, encode_records(jobs))
+    _copy_texts(paths, output_path, jobs)
+    if os.path.exists(output_path):
+        shutil.copyfile(output_path, output_path + '.bak')
+    os.replace(tmp_path, output_path)
+    # The store rebuilds the index from the canonical file on the next load
+    remove_index(index_path_for(output_path))
+    return result
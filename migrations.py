@@ -0,0 +1,53 @@
+from job_status import history_of, status_of
+
+# Version written into every record as 'schema_version'. Records without the
+# field are version 1 (the original company/link/role/applied_date layout).
+SCHEMA_VERSION = 2
+SCHEMA_FIELD = 'schema_version'
+
+# from_version -> function that upgrades a record in place to from_version + 1
+MIGRATIONS = {}
+
+
+def migration(from_version):
+    """Register a migration step from from_version to from_version + 1"""
+    def register(func):
+        MIGRATIONS[from_version] = func
+        return func
+    return register
+
+
+def record_version(job):
+    return job.get(SCHEMA_FIELD, 1)
+
+
+def needs_upgrade(job):
+    return record_version(job) < SCHEMA_VERSION
+
+
+def upgrade(job):
+    """Bring a record up to SCHEMA_VERSION in place; returns True if it changed"""
+    version = record_version(job)
+    if version >= SCHEMA_VERSION:
+        return False
+    while version < SCHEMA_VERSION:
+        MIGRATIONS[version](job)
+        version += 1
+    job[SCHEMA_FIELD] = version
+    return True
+
+
+def upgraded_fields(job):
+    """Names of the fields upgrade() would add or change on job, leaving job as it is"""
+    if not needs_upgrade(job):
+        return []
+    upgraded = dict(job)
+    upgrade(upgraded)
+    return [name for name, value in upgraded.items() if name not in job or job[name] != value]
+
+
+@migration(1)
+def _add_status(job):
+    """v2: materialize the status pipeline fields"""
+    job['status_history'] = [dict(entry) for entry in history_of(job)]
+    job['status'] = status_of(job)
@@ -0,0 +1,147 @@
+import gzip
+import json
+import math
+import os
+import re
+from collections import Counter
+from itertools import chain
+
+INDEX_VERSION = 1
+# BM25 ranking parameters (term saturation and length normalization)
+K1 = 1.2
+B = 0.75
+_WORD = re.compile(r'[^\W_]+')
+# Words too common in job descriptions to help a search
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or our that the their this to
+we will with you your
+""".split())
+
+
+def tokenize(text):
+    """Search terms of a text: casefolded words of two or more characters, minus stop words"""
+    return [word for word in _WORD.findall(text.casefold()) if len(word) > 1 and word not in STOP_WORDS]
+
+
+class NotesIndex:
+    """Inverted index over stored texts, token -> {ref: term frequency}, ranked with BM25.
+    Texts are indexed by content hash, so a description saved for several records is
+    tokenized once and an edit only indexes the new text.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        # ref -> number of tokens in the text
+        self.lengths = {}
+        self._total_length = 0
+        # Whether there are changes save() hasn't written yet
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __contains__(self, ref):
+        return ref in self.lengths
+
+    def add(self, ref, text):
+        if ref in self.lengths:
+            return
+        counts = Counter(tokenize(text))
+        for token, count in counts.items():
+            self.postings.setdefault(token, {})[ref] = count
+        length = sum(counts.values())
+        self.lengths[ref] = length
+        self._total_length += length
+        self.dirty = True
+
+    def retain(self, refs):
+        """Forget every text whose ref is not in refs (after the pack was compacted)"""
+        dropped = [ref for ref in self.lengths if ref not in refs]
+        if not dropped:
+            return
+        for ref in dropped:
+            self._total_length -= self.lengths.pop(ref)
+        postings = {}
+        for token, texts in self.postings.items():
+            kept = {ref: count for ref, count in texts.items() if ref in refs}
+            if kept:
+                postings[token] = kept
+        self.postings = postings
+        self.dirty = True
+
+    def search(self, query, live, limit=None):
+        """Jobs whose texts match query, as (job, score) pairs, best first.
+        live maps ref -> {id(job): job} for the texts records refer to (JobIndex.texts).
+        Jobs matching more of the query's words rank first, then by BM25 score.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self.lengths:
+            return []
+        count = len(self.lengths)
+        average = self._total_length / count or 1
+        scores = {}
+        # ref -> bit mask of the query tokens found in it
+        matched = {}
+        for bit, token in enumerate(tokens):
+            texts = self.postings.get(token)
+            if not texts:
+                continue
+            idf = math.log(1 + (count - len(texts) + 0.5) / (len(texts) + 0.5))
+            for ref, frequency in texts.items():
+                if ref not in live:
+                    continue
+                norm = K1 * (1 - B + B * self.lengths[ref] / average)
+                scores[ref] = scores.get(ref, 0) + idf * frequency * (K1 + 1) / (frequency + norm)
+                matched[ref] = matched.get(ref, 0) | (1 << bit)
+        # A job's notes and description count together
+        results = {}
+        for ref, score in scores.items():
+            for job in live[ref].values():
+                result = results.get(id(job))
+                if result is None:
+                    results[id(job)] = [job, matched[ref], score]
+                else:
+                    result[1] |= matched[ref]
+                    result[2] += score
+        ranked = sorted(results.values(), key=lambda result: (-bin(result[1]).count('1'), -result[2]))
+        return [(job, score) for job, _, score in ranked[:limit]]
+
+    # -------------------- Persistence --------------------
+    @classmethod
+    def load(cls, path):
+        """The index saved at path, or an empty one if it is missing or unreadable"""
+        index = cls()
+        try:
+            with open(path, 'rb') as f:
+                saved = json.loads(gzip.decompress(f.read()))
+            if saved.get('version') != INDEX_VERSION:
+                return index
+            refs = saved['refs']
+            index.lengths = dict(zip(refs, saved['lengths']))
+            index._total_length = sum(saved['lengths'])
+            # Postings are stored as flat [text number, frequency, ...] lists
+            for token, flat in saved['postings'].items():
+                index.postings[token] = dict(zip(map(refs.__getitem__, flat[::2]), flat[1::2]))
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            return cls()
+        return index
+
+    def save(self, path):
+        numbers = {ref: number for number, ref in enumerate(self.lengths)}
+        saved = {
+            'version': INDEX_VERSION,
+            'refs': list(self.lengths),
+            'lengths': list(self.lengths.values()),
+            'postings': {token: list(chain.from_iterable(zip(map(numbers.__getitem__, texts), texts.values())))
+                         for token, texts in self.postings.items()},
+        }
+        # The index is rebuilt from the pack when missing; failing to write it is not an error
+        try:
+            tmp_path = path + '.tmp'
+            # One dumps and compress call; streaming through gzip.open is several times slower
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(json.dumps(saved, separators=(',', ':')).encode('utf-8'), compresslevel=1))
+            os.replace(tmp_path, path)
+            self.dirty = False
+        except OSError:
+            pass
@@ -0,0 +1,231 @@
+import hashlib
+import os
+import struct
+import zlib
+
+from notes_index import NotesIndex
+
+# Notes and pasted job descriptions are kept out of job_data.json, next to it:
+#   job_notes.pack  append-only pack of zlib-compressed texts, each content stored once
+#   job_notes.idx   full-text search index over the pack, rebuilt automatically
+# Records only carry the hash of their texts in these fields, so the job list stays small.
+NOTES_PACK_NAME = 'job_notes.pack'
+NOTES_INDEX_NAME = 'job_notes.idx'
+TEXT_REFS = {'notes': 'notes_ref', 'description': 'description_ref'}
+MAGIC = b'JTNOTES1'
+# Entry header: SHA-1 of the text and the length of its compressed bytes
+_HEADER = struct.Struct('>20sI')
+# compact() is worth it once unreferenced texts are this big a share of a pack this large
+COMPACT_MIN_BYTES = 1024 * 1024
+COMPACT_GARBAGE_RATIO = 0.5
+
+
+def notes_paths_for(data_path):
+    """(pack path, search index path) that belong to a data file"""
+    directory = os.path.dirname(data_path)
+    return os.path.join(directory, NOTES_PACK_NAME), os.path.join(directory, NOTES_INDEX_NAME)
+
+
+def text_ref(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def refs_of(job):
+    """Refs of the texts a record points at"""
+    return [job[field] for field in TEXT_REFS.values() if job.get(field)]
+
+
+def _identity(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+class NotesStore:
+    """Content-addressed store of notes and descriptions.
+    Texts are appended compressed and found by hash, so identical texts (the same
+    description saved for two reposts, an edit that was undone) share one entry.
+    Only the entry headers are read on open; the search index is loaded on first search.
+    """
+
+    def __init__(self, data_path):
+        self.pack_path, self.index_path = notes_paths_for(data_path)
+        # ref -> (offset of the compressed text, its length), read on first use
+        self._entries = None
+        self._end = len(MAGIC)
+        self._identity = None
+        self._search = None
+
+    def open(self):
+        self._entries = {}
+        self._end = len(MAGIC)
+        self._identity = _identity(self.pack_path)
+        self._refresh()
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self.open()
+        return self._entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, ref):
+        return ref in self.entries
+
+    def get(self, ref):
+        """The text with this ref ('' if it is unknown)"""
+        raw = self._raw(ref)
+        return zlib.decompress(raw).decode('utf-8') if raw is not None else ''
+
+    def put(self, text):
+        """Store text (surrounding whitespace removed) and return its ref; None for empty text"""
+        text = (text or '').strip()
+        if not text:
+            return None
+        ref = text_ref(text)
+        if ref not in self.entries:
+            self._append([(ref, zlib.compress(text.encode('utf-8')))])
+            if self._search is not None:
+                self._search.add(ref, text)
+        return ref
+
+    def copy_from(self, other, refs):
+        """Copy the texts in refs that other has and this store lacks; returns the refs copied"""
+        copied = [(ref, other._raw(ref)) for ref in refs if ref not in self.entries and ref in other]
+        if copied:
+            self._append(copied)
+        return [ref for ref, _ in copied]
+
+    # -------------------- Search --------------------
+    @property
+    def search_index(self):
+        if self._search is None:
+            self._search = NotesIndex.load(self.index_path)
+        # Index texts stored since it was saved (by this app, the CLI or a merge)
+        self._refresh()
+        if len(self._search) != len(self.entries) or any(ref not in self._search for ref in self.entries):
+            self._search.retain(self.entries)
+            for ref, text in self._texts([ref for ref in self.entries if ref not in self._search]):
+                self._search.add(ref, text)
+        return self._search
+
+    def search(self, query, live, limit=None):
+        """Ranked full-text search; see NotesIndex.search"""
+        return self.search_index.search(query, live, limit)
+
+    def save_index(self):
+        if self._search is not None and self._search.dirty:
+            self._search.save(self.index_path)
+
+    def close(self):
+        self.save_index()
+
+    # -------------------- Compaction --------------------
+    def garbage_bytes(self, live_refs):
+        return sum(_HEADER.size + length for ref, (_, length) in self.entries.items() if ref not in live_refs)
+
+    def needs_compaction(self, live_refs):
+        size = self._end if self.entries else 0
+        return size >= COMPACT_MIN_BYTES and self.garbage_bytes(live_refs) >= size * COMPACT_GARBAGE_RATIO
+
+    def compact(self, live_refs):
+        """Rewrite the pack without the texts no record refers to; returns how many were dropped.
+        live_refs must cover every record that may still point at a text, archived ones included.
+        """
+        live = [ref for ref in self.entries if ref in live_refs]
+        dropped = len(self._entries) - len(live)
+        if not dropped:
+            return 0
+        entries = {}
+        position = len(MAGIC)
+        tmp_path = self.pack_path + '.tmp'
+        with open(self.pack_path, 'rb') as source, open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            for ref in live:
+                offset, length = self._entries[ref]
+                source.seek(offset)
+                f.write(_HEADER.pack(bytes.fromhex(ref), length) + source.read(length))
+                entries[ref] = (position + _HEADER.size, length)
+                position += _HEADER.size + length
+        os.replace(tmp_path, self.pack_path)
+        self._entries = entries
+        self._end = position
+        self._identity = _identity(self.pack_path)
+        if self._search is not None:
+            self._search.retain(entries)
+        return dropped
+
+    # -------------------- Internal helpers --------------------
+    def _refresh(self):
+        """Read the headers of entries appended since the last look (by anyone)"""
+        if self._entries is None:
+            self.open()
+            return
+        identity = _identity(self.pack_path)
+        if identity != self._identity:
+            # Compacted (replaced) elsewhere: every offset may have moved
+            self._entries = {}
+            self._end = len(MAGIC)
+            self._identity = identity
+        if identity is None:
+            return
+        with open(self.pack_path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.pack_path} is not a notes pack")
+            size = os.fstat(f.fileno()).st_size
+            position = self._end
+            f.seek(position)
+            while position + _HEADER.size <= size:
+                digest, length = _HEADER.unpack(f.read(_HEADER.size))
+                if position + _HEADER.size + length > size:
+                    # A write that was cut short; the next append overwrites it
+                    break
+                self._entries[digest.hex()] = (position + _HEADER.size, length)
+                position += _HEADER.size + length
+                f.seek(position)
+            self._end = position
+
+    def _raw(self, ref):
+        if self._entries is not None and _identity(self.pack_path) != self._identity:
+            self._refresh()
+        entry = self.entries.get(ref)
+        if entry is None:
+            self._refresh()
+            entry = self._entries.get(ref)
+            if entry is None:
+                return None
+        offset, length = entry
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def _texts(self, refs):
+        """(ref, text) for many refs, read in pack order through one file handle"""
+        refs = sorted(refs, key=lambda ref: self._entries[ref][0])
+        if not refs:
+            return
+        with open(self.pack_path, 'rb') as f:
+            for ref in refs:
+                offset, length = self._entries[ref]
+                f.seek(offset)
+                yield ref, zlib.decompress(f.read(length)).decode('utf-8')
+
+    def _append(self, items):
+        self._refresh()
+        if self._identity is None:
+            with open(self.pack_path, 'wb') as f:
+                f.write(MAGIC)
+            self._identity = _identity(self.pack_path)
+        with open(self.pack_path, 'r+b') as f:
+            f.seek(self._end)
+            for ref, data in items:
+                if ref in self._entries:
+                    continue
+                f.write(_HEADER.pack(bytes.fromhex(ref), len(data)) + data)
+                self._entries[ref] = (self._end + _HEADER.size, len(data))
+                self._end += _HEADER.size + len(data)
+            f.truncate()
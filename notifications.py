@@ -0,0 +1,47 @@
+import ttkbootstrap as ttk
+from ttkbootstrap.toast import ToastNotification
+
+# How long a status message stays before the bar returns to "Ready"
+STATUS_TIMEOUT_MS = 5000
+TOAST_DURATION_MS = 2500
+
+
+class Notifier:
+    """Non-modal feedback: a status bar line at the bottom of the window plus optional toasts"""
+
+    def __init__(self, root):
+        self.root = root
+        self._reset_job = None
+
+        self.status_label = ttk.Label(root, text="Ready", anchor="w", padding=(10, 2))
+        self.status_label.pack(side="bottom", fill="x")
+
+    def info(self, message, toast=False):
+        self._show(message, "info", toast)
+
+    def success(self, message, toast=False):
+        self._show(message, "success", toast)
+
+    def warning(self, message, toast=False):
+        self._show(message, "warning", toast)
+
+    def error(self, message, toast=True):
+        self._show(message, "danger", toast)
+
+    def _show(self, message, bootstyle, toast):
+        self.status_label.configure(text=message, bootstyle=bootstyle)
+        if self._reset_job is not None:
+            self.root.after_cancel(self._reset_job)
+        self._reset_job = self.root.after(STATUS_TIMEOUT_MS, self._reset)
+
+        if toast:
+            ToastNotification(
+                title="Job Application Tracker",
+                message=message,
+                duration=TOAST_DURATION_MS,
+                bootstyle=bootstyle,
+            ).show_toast()
+
+    def _reset(self):
+        self._reset_job = None
+        self.status_label.configure(text="Ready", bootstyle="default")
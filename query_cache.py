@@ -0,0 +1,48 @@
+from collections import OrderedDict
+
+# Distinct queries (searches, status lists, statistics) remembered for the current data
+DEFAULT_CAPACITY = 32
+
+
+class QueryCache:
+    """Bounded LRU cache of query results keyed by (query, data generation).
+    The generation changes with every mutation, so a result is only ever served for the
+    data it was computed from; entries of older generations are dropped once a newer one
+    is seen. hits/misses are kept for diagnostics.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = max(int(capacity), 1)
+        self._entries = OrderedDict()
+        self._generation = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, query, generation, compute):
+        """The cached result of query at generation, calling compute() on a miss.
+        Results are shared between callers and must not be modified.
+        """
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+        if query in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(query)
+            return self._entries[query]
+        self.misses += 1
+        result = self._entries[query] = compute()
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        self._entries.clear()
+        self._generation = None
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = 100 * self.hits / lookups if lookups else 0
+        return f"Query cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% served from memory), {len(self)} cached"
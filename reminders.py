@@ -0,0 +1,163 @@
+import heapq
+import itertools
+import time
+from datetime import date
+from functools import lru_cache
+
+from index_file import NO_DATE, date_ordinal, normalize_link
+from job_status import DEFAULT_STATUS, history_of, status_of
+
+# Days after applying without a status change before a follow-up is suggested (0 = off)
+DEFAULT_FOLLOW_UP_DAYS = 7
+# Days a due reminder stays listed; older ones (e.g. the whole history of a data file from
+# before reminders existed, where every record is still "applied") are never shown
+FOLLOW_UP_WINDOW_DAYS = 14
+# The timer is re-armed at least this often, so sleep or clock changes can't delay a reminder for long
+MAX_DELAY_MS = 60 * 60 * 1000
+# Record fields: when the user followed up, and the date a snoozed reminder comes back
+FOLLOWED_UP_FIELD = 'followed_up'
+REMIND_ON_FIELD = 'remind_on'
+
+
+def follow_up_due(job, days, ordinal_of=date_ordinal, today=None):
+    """Ordinal of the day a follow-up is due, or None if the job needs no reminder.
+    Only applications still in their first status are reminded about, and only
+    until FOLLOW_UP_WINDOW_DAYS after the reminder became due.
+    """
+    if not days or job.get(FOLLOWED_UP_FIELD) or status_of(job) != DEFAULT_STATUS:
+        return None
+    if len(history_of(job)) > 1:
+        return None
+    due = ordinal_of(job.get(REMIND_ON_FIELD))
+    if due == NO_DATE:
+        applied = ordinal_of(job.get('applied_date'))
+        if applied == NO_DATE:
+            return None
+        due = applied + days
+    today = date.today().toordinal() if today is None else today
+    return None if due + FOLLOW_UP_WINDOW_DAYS < today else due
+
+
+def _timestamp(ordinal):
+    """Local midnight starting the day with this ordinal"""
+    return time.mktime(date.fromordinal(ordinal).timetuple())
+
+
+class ReminderScheduler:
+    """Follow-up reminders in a min-heap of (due, seq, link). Only the earliest one
+    is armed, with a single root.after timer, so pending reminders cost nothing while idle.
+    Superseded heap entries are skipped when they surface instead of being searched for.
+    on_due(links) is called with the normalized links of the jobs that became due.
+    """
+
+    def __init__(self, root, on_due, days=DEFAULT_FOLLOW_UP_DAYS):
+        self.root = root
+        self.on_due = on_due
+        self.days = days
+        self._heap = []
+        # link -> due timestamp of its live heap entry
+        self._due = {}
+        self._counter = itertools.count()
+        self._timer = None
+        self._armed_at = None
+
+    def __len__(self):
+        return len(self._due)
+
+    def load(self, jobs, days=None):
+        """Rebuild from the records (heapify, so a large history loads in linear time)"""
+        if days is not None:
+            self.days = days
+        self._due = {}
+        # Many applications share a date, so each distinct date is parsed once
+        ordinal_of = lru_cache(maxsize=None)(date_ordinal)
+        timestamp = lru_cache(maxsize=None)(_timestamp)
+        today = date.today().toordinal()
+        for job in jobs:
+            ordinal = follow_up_due(job, self.days, ordinal_of, today)
+            if ordinal is not None:
+                self._due[normalize_link(job['link'])] = timestamp(ordinal)
+        self._heap = [(due, next(self._counter), link) for link, due in self._due.items()]
+        heapq.heapify(self._heap)
+        self._arm()
+
+    def update(self, job):
+        """Reschedule (or drop) the reminder of an added or edited job"""
+        link = normalize_link(job['link'])
+        ordinal = follow_up_due(job, self.days)
+        if ordinal is None:
+            self.discard(link)
+            return
+        due = _timestamp(ordinal)
+        if self._due.get(link) == due:
+            return
+        self._due[link] = due
+        heapq.heappush(self._heap, (due, next(self._counter), link))
+        self._arm()
+
+    def discard(self, link):
+        # The heap entry is left behind and skipped once it reaches the top
+        if self._due.pop(normalize_link(link), None) is not None and not self._due:
+            self._cancel()
+
+    def apply_change(self, change):
+        """Follow a command-log change dict (removed/inserted/updated records)"""
+        for _, job in change['removed']:
+            self.discard(job['link'])
+        for _, job in change['inserted']:
+            self.update(job)
+        for job in change['updated']:
+            self.update(job)
+
+    def due_links(self, now=None):
+        """Links of every job whose reminder is due (within the window), earliest first"""
+        now = time.time() if now is None else now
+        oldest = _timestamp(date.fromtimestamp(now).toordinal() - FOLLOW_UP_WINDOW_DAYS)
+        return [link for due, link in sorted((due, link) for link, due in self._due.items() if oldest <= due <= now)]
+
+    def stop(self):
+        self._cancel()
+
+    def _cancel(self):
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+            self._armed_at = None
+
+    def _peek(self):
+        """The earliest live entry's due time, dropping superseded entries on the way"""
+        while self._heap:
+            due, _, link = self._heap[0]
+            if self._due.get(link) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def _arm(self):
+        due = self._peek()
+        if due is None:
+            self._cancel()
+            return
+        fire_at = min(due, time.time() + MAX_DELAY_MS / 1000)
+        if self._armed_at is not None and self._armed_at <= fire_at:
+            return
+        self._cancel()
+        delay_ms = max(int((fire_at - time.time()) * 1000), 0)
+        self._timer = self.root.after(delay_ms, self._fire)
+        self._armed_at = fire_at
+
+    def _fire(self):
+        self._timer = None
+        self._armed_at = None
+        now = time.time()
+        fired = []
+        while True:
+            due = self._peek()
+            if due is None or due > now:
+                break
+            _, _, link = heapq.heappop(self._heap)
+            # Fired reminders stay listed by due_links() until the job is edited
+            fired.append(link)
+        if fired:
+            self.on_due(fired)
+        self._arm()
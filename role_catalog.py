@@ -0,0 +1,70 @@
+def role_key(role):
+    """Roles are compared case-insensitively and without surrounding spaces"""
+    return (role or '').strip().casefold()
+
+
+class RoleCatalog:
+    """The configured job roles, in the order they were added.
+    Backed by a dict keyed on role_key(), so membership, add and remove are O(1).
+    """
+
+    def __init__(self, roles=()):
+        self._roles = {}
+        for role in roles:
+            self.add(role)
+
+    def __contains__(self, role):
+        return role_key(role) in self._roles
+
+    def __iter__(self):
+        return iter(self._roles.values())
+
+    def __len__(self):
+        return len(self._roles)
+
+    def names(self):
+        return list(self._roles.values())
+
+    def add(self, role):
+        """Add a role; returns False if it (or a case variant) is already there"""
+        key = role_key(role)
+        if not key or key in self._roles:
+            return False
+        self._roles[key] = role.strip()
+        return True
+
+    def remove(self, role):
+        return self._roles.pop(role_key(role), None) is not None
+
+    def get(self, role):
+        """The catalog spelling of role, or None"""
+        return self._roles.get(role_key(role))
+
+    def matches(self, text, usage=None, limit=None, exclude=()):
+        """Roles containing text, those starting with it first, then by how often they're used.
+        usage maps role -> number of applications (e.g. the stats engine's role counts).
+        """
+        usage = usage or {}
+        text = role_key(text)
+        excluded = {role_key(role) for role in exclude}
+        ranked = []
+        for order, (key, role) in enumerate(self._roles.items()):
+            if key in excluded:
+                continue
+            found = key.find(text)
+            if found < 0:
+                continue
+            ranked.append((found != 0, -usage.get(role, 0), order, role))
+        ranked.sort()
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [role for *_, role in ranked]
+
+    def resolve(self, text, exclude=()):
+        """The catalog role text names exactly (ignoring case and surrounding spaces), or None.
+        Partial input is never completed, so a save can't store a role the user didn't pick.
+        """
+        role = self.get(text)
+        if role is None or role_key(role) in {role_key(r) for r in exclude}:
+            return None
+        return role
@@ -0,0 +1,24 @@
+import ttkbootstrap as ttk
+
+# Most matches listed in the dropdown, so it never needs a scrollbar
+MAX_CHOICES = 10
+
+
+class RolePicker(ttk.Combobox):
+    """Editable role combobox: typing filters the dropdown to the best matching roles,
+    most used first. get_choices(text, limit) returns the ranked role names.
+    """
+
+    def __init__(self, parent, get_choices, limit=MAX_CHOICES, **kwargs):
+        super().__init__(parent, postcommand=self._update_choices, height=limit, **kwargs)
+        self.get_choices = get_choices
+        self.limit = limit
+        self.bind("<KeyRelease>", self._on_key)
+
+    def _update_choices(self):
+        self['values'] = self.get_choices(self.get(), self.limit)
+
+    def _on_key(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        self._update_choices()
@@ -1,8 +1,18 @@
 import json
 import os
+import shutil
 from datetime import datetime
 from pathlib import Path
 
+from archive_store import DEFAULT_ARCHIVE_AFTER_DAYS, archive_paths_for
+from reminders import DEFAULT_FOLLOW_UP_DAYS
+from role_catalog import RoleCatalog
+
+# Port of the localhost API (api_server.py)
+DEFAULT_API_PORT = 8765
+# Name of the storage folder in use until other profiles are added
+DEFAULT_PROFILE = 'Default'
+
 class SettingsManager:
     def __init__(self, app_dir: str):
         # The folder where the executable (or script) resides
@@ -36,18 +46,7 @@ class SettingsManager:
         pointed_directory = self._load_pointed_directory()
         self.data_directory = pointed_directory or self.settings.get('data_directory') or self.app_dir
 
-        # Compute user-facing paths in chosen data directory
-        self.user_settings_path = os.path.join(self.data_directory, 'settings.json')
-        self.data_path = os.path.join(self.data_directory, 'job_data.json')
-
-        # Prefer settings from the chosen directory if present
-        try:
-            if os.path.exists(self.user_settings_path):
-                with open(self.user_settings_path, 'r') as f:
-                    self.settings = json.load(f)
-        except Exception:
-            # If reading chosen settings fails, keep existing self.settings
-            pass
+        self._use_directory(self.data_directory)
     
     def load_settings(self):
         """Load settings from settings.json next to the app, or create defaults."""
@@ -66,6 +65,7 @@ class SettingsManager:
         """Save settings to settings.json in the chosen data directory."""
         if settings is not None:
             self.settings = settings
+            self.role_catalog = RoleCatalog(self.get_job_roles())
         # Ensure chosen data directory exists
         if not getattr(self, 'data_directory', None):
             # If no data directory yet, default to app folder until user selects
@@ -92,21 +92,63 @@ class SettingsManager:
     
     def update_job_roles(self, roles):
         """Update job roles list"""
-        self.settings['job_roles'] = roles
+        self.role_catalog = RoleCatalog(roles)
+        self.settings['job_roles'] = self.role_catalog.names()
         self.save_settings()
     
     def add_job_role(self, role):
-        """Add a new job role"""
-        if role not in self.settings['job_roles']:
-            self.settings['job_roles'].append(role)
-            self.save_settings()
+        """Add a new job role; returns False if it already exists"""
+        if not self.role_catalog.add(role):
+            return False
+        self.settings['job_roles'] = self.role_catalog.names()
+        self.save_settings()
+        return True
     
     def remove_job_role(self, role):
-        """Remove a job role"""
-        if role in self.settings['job_roles']:
-            self.settings['job_roles'].remove(role)
-            self.save_settings()
+        """Remove a job role; returns False if it isn't configured"""
+        if not self.role_catalog.remove(role):
+            return False
+        self.settings['job_roles'] = self.role_catalog.names()
+        self.save_settings()
+        return True
     
+    def is_clipboard_capture_enabled(self):
+        """Whether the clipboard is watched for job links"""
+        return bool(self.settings.get('clipboard_capture', False))
+
+    def set_clipboard_capture(self, enabled):
+        """Turn clipboard capture on or off"""
+        self.settings['clipboard_capture'] = bool(enabled)
+        self.save_settings()
+    
+    def get_archive_after_days(self):
+        """Age in days after which applications move to the archive (0 = never)"""
+        return int(self.settings.get('archive_after_days', DEFAULT_ARCHIVE_AFTER_DAYS))
+
+    def set_archive_after_days(self, days):
+        """Set the archiving age in days (0 turns automatic archiving off)"""
+        self.settings['archive_after_days'] = max(int(days), 0)
+        self.save_settings()
+
+    def get_follow_up_days(self):
+        """Days without a status change before a follow-up reminder (0 = no reminders)"""
+        return int(self.settings.get('follow_up_days', DEFAULT_FOLLOW_UP_DAYS))
+
+    def set_follow_up_days(self, days):
+        self.settings['follow_up_days'] = max(int(days), 0)
+        self.save_settings()
+
+    def is_api_enabled(self):
+        """Whether the app serves the localhost API for the browser extension"""
+        return bool(self.settings.get('api_enabled', False))
+
+    def set_api_enabled(self, enabled):
+        self.settings['api_enabled'] = bool(enabled)
+        self.save_settings()
+
+    def get_api_port(self):
+        return int(self.settings.get('api_port', DEFAULT_API_PORT))
+
     def is_first_run(self):
         """Check if this is the first run of the application"""
         return not os.path.exists(self.user_settings_path) or not self.get_user_name()
@@ -154,6 +196,10 @@ class SettingsManager:
                     data = f.read()
                 with open(self.data_path, 'w') as f:
                     f.write(data)
+                # Archived applications move along with the data they were split from
+                old_archive_path = archive_paths_for(old_data_path)[0]
+                if os.path.exists(old_archive_path):
+                    shutil.copyfile(old_archive_path, archive_paths_for(self.data_path)[0])
         except Exception:
             pass
 
@@ -164,23 +210,107 @@ class SettingsManager:
                 f.write('[]')
         # Files are not created in the app root once a storage directory is chosen.
 
+    # -------------------- Storage profiles --------------------
+    def get_profiles(self):
+        """Profile name -> storage folder (just the current folder until profiles are added)"""
+        profiles = self._load_config().get('profiles')
+        if not profiles:
+            return {DEFAULT_PROFILE: self.data_directory}
+        return dict(profiles)
+
+    def get_active_profile(self):
+        profiles = self.get_profiles()
+        active = self._load_config().get('active_profile')
+        return active if active in profiles else next(iter(profiles))
+
+    def add_profile(self, name: str, directory_path: str):
+        """Add a named profile stored in directory_path; returns False if the name is taken"""
+        name = name.strip()
+        profiles = self.get_profiles()
+        if not name or name in profiles:
+            return False
+        directory_path = os.path.abspath(directory_path)
+        Path(directory_path).mkdir(parents=True, exist_ok=True)
+        # A new folder starts from the current settings, so no setup is needed on switching
+        settings_path = os.path.join(directory_path, 'settings.json')
+        if not os.path.exists(settings_path):
+            with open(settings_path, 'w') as f:
+                json.dump(dict(self.settings, data_directory=directory_path), f, indent=4)
+        cfg = self._load_config()
+        cfg['active_profile'] = self.get_active_profile()
+        profiles[name] = directory_path
+        cfg['profiles'] = profiles
+        self._save_config(cfg)
+        return True
+
+    def remove_profile(self, name: str):
+        """Forget a profile (its folder is left alone); the active profile can't be removed"""
+        profiles = self.get_profiles()
+        if name not in profiles or name == self.get_active_profile():
+            return False
+        del profiles[name]
+        cfg = self._load_config()
+        cfg['profiles'] = profiles
+        self._save_config(cfg)
+        return True
+
+    def switch_profile(self, name: str):
+        """Make a profile's folder the storage location and load its settings"""
+        directory_path = self.get_profiles()[name]
+        Path(directory_path).mkdir(parents=True, exist_ok=True)
+        self._use_directory(directory_path)
+        cfg = self._load_config()
+        cfg['active_profile'] = name
+        cfg['data_directory'] = directory_path
+        self._save_config(cfg)
+
     # -------------------- Internal helpers --------------------
-    def _load_pointed_directory(self):
+    def _use_directory(self, directory_path: str):
+        """Point the paths at directory_path and load the settings stored there"""
+        self.data_directory = directory_path
+        self.user_settings_path = os.path.join(self.data_directory, 'settings.json')
+        self.data_path = os.path.join(self.data_directory, 'job_data.json')
+
+        # Prefer settings from the chosen directory if present
+        try:
+            if os.path.exists(self.user_settings_path):
+                with open(self.user_settings_path, 'r') as f:
+                    self.settings = json.load(f)
+        except Exception:
+            # If reading chosen settings fails, keep existing self.settings
+            pass
+
+        # Set-backed view of settings['job_roles'], kept in sync by the role methods below
+        self.role_catalog = RoleCatalog(self.get_job_roles())
+
+    def _load_config(self):
         try:
             with open(self.appdata_config_path, 'r') as f:
                 cfg = json.load(f)
-            directory = cfg.get('data_directory')
-            if directory and os.path.isdir(directory):
-                return directory
+            return cfg if isinstance(cfg, dict) else {}
         except Exception:
-            return None
-        return None
+            return {}
 
-    def _save_pointed_directory(self, directory_path: str):
+    def _save_config(self, cfg):
         try:
             Path(self.appdata_config_dir).mkdir(parents=True, exist_ok=True)
             with open(self.appdata_config_path, 'w') as f:
-                json.dump({'data_directory': directory_path}, f, indent=2)
+                json.dump(cfg, f, indent=2)
         except Exception:
             # Ignore pointer write failures; app can still use current session paths
             pass
+
+    def _load_pointed_directory(self):
+        directory = self._load_config().get('data_directory')
+        if directory and os.path.isdir(directory):
+            return directory
+        return None
+
+    def _save_pointed_directory(self, directory_path: str):
+        cfg = self._load_config()
+        cfg['data_directory'] = directory_path
+        # Moving the storage folder moves the active profile along with it
+        profiles = cfg.get('profiles')
+        if profiles and cfg.get('active_profile') in profiles:
+            profiles[cfg['active_profile']] = directory_path
+        self._save_config(cfg)
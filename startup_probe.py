@@ -0,0 +1,90 @@
+"""Launch-time probe: starts the app against a throwaway data folder, and the app reports
+when its imports finished and when the first window was drawn, then exits.
+
+    python startup_probe.py                         # probe `python job_tracker.py`
+    python startup_probe.py dist/JobTracker/JobTracker.exe
+
+build.py runs it on every build and writes the result next to the artifact.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Set to a file path to make the app write its startup timings there and quit
+# (job_tracker.PROBE_ENV repeats the name so normal launches don't import this module)
+PROBE_ENV = 'JOBTRACKER_STARTUP_PROBE'
+DEFAULT_RUNS = 3
+TIMEOUT_S = 60
+
+
+def report(root, path, imports_done, on_done):
+    """App side: once the first window is drawn, write the timings to path and call on_done"""
+    def write():
+        root.update()
+        with open(path, 'w') as f:
+            json.dump({'imports_done': imports_done, 'window_shown': time.time()}, f)
+        on_done()
+    root.after_idle(write)
+
+
+def _prepare_home(home):
+    """A data folder with settings, plus the AppData pointer to it, so no setup dialog appears"""
+    data_dir = os.path.join(home, 'data')
+    os.makedirs(data_dir)
+    with open(os.path.join(data_dir, 'settings.json'), 'w') as f:
+        json.dump({'user_name': 'Startup Probe', 'job_roles': [], 'data_directory': data_dir}, f)
+    config_dir = os.path.join(home, 'JobTracker')
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, 'config.json'), 'w') as f:
+        json.dump({'data_directory': data_dir}, f)
+
+
+def measure_once(command, timeout=TIMEOUT_S):
+    """Run command once; returns {'imports_s', 'window_s', 'exit_s'} measured from launch"""
+    home = tempfile.mkdtemp(prefix='jobtracker-probe-')
+    try:
+        _prepare_home(home)
+        result_path = os.path.join(home, 'probe.json')
+        env = dict(os.environ, APPDATA=home, **{PROBE_ENV: result_path})
+        started = time.time()
+        subprocess.run(command, env=env, timeout=timeout, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        exited = time.time()
+        with open(result_path) as f:
+            marks = json.load(f)
+        return {
+            'imports_s': round(marks['imports_done'] - started, 3),
+            'window_s': round(marks['window_shown'] - started, 3),
+            'exit_s': round(exited - started, 3),
+        }
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else round((values[middle - 1] + values[middle]) / 2, 3)
+
+
+def measure(command, runs=DEFAULT_RUNS, timeout=TIMEOUT_S):
+    """The first (cold) run and the median of the remaining warm runs"""
+    results = [measure_once(command, timeout) for _ in range(runs)]
+    summary = {'command': command, 'runs': runs, 'cold': results[0]}
+    if len(results) > 1:
+        summary['warm_median'] = {key: _median(r[key] for r in results[1:]) for key in results[0]}
+    return summary
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv or [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_tracker.py')]
+    print(json.dumps(measure(command), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,35 @@
 from datetime import datetime
 from collections import Counter
+from job_status import FUNNEL, STATUSES, stages_reached, status_of
+
+
+def funnel_rows(reached):
+    """[(stage, count, conversion from the previous stage in %)] for the funnel stages"""
+    rows = []
+    previous = None
+    for stage in FUNNEL:
+        count = reached.get(stage, 0)
+        if previous is None:
+            conversion = 100.0 if count else 0.0
+        else:
+            conversion = round(100.0 * count / previous, 1) if previous else 0.0
+        rows.append((stage, count, conversion))
+        previous = count
+    return rows
 
 class StatsManager:
-    def __init__(self, jobs_data, settings_manager):
+    def __init__(self, jobs_data, settings_manager, index=None, archive=None):
         self.jobs_data = jobs_data
         self.settings_manager = settings_manager
+        # Optional JobIndex with live counters; avoids scanning jobs_data
+        self.index = index
+        # Optional ArchiveStore whose summary counters are added to the index counters
+        self.archive = archive
 
     def get_basic_stats(self):
+        if self.index is not None:
+            return self._stats_from_index()
+
         if not self.jobs_data:
             return {
                 'total_applications': 0,
@@ -14,6 +37,8 @@ class StatsManager:
                 'applications_by_role': {},
                 'daily_rate': 0.0,
                 'total_days': 0,
+                'applications_by_status': {status: 0 for status in STATUSES},
+                'funnel': funnel_rows({}),
             }
 
         total_applications = len(self.jobs_data)
@@ -43,10 +68,66 @@ class StatsManager:
             total_days = 0
             daily_rate = 0.0
 
+        applications_by_status = {status: 0 for status in STATUSES}
+        applications_by_status.update(Counter(status_of(j) for j in self.jobs_data))
+        reached = Counter()
+        for j in self.jobs_data:
+            reached.update(stages_reached(j))
+
         return {
             'total_applications': total_applications,
             'unique_companies': unique_companies,
             'applications_by_role': applications_by_role,
             'daily_rate': daily_rate,
             'total_days': total_days,
+            'applications_by_status': applications_by_status,
+            'funnel': funnel_rows(reached),
+        }
+
+    def role_usage(self):
+        """Number of applications per role, archived ones included"""
+        if self.index is not None:
+            usage = Counter(self.index.roles)
+        else:
+            usage = Counter(j.get('role', 'Not Specified') or 'Not Specified' for j in self.jobs_data)
+        if self.archive is not None:
+            usage.update(self.archive.roles)
+        return usage
+
+    def _stats_from_index(self):
+        index = self.index
+        total = index.total
+        companies = index.companies.keys()
+        roles = Counter(index.roles)
+        date_ranges = [index.date_range()]
+        applications_by_status = Counter(index.status_counts())
+        reached = Counter(index.reached)
+        archive = self.archive
+        if archive is not None and len(archive):
+            total += archive.total
+            companies = companies | archive.companies
+            roles.update(archive.roles)
+            date_ranges.append(archive.date_range())
+            applications_by_status.update(archive.status_counts())
+            reached.update(archive.reached)
+
+        date_ranges = [r for r in date_ranges if r]
+        if date_ranges:
+            first = min(r[0] for r in date_ranges)
+            last = max(r[1] for r in date_ranges)
+            total_days = max(last - first + 1, 1)
+            daily_rate = round(total / total_days, 2)
+        else:
+            total_days = 0
+            daily_rate = 0.0
+
+        return {
+            'total_applications': total,
+            'unique_companies': len(companies),
+            'applications_by_role': dict(roles),
+            'daily_rate': daily_rate,
+            'total_days': total_days,
+            'applications_by_status': dict({status: 0 for status in STATUSES}, **applications_by_status),
+            'funnel': funnel_rows(reached),
+            'archived_applications': len(archive) if archive is not None else 0,
         }
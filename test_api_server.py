@@ -0,0 +1,168 @@
+import http.client
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api_client import ApiClient, ApiError
+from api_server import HOST, ApiServer, CallQueue, ServerThread, StoreBackend
+from archive_store import ArchiveStore
+from job_status import new_job
+from job_store import JobStore
+
+TRACKED = 'https://example.com/jobs/1'
+ARCHIVED = 'https://example.com/jobs/old'
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'job_data.json'))
+    store.open()
+    store.add(new_job('Acme', TRACKED, 'ML Engineer', '2024-05-01'))
+    store.save()
+    return store
+
+
+@pytest.fixture
+def archive(store):
+    archive = ArchiveStore(store.data_path)
+    archive.open()
+    archive.add([new_job('Acme Labs', ARCHIVED, 'Data Scientist', '2022-01-10')])
+    return archive
+
+
+@pytest.fixture
+def server(store, archive):
+    thread = ServerThread(ApiServer(StoreBackend(lambda: store, lambda: archive), port=0))
+    assert thread.start(), thread.error
+    yield thread.server
+    thread.stop()
+
+
+@pytest.fixture
+def client(server):
+    with ApiClient(port=server.port) as client:
+        yield client
+
+
+def test_has_reports_tracked_archived_and_unknown_links(client):
+    tracked = client.has_link(' HTTPS://example.com/jobs/1 ')
+    assert tracked['applied'] and not tracked['archived']
+    assert tracked['job']['company'] == 'Acme'
+    archived = client.has_link(ARCHIVED)
+    assert archived['applied'] and archived['archived']
+    assert client.has_link('https://example.com/jobs/2') == {'applied': False, 'archived': False, 'job': None}
+
+
+def test_has_requires_a_link(client):
+    with pytest.raises(ApiError) as error:
+        client.has_link('')
+    assert error.value.status == 400
+
+
+def test_search_by_company_includes_archived_matches(client):
+    result = client.search(company='acme')
+    assert [job['link'] for job in result['jobs']] == [TRACKED]
+    assert [job['link'] for job in result['archived']] == [ARCHIVED]
+    assert client.search(company='acme', limit=1)['archived'] == []
+
+
+def test_search_by_link(client):
+    result = client.search(link=TRACKED)
+    assert [job['company'] for job in result['jobs']] == ['Acme']
+    assert result['archived'] == []
+
+
+def test_post_jobs_adds_and_saves(client, store):
+    job = client.add('Globex', 'https://example.com/jobs/2', role='Analyst', applied_date='2024-06-01')
+    assert job['company'] == 'Globex' and job['status'] == 'applied'
+    assert store.has_link('https://example.com/jobs/2')
+    reopened = JobStore(store.data_path)
+    reopened.open()
+    assert reopened.has_link('https://example.com/jobs/2')
+    assert client.has_link('https://example.com/jobs/2')['applied']
+
+
+@pytest.mark.parametrize('link', [TRACKED, 'https://EXAMPLE.com/jobs/1', ARCHIVED])
+def test_post_jobs_rejects_tracked_links(client, store, link):
+    with pytest.raises(ApiError) as error:
+        client.add('Acme', link)
+    assert error.value.status == 409
+    assert store.count() == 1
+
+
+@pytest.mark.parametrize('fields', [
+    {'link': 'https://example.com/jobs/3'},
+    {'company': 'Globex'},
+    {'company': ' ', 'link': 'https://example.com/jobs/3'},
+    {'company': 'Globex', 'link': 'https://example.com/jobs/3', 'applied_date': 'yesterday'},
+])
+def test_post_jobs_rejects_incomplete_payloads(client, store, fields):
+    with pytest.raises(ApiError) as error:
+        client._request('POST', '/jobs', fields)
+    assert error.value.status == 400
+    assert store.count() == 1
+
+
+def _raw_request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection(HOST, server.port, timeout=5)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize('body, content_type', [
+    (b'{"company": "Globex", "link": ', 'application/json'),
+    (b'["Globex", "https://example.com/jobs/3"]', 'application/json'),
+    (b'{"company": "Globex", "link": "https://example.com/jobs/3"}', 'text/plain'),
+])
+def test_post_jobs_rejects_malformed_bodies(server, store, body, content_type):
+    status, payload = _raw_request(server, 'POST', '/jobs', body, {'Content-Type': content_type})
+    assert status == 400 and payload['error']
+    assert store.count() == 1
+
+
+@pytest.mark.parametrize('host', ['evil.example:80', f'{HOST}:1', ''])
+def test_foreign_host_headers_are_rejected(server, host):
+    connection = http.client.HTTPConnection(HOST, server.port, timeout=5)
+    try:
+        connection.putrequest('GET', f'/has?link={TRACKED}', skip_host=True)
+        if host:
+            connection.putheader('Host', host)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert json.loads(response.read()) == {'error': "unexpected Host header"}
+    finally:
+        connection.close()
+
+
+def test_localhost_host_header_is_accepted(server):
+    status, payload = _raw_request(server, 'GET', '/health', headers={'Host': f'localhost:{server.port}'})
+    assert status == 200 and payload == {'status': 'ok'}
+
+
+def test_queued_calls_wake_the_owner_thread_only_when_submitted(store, archive):
+    # Stands in for the Tk thread: drains only when woken, never polls
+    owner = ThreadPoolExecutor(max_workers=1)
+    wakes = []
+
+    def wake():
+        wakes.append(1)
+        owner.submit(calls.drain)
+
+    calls = CallQueue(wake)
+    thread = ServerThread(ApiServer(StoreBackend(lambda: store, lambda: archive), port=0, call_queue=calls))
+    assert thread.start(), thread.error
+    try:
+        assert not wakes
+        with ApiClient(port=thread.server.port) as client:
+            for _ in range(3):
+                assert client.has_link(TRACKED)['applied']
+        assert 1 <= len(wakes) <= 3
+    finally:
+        thread.stop()
+        owner.shutdown()
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from data_check import apply_repair, repair_paths_for, verify
+from job_status import new_job
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    jobs = [
+        new_job('Acme', 'https://l/1', 'Engineer', '2024-05-01'),
+        dict(new_job('Globex', 'https://l/2', 'Engineer', '2024-05-02'), status='Offer '),
+        dict(new_job('Initech', 'https://l/3', 'Engineer', '2024-05-03'), status='ghosted'),
+        dict(new_job('Umbrella', 'https://l/4', 'Engineer', '2024-05-04'), applied_date='2024/05/04'),
+        new_job('Acme', 'https://l/1', 'Engineer', '2024-06-01'),
+        {'company': '', 'link': 'https://l/5'},
+        'not a record',
+    ]
+    path = tmp_path / 'job_data.json'
+    path.write_text(json.dumps(jobs, indent=4), encoding='utf-8')
+    return str(path)
+
+
+def test_repair_leaves_nothing_for_the_next_check(data_path):
+    repair_path, rejected_path, _ = repair_paths_for(data_path)
+    report = verify(data_path, repair_path, rejected_path)
+    assert report.counts == {'status': 2, 'bad_date': 1, 'duplicate': 1, 'missing': 1, 'malformed': 1}
+    assert report.kept == 4
+    assert apply_repair(data_path, repair_path, report.stamp)
+
+    again = verify(data_path)
+    assert again.ok, again.problems
+    with open(data_path, encoding='utf-8') as f:
+        jobs = json.load(f)
+    assert [job['status'] for job in jobs] == ['applied', 'offer', 'applied', 'applied']
+    assert jobs[3]['applied_date'] == '2024-05-04'
+    with open(rejected_path, encoding='utf-8') as f:
+        assert [entry['reason'] for entry in json.load(f)] == ['duplicate link', 'no company', 'not an object']
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from job_status import new_job
+from job_store import JobStore
+
+LINKS = [f'https://l/{i}' for i in range(5)]
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = str(tmp_path / 'job_data.json')
+    store = JobStore(path)
+    store.open()
+    for i, link in enumerate(LINKS):
+        store.add(new_job(f'Company {i}', link, 'Engineer', '2024-05-01'))
+    store.save()
+    store.sync_index()
+    return path
+
+
+def _open(path):
+    store = JobStore(path)
+    store.open()
+    store.ensure_loaded()
+    return store
+
+
+def _links_on_disk(path):
+    with open(path, 'rb') as f:
+        return [job['link'] for job in json.load(f)]
+
+
+def test_save_only_rewrites_the_tail(data_path):
+    store = _open(data_path)
+    store.update_links([LINKS[4]], {'role': 'Manager'})
+    store.save()
+    assert not store.changed_on_disk()
+    assert [job['role'] for job in _open(data_path).jobs] == ['Engineer'] * 4 + ['Manager']
+
+
+def test_save_replaces_a_file_that_lost_records_underneath(data_path):
+    store = _open(data_path)
+    other = _open(data_path)
+    other.remove_links([LINKS[0]])
+    other.save()
+    assert store.changed_on_disk()
+    store.update_links([LINKS[4]], {'role': 'Manager'})
+    store.save()
+    # This store's records win whole; no record is duplicated or cut
+    assert _links_on_disk(data_path) == LINKS
+    assert not store.changed_on_disk()
+
+
+def test_save_replaces_a_file_whose_records_grew_underneath(data_path):
+    store = _open(data_path)
+    other = _open(data_path)
+    other.update_links([LINKS[0]], {'company': 'A much longer company name than before'})
+    other.save()
+    store.update_links([LINKS[3]], {'role': 'Manager'})
+    store.save()
+    jobs = _open(data_path).jobs
+    assert [job['link'] for job in jobs] == LINKS
+    assert jobs[0]['company'] == 'Company 0' and jobs[3]['role'] == 'Manager'
+
+
+def test_unparsed_store_ignores_an_index_made_stale_underneath(data_path):
+    store = JobStore(data_path)
+    store.open()
+    assert not store.loaded
+    other = _open(data_path)
+    other.update_links([LINKS[0]], {'company': 'A much longer company name than before'})
+    other.save()
+    store.update_links([LINKS[4]], {'role': 'Manager'})
+    store.save()
+    jobs = _open(data_path).jobs
+    assert jobs[0]['company'] == 'A much longer company name than before'
+    assert jobs[4]['role'] == 'Manager'
+
+
+def _legacy_file(path, count=1200):
+    jobs = [{'company': f'Company {i}', 'link': f'https://old/{i}', 'role': 'Engineer', 'applied_date': '2023-01-01'}
+            for i in range(count)]
+    with open(path, 'w') as f:
+        json.dump(jobs, f, indent=4)
+
+
+def test_upgrades_are_written_back_in_one_full_rewrite(tmp_path):
+    path = str(tmp_path / 'job_data.json')
+    _legacy_file(path)
+    store = _open(path)
+    batches = 1
+    while store.upgrade_batch(limit=500):
+        batches += 1
+    assert batches == 3 and store.dirty
+    rewrite = store.begin_rewrite()
+    rewrite.run()
+    assert store.finish_rewrite(rewrite)
+    assert not store.dirty and not store.changed_on_disk()
+    assert all(job['schema_version'] == 2 for job in _open(path).jobs)
+
+
+def test_rewrite_is_dropped_if_the_file_changed_underneath(tmp_path):
+    path = str(tmp_path / 'job_data.json')
+    _legacy_file(path, count=10)
+    store = _open(path)
+    store.upgrade_batch()
+    rewrite = store.begin_rewrite()
+    rewrite.run()
+    other = _open(path)
+    other.remove_links(['https://old/0'])
+    other.save()
+    assert not store.finish_rewrite(rewrite)
+    assert not (tmp_path / 'job_data.json.rewrite.tmp').exists()
+    assert len(_links_on_disk(path)) == 9
+
+
+def test_every_save_restamps_so_only_outside_writes_count_as_changes(data_path):
+    store = _open(data_path)
+    for role in ('Manager', 'Director'):
+        store.update_links([LINKS[4]], {'role': role})
+        store.save()
+        assert not store.changed_on_disk()
+    other = _open(data_path)
+    other.update_links([LINKS[0]], {'role': 'Intern'})
+    other.save()
+    assert store.changed_on_disk()
@@ -0,0 +1,28 @@
+import json
+
+from job_status import new_job
+from merge_data import merge_files
+
+
+def _write(path, jobs):
+    path.write_text(json.dumps(jobs, indent=4), encoding='utf-8')
+    return str(path)
+
+
+def test_merge_keeps_existing_order_and_appends_new_postings(tmp_path):
+    existing = _write(tmp_path / 'job_data.json', [
+        new_job('Zeta', 'https://jobs.lever.co/zeta/1', 'Engineer', '2024-06-01'),
+        new_job('Acme', 'https://www.linkedin.com/jobs/view/123/', 'Engineer', '2024-05-01'),
+    ])
+    other = _write(tmp_path / 'other.json', [
+        new_job('Beta', 'https://jobs.lever.co/beta/2', 'Engineer', '2023-01-01'),
+        new_job('Acme', 'https://www.linkedin.com/jobs/view/123/?refId=abc&trackingId=xyz', 'Engineer',
+                '2024-04-01'),
+    ])
+    result = merge_files([existing, other], existing, workers=1)
+    with open(existing, encoding='utf-8') as f:
+        jobs = json.load(f)
+    assert [job['company'] for job in jobs] == ['Zeta', 'Acme', 'Beta']
+    # The tracking parameters don't make it another posting; the earlier application wins
+    assert result.conflicts == 1 and result.written == 3
+    assert jobs[1]['applied_date'] == '2024-04-01'
@@ -0,0 +1,37 @@
+class TreeRows:
+    """Keeps a flat Treeview in step with a list of rows.
+    Each update is diffed against what is displayed, so only rows that were
+    added, changed or dropped are touched.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        # iid -> values currently shown
+        self._values = {}
+
+    def update(self, rows):
+        """Show rows, a list of (key, values) in display order"""
+        rows = [(str(key), tuple(values)) for key, values in rows]
+        wanted = dict(rows)
+        stale = [iid for iid in self._values if iid not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._values[iid]
+
+        for position, (iid, values) in enumerate(rows):
+            shown = self._values.get(iid)
+            if shown is None:
+                self.tree.insert("", position, iid=iid, values=values)
+            elif shown != values:
+                self.tree.item(iid, values=values)
+            self._values[iid] = values
+
+        order = [iid for iid, _ in rows]
+        if list(self.tree.get_children()) != order:
+            for position, iid in enumerate(order):
+                self.tree.move(iid, "", position)
+
+    def clear(self):
+        self.tree.delete(*self._values)
+        self._values.clear()